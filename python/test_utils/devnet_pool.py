@@ -0,0 +1,158 @@
+"""
+A pool of running devnet instances shared by the tests of a session.
+
+Instances are started in the background when the pool is created and handed out one test at a
+time. When a test is done, its instance is restarted through devnet's ``devnet_restart`` API,
+which resets the state to the initial one (same seed, so same predeployed accounts) in
+milliseconds, and returned to the pool. An instance that fails to reset is replaced by a fresh one.
+If no instance is left to hand out and none is starting, ``acquire`` raises the last start error.
+"""
+
+import contextlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, ContextManager, Iterator
+
+from test_utils.starknet_test_utils import StarknetTestUtils
+
+logger = logging.getLogger(__name__)
+
+
+class DevnetPool:
+    """
+    Keeps ``size`` devnet instances ready.
+    """
+
+    def __init__(
+        self,
+        size: int = 1,
+        factory: Callable[..., ContextManager[StarknetTestUtils]] = (
+            StarknetTestUtils.context_manager
+        ),
+        **devnet_kwargs,
+    ):
+        """
+        :param size: The number of instances.
+        :param factory: Creates an instance as a context manager that stops it on exit.
+        :param devnet_kwargs: Arguments passed to ``factory``.
+        """
+        self.size = size
+        self.factory = factory
+        self.devnet_kwargs = devnet_kwargs
+        self._ready: list[StarknetTestUtils] = []
+        self._stacks: dict[int, contextlib.ExitStack] = {}
+        # Guards all the state below, and is notified when an instance is ready or fails to start.
+        self._lock = threading.Condition()
+        self._starting = 0
+        self._leased = 0
+        self._start_error: Exception | None = None
+        self._closed = False
+        self._executor = ThreadPoolExecutor(
+            max_workers=size, thread_name_prefix="devnet-pool"
+        )
+        for _ in range(size):
+            self._start()
+
+    def _start(self):
+        with self._lock:
+            self._starting += 1
+        self._executor.submit(self._spawn)
+
+    def _spawn(self):
+        stack = contextlib.ExitStack()
+        try:
+            # The factory returns once the instance serves requests.
+            instance = stack.enter_context(self.factory(**self.devnet_kwargs))
+        except Exception as e:
+            logger.exception("Failed to start a devnet instance.")
+            stack.close()
+            with self._lock:
+                self._starting -= 1
+                self._start_error = e
+                self._lock.notify_all()
+            return
+        with self._lock:
+            self._starting -= 1
+            if self._closed:
+                stack.close()
+                return
+            self._stacks[id(instance)] = stack
+            self._ready.append(instance)
+            self._lock.notify_all()
+
+    def _discard(self, instance: StarknetTestUtils):
+        with self._lock:
+            stack = self._stacks.pop(id(instance), None)
+        if stack is not None:
+            stack.close()
+
+    def acquire(self, timeout: float | None = None) -> StarknetTestUtils:
+        """
+        Take a ready instance, waiting for one if needed.
+
+        :param timeout: Maximum time to wait, in seconds.
+        :raises RuntimeError: If no instance is ready, starting or leased, as all failed to start.
+        """
+        with self._lock:
+            self._lock.wait_for(
+                lambda: self._ready or (self._starting == 0 and self._leased == 0),
+                timeout=timeout,
+            )
+            if self._ready:
+                self._leased += 1
+                return self._ready.pop(0)
+            if self._starting == 0 and self._leased == 0:
+                raise RuntimeError(
+                    "No devnet instance could be started."
+                ) from self._start_error
+        raise TimeoutError(f"No devnet instance became ready in {timeout}s.")
+
+    def release(self, instance: StarknetTestUtils):
+        """
+        Reset an instance taken with ``acquire`` and return it to the pool.
+        """
+        if self._closed:
+            with self._lock:
+                self._leased -= 1
+            self._discard(instance)
+            return
+        try:
+            instance.reset()
+        except Exception:
+            logger.exception("Failed to reset a devnet instance, replacing it.")
+            self._discard(instance)
+            # Start the replacement before giving up the lease, so acquire keeps waiting.
+            self._start()
+            with self._lock:
+                self._leased -= 1
+                self._lock.notify_all()
+            return
+        with self._lock:
+            self._leased -= 1
+            self._ready.append(instance)
+            self._lock.notify_all()
+
+    @contextlib.contextmanager
+    def lease(self, timeout: float | None = None) -> Iterator[StarknetTestUtils]:
+        """
+        Take a ready instance for the duration of the block.
+        """
+        instance = self.acquire(timeout)
+        try:
+            yield instance
+        finally:
+            self.release(instance)
+
+    def close(self):
+        """
+        Stop all instances.
+        """
+        with self._lock:
+            self._closed = True
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            stacks = list(self._stacks.values())
+            self._stacks.clear()
+        for stack in stacks:
+            stack.close()
@@ -1,15 +1,26 @@
 import pytest
+from test_utils.devnet_pool import DevnetPool
 from test_utils.starknet_test_utils import StarknetTestUtils
 from typing import Iterator
 import contextlib
-import time
+
+# Number of devnet instances kept ready per test session (per xdist worker). A worker runs one
+# test at a time and resets its instance before the next one, so one instance is enough.
+DEVNET_POOL_SIZE = 1
+# Maximum time a test waits for an instance, in seconds. Covers the retries of a slow start.
+DEVNET_LEASE_TIMEOUT = 600
+
+
+@pytest.fixture(scope="session")
+def devnet_pool() -> Iterator[DevnetPool]:
+    pool = DevnetPool(size=DEVNET_POOL_SIZE)
+    yield pool
+    pool.close()
 
 
 @pytest.fixture(scope="function")
-def starknet_test_utils() -> Iterator[StarknetTestUtils]:
-    with StarknetTestUtils.context_manager() as val:
-        # TODO: replace the sleep with await.
-        time.sleep(2)
+def starknet_test_utils(devnet_pool: DevnetPool) -> Iterator[StarknetTestUtils]:
+    with devnet_pool.lease(timeout=DEVNET_LEASE_TIMEOUT) as val:
         yield val
 
 
@@ -18,7 +29,6 @@ def starknet_test_utils_factory():
     @contextlib.contextmanager
     def _factory(**kwargs):
         with StarknetTestUtils.context_manager(**kwargs) as val:
-            time.sleep(10)
             yield val
 
     return _factory
@@ -0,0 +1,175 @@
+"""
+Bulk role registration and removal for contracts using the Roles component.
+
+Changes are planned in stages: every change is executed by an account holding the admin role of
+the changed role, and a change whose admin only gets that role in this batch waits for a later
+stage. Within a stage, the changes of each admin are sent as one multicall, and the multicalls of
+different admins are sent and awaited concurrently. So a removal of an account's admin role waits
+for a later stage than the changes that account executes with it.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Iterable, Sequence
+
+from starknet_py.hash.selector import get_selector_from_name
+from starknet_py.net.account.account import Account
+from starknet_py.net.client_models import Call
+
+# The admin role of each role, as set by CommonRolesComponent::initialize (ROLE_ADMIN_PAIRS in
+# packages/utils/src/components/common_roles/common_roles.cairo).
+ROLE_ADMINS = {
+    "app_governor": "app_role_admin",
+    "app_role_admin": "governance_admin",
+    "governance_admin": "governance_admin",
+    "operator": "app_role_admin",
+    "token_admin": "app_role_admin",
+    "upgrade_agent": "app_role_admin",
+    "upgrade_governor": "governance_admin",
+    "security_admin": "security_admin",
+    "security_agent": "security_admin",
+    "security_governor": "security_admin",
+}
+
+
+@dataclass(frozen=True)
+class RoleChange:
+    """
+    :param role: The role, e.g. "app_governor".
+    :param account: The address the role is registered for or removed from.
+    :param grant: Whether to register (True) or remove (False) the role.
+    """
+
+    role: str
+    account: int
+    grant: bool = True
+
+    @property
+    def entrypoint(self) -> str:
+        return f"{'register' if self.grant else 'remove'}_{self.role}"
+
+
+def role_grants(desired: dict[str, Iterable[int]]) -> list[RoleChange]:
+    """
+    Return the changes registering each role for its accounts.
+
+    :param desired: The accounts of each role.
+    """
+    return [
+        RoleChange(role=role, account=account)
+        for role, accounts in desired.items()
+        for account in accounts
+    ]
+
+
+def plan_role_changes(
+    changes: Sequence[RoleChange], holders: dict[str, Sequence[int]]
+) -> list[dict[int, list[RoleChange]]]:
+    """
+    Split role changes into stages and assign each change to an admin.
+
+    :param changes: The changes.
+    :param holders: The accounts holding each admin role before the changes.
+    :return: For each stage, the changes to execute by each admin address. Registrations come
+        before removals, so an admin removing its own role does so last.
+    """
+    holders = {role: list(accounts) for role, accounts in holders.items()}
+    for change in changes:
+        if change.role not in ROLE_ADMINS:
+            raise ValueError(f"Unknown role: {change.role}.")
+
+    stages = []
+    pending = list(changes)
+    while pending:
+        stage: dict[int, list[RoleChange]] = {}
+        blocked = []
+        for change in pending:
+            admins = holders.get(ROLE_ADMINS[change.role])
+            if admins:
+                stage.setdefault(admins[0], []).append(change)
+            else:
+                blocked.append(change)
+        for admin, admin_changes in stage.items():
+            for change in list(admin_changes):
+                # Its own multicall runs the removal last, any other one would race with it.
+                if (
+                    not change.grant
+                    and change.account != admin
+                    and any(
+                        ROLE_ADMINS[other.role] == change.role
+                        for other in stage.get(change.account, [])
+                    )
+                ):
+                    admin_changes.remove(change)
+                    blocked.append(change)
+        stage = {
+            admin: admin_changes
+            for admin, admin_changes in stage.items()
+            if admin_changes
+        }
+        if not stage:
+            raise ValueError(
+                "No admin can execute: "
+                + ", ".join(f"{c.entrypoint}({hex(c.account)})" for c in blocked)
+                + "."
+            )
+        for admin, admin_changes in stage.items():
+            admin_changes.sort(key=lambda change: not change.grant)
+            for change in admin_changes:
+                role_holders = holders.setdefault(change.role, [])
+                if change.grant and change.account not in role_holders:
+                    role_holders.append(change.account)
+                elif not change.grant and change.account in role_holders:
+                    role_holders.remove(change.account)
+        stages.append(stage)
+        pending = blocked
+    return stages
+
+
+async def apply_role_changes(
+    contract_address: int,
+    changes: Sequence[RoleChange],
+    admins: dict[str, Sequence[Account]],
+    accounts: Iterable[Account] = (),
+    check_interval: float = 0.1,
+):
+    """
+    Execute role changes on a contract with one multicall per admin and stage.
+
+    :param contract_address: The address of the contract.
+    :param changes: The changes.
+    :param admins: The accounts holding each admin role before the changes.
+    :param accounts: Accounts that get an admin role in the changes, to execute later stages.
+    :param check_interval: The interval between transaction status checks.
+    """
+    signers = {
+        account.address: account
+        for account in [*(a for role in admins.values() for a in role), *accounts]
+    }
+    holders = {
+        role: [account.address for account in role_admins]
+        for role, role_admins in admins.items()
+    }
+    for stage in plan_role_changes(changes, holders):
+        for admin in stage:
+            if admin not in signers:
+                raise ValueError(f"No account given for admin {hex(admin)}.")
+
+        async def execute(admin: int, admin_changes: list[RoleChange]):
+            account = signers[admin]
+            calls = [
+                Call(
+                    to_addr=contract_address,
+                    selector=get_selector_from_name(change.entrypoint),
+                    calldata=[change.account],
+                )
+                for change in admin_changes
+            ]
+            response = await account.execute_v3(calls=calls, auto_estimate=True)
+            await account.client.wait_for_tx(
+                response.transaction_hash, check_interval=check_interval
+            )
+
+        await asyncio.gather(
+            *(execute(admin, admin_changes) for admin, admin_changes in stage.items())
+        )
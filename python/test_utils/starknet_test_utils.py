@@ -4,12 +4,15 @@ import os
 import signal
 import subprocess
 import tempfile
+import json
+import urllib.request
 from starknet_py.net.account.account import Account
 from starknet_py.devnet_utils.devnet_client import DevnetClient
 from starknet_py.net.models.chains import StarknetChainId
 from starknet_py.net.signer.key_pair import KeyPair
 from starknet_py.net.signer.stark_curve_signer import StarkCurveSigner
 from starknet_py.contract import Contract
+from test_utils.role_grants import apply_role_changes, role_grants
 import re
 from pathlib import Path
 import socket
@@ -25,6 +28,11 @@ SIERRA_KEY = "sierra"
 CASM_KEY = "casm"
 ABI_KEY = "abi"
 
+# Maximum time (in seconds) to wait for a new devnet to serve requests.
+DEVNET_STARTUP_TIMEOUT = 60
+# Interval (in seconds) between readiness probes of a starting devnet.
+DEVNET_PROBE_INTERVAL = 0.05
+
 
 def get_contract_path(contract_name: str, base_path: Path) -> Path:
     return base_path / f"{contract_name}.json"
@@ -101,6 +109,7 @@ class StarknetTestUtils:
         fork_block: Optional[int],
         request_body_size_limit: Optional[int],
         start_time: Optional[int],
+        startup_timeout: float = DEVNET_STARTUP_TIMEOUT,
     ):
         self.starknet = Starknet(
             port=port,
@@ -112,6 +121,7 @@ class StarknetTestUtils:
             fork_block=fork_block,
             request_body_size_limit=request_body_size_limit,
             start_time=start_time,
+            startup_timeout=startup_timeout,
         )
         self.accounts = self.starknet.accounts
 
@@ -132,10 +142,12 @@ class StarknetTestUtils:
         request_body_size_limit: Optional[int] = None,
         start_time: Optional[int] = None,
         backoff: float = 0.1,
+        startup_timeout: float = DEVNET_STARTUP_TIMEOUT,
     ):
         """
         Retry creating a Starknet instance if port is already in use.
         If port is None, will pick random free port.
+        The instance is ready to serve requests when entering the context.
         """
         for attempt in range(cls.MAX_RETRIES):
             try:
@@ -150,20 +162,32 @@ class StarknetTestUtils:
                     fork_block=fork_block,
                     request_body_size_limit=request_body_size_limit,
                     start_time=start_time,
+                    startup_timeout=startup_timeout,
                 )
-                yield res
-                return
             except OSError as e:
-                if e.errno in (errno.EADDRINUSE, errno.EACCES):  # port in use
-                    if attempt < cls.MAX_RETRIES - 1:
-                        time.sleep(backoff)  # short backoff
-                        continue
-                    raise
+                # Only a port in use is retried; other errors (e.g. TimeoutError) are raised.
+                if (
+                    e.errno in (errno.EADDRINUSE, errno.EACCES)
+                    and attempt < cls.MAX_RETRIES - 1
+                ):
+                    time.sleep(backoff)  # short backoff
+                    continue
+                raise
+            # Errors raised in the context are not retried.
+            try:
+                yield res
             finally:
                 try:
                     res.stop()
                 except Exception:
                     pass
+            return
+
+    def reset(self):
+        """
+        Restore the initial state of the devnet, without restarting its process.
+        """
+        self.starknet.get_client().restart_sync()
 
     def advance_time(self, n_seconds: int):
         self.starknet.get_client().increase_time(n_seconds)
@@ -185,9 +209,10 @@ class Starknet:
         fork_block: Optional[int] = None,
         request_body_size_limit: Optional[int] = None,
         start_time: Optional[int] = None,
+        startup_timeout: float = DEVNET_STARTUP_TIMEOUT,
     ):
         """
-        Runs starknet.
+        Runs starknet and waits until it serves requests.
         Use stop() to ensure the process is killed at the end.
         """
         self.err_stream = tempfile.NamedTemporaryFile()
@@ -228,6 +253,11 @@ class Starknet:
             start_new_session=True,
         )
         self.is_alive = True
+        try:
+            self.wait_until_ready(timeout=startup_timeout)
+        except Exception:
+            self.stop()
+            raise
         self.accounts = []
         key_pairs = []
         for key in keys:
@@ -247,46 +277,112 @@ class Starknet:
     def __del__(self):
         self.stop()
 
+    @property
+    def url(self) -> str:
+        return f"http://localhost:{self.port}"
+
     def get_client(self) -> DevnetClient:
-        node_url = f"http://localhost:{self.port}"
-        return DevnetClient(node_url=node_url)
+        return DevnetClient(node_url=self.url)
+
+    def _read_stderr(self) -> str:
+        # Read through a new file object: the process shares the offset of err_stream.
+        return Path(self.err_stream.name).read_text(errors="replace")
+
+    def _is_ready(self) -> bool:
+        """
+        Probe the port with is_alive, then check that the RPC answers starknet_chainId.
+        """
+        try:
+            with urllib.request.urlopen(f"{self.url}/is_alive", timeout=1) as response:
+                if response.status != 200:
+                    return False
+            request = urllib.request.Request(
+                f"{self.url}/rpc",
+                data=json.dumps(
+                    {"jsonrpc": "2.0", "id": 0, "method": "starknet_chainId"}
+                ).encode(),
+                headers={"Content-Type": "application/json"},
+            )
+            with urllib.request.urlopen(request, timeout=1) as response:
+                return "result" in json.load(response)
+        except (OSError, ValueError):
+            return False
+
+    def wait_until_ready(
+        self,
+        timeout: float = DEVNET_STARTUP_TIMEOUT,
+        interval: float = DEVNET_PROBE_INTERVAL,
+    ):
+        """
+        Wait until the devnet serves requests.
+
+        :param timeout: Maximum time to wait, in seconds.
+        :param interval: Time between probes, in seconds.
+        :raises OSError: If the devnet exited because its port is in use (errno.EADDRINUSE).
+        :raises RuntimeError: If the devnet exited.
+        :raises TimeoutError: If the devnet isn't ready after ``timeout`` seconds.
+        """
+        deadline = time.monotonic() + timeout
+        while not self._is_ready():
+            returncode = self.starknet_proc.poll()
+            if returncode is not None:
+                stderr = self._read_stderr()
+                if "Address already in use" in stderr:
+                    raise OSError(errno.EADDRINUSE, f"Port {self.port} is in use.")
+                raise RuntimeError(
+                    f"starknet-devnet exited with code {returncode}. Stderr:\n{stderr}"
+                )
+            if time.monotonic() >= deadline:
+                raise TimeoutError(
+                    f"starknet-devnet on port {self.port} not ready after {timeout}s. "
+                    f"Stderr:\n{self._read_stderr()}"
+                )
+            time.sleep(interval)
 
     def stop(self):
         if not self.is_alive:
             return
 
         # Kill the entire process group.
-        os.killpg(self.starknet_proc.pid, signal.SIGINT)
+        try:
+            os.killpg(self.starknet_proc.pid, signal.SIGINT)
+        except ProcessLookupError:
+            pass  # Already exited.
         self.is_alive = False
         # Capture errors.
-        self.err_stream.flush()
-        self.err_stream.seek(0)
-        stderr_data = self.err_stream.read().decode()
+        stderr_data = self._read_stderr()
         if len(stderr_data) > 0:
             logger.error(f"Starknet stderr data:\n{str(stderr_data)}\n")
         self.err_stream.close()
 
 
 async def grant_roles(contracts_by_role: dict[str, Contract], roles: dict[str, Account]):
-    for role_name in ["app_role_admin", "upgrade_governor", "security_admin"]:
-        await (
-            await contracts_by_role["governance_admin"]
-            .functions[f"register_{role_name}"]
-            .invoke_v3(roles[role_name].address, auto_estimate=True)
-        ).wait_for_acceptance(check_interval=0.1)
-
-    for role_name in ["app_governor", "operator", "token_admin"]:
-        await (
-            await contracts_by_role["app_role_admin"]
-            .functions[f"register_{role_name}"]
-            .invoke_v3(roles[role_name].address, auto_estimate=True)
-        ).wait_for_acceptance(check_interval=0.1)
-
-    await (
-        await contracts_by_role["security_admin"]
-        .functions["register_security_agent"]
-        .invoke_v3(roles["security_agent"].address, auto_estimate=True)
-    ).wait_for_acceptance(check_interval=0.1)
+    """
+    Register the roles of ``roles``. The account of ``contracts_by_role["governance_admin"]``
+    must be the governance admin and the initial security admin of the contract.
+    """
+    governance_admin = contracts_by_role["governance_admin"]
+    desired = {
+        role_name: [roles[role_name].address]
+        for role_name in [
+            "app_role_admin",
+            "upgrade_governor",
+            "security_admin",
+            "app_governor",
+            "operator",
+            "token_admin",
+            "security_agent",
+        ]
+    }
+    await apply_role_changes(
+        governance_admin.address,
+        role_grants(desired),
+        admins={
+            "governance_admin": [governance_admin.account],
+            "security_admin": [governance_admin.account],
+        },
+        accounts=roles.values(),
+    )
 
 
 def get_cairo_int_constant(file_path: Path, constant_name: str) -> int:
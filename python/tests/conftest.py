@@ -0,0 +1,25 @@
+import importlib.util
+import sys
+from pathlib import Path
+from types import ModuleType
+
+PYTHON_ROOT = Path(__file__).resolve().parents[1]
+
+
+def load_module(relative_path: str, name: str, register: bool = False) -> ModuleType:
+    """
+    Load a module from its file, without importing the package it belongs to.
+
+    :param relative_path: The path of the module file, relative to the python directory.
+    :param name: The name of the module.
+    :param register: Whether to add the module to ``sys.modules`` before executing it, so that
+        modules loaded later can import it as a standalone sibling.
+    :return: The module.
+    """
+    spec = importlib.util.spec_from_file_location(name, PYTHON_ROOT / relative_path)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    if register:
+        sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
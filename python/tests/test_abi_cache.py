@@ -0,0 +1,66 @@
+import asyncio
+import json
+
+from starknet_py.net.client_models import SierraContractClass, SierraEntryPointsByType
+
+from conftest import load_module
+
+abi_cache = load_module("utils/abi_cache.py", "abi_cache")
+
+ABI = [{"type": "function", "name": "has_role", "inputs": [], "outputs": []}]
+
+
+class ClassClient:
+    def __init__(self, class_hashes):
+        self.class_hashes = class_hashes
+        self.class_requests = []
+
+    async def get_class_hash_at(self, address):
+        return self.class_hashes[address]
+
+    async def get_class_by_hash(self, class_hash):
+        self.class_requests.append(class_hash)
+        return SierraContractClass(
+            contract_class_version="0.1.0",
+            sierra_program=[],
+            entry_points_by_type=SierraEntryPointsByType(
+                constructor=[], external=[], l1_handler=[]
+            ),
+            abi=json.dumps(ABI),
+        )
+
+
+def test_get_abi_at_fetches_each_class_once():
+    client = ClassClient({0x1: 0xAA, 0x2: 0xAA, 0x3: 0xBB})
+    cache = abi_cache.AbiCache()
+
+    async def run():
+        return [
+            await cache.get_abi_at(client, address) for address in ("0x1", 0x2, 0x3)
+        ]
+
+    results = asyncio.run(run())
+
+    assert results == [(ABI, 1)] * 3
+    assert client.class_requests == [0xAA, 0xBB]
+
+
+def test_lru_evicts_least_recently_used():
+    cache = abi_cache.AbiCache(max_entries=2)
+    cache.put(1, ABI, 1)
+    cache.put(2, ABI, 1)
+    assert cache.get(1) == (ABI, 1)
+    cache.put(3, ABI, 1)
+
+    assert cache.get(2) is None
+    assert cache.get(1) == (ABI, 1)
+    assert cache.get(3) == (ABI, 1)
+
+
+def test_persisted_abis_survive_a_new_cache(tmp_path):
+    abi_cache.AbiCache(path=tmp_path).put(0xAA, ABI, 0)
+
+    cache = abi_cache.AbiCache(path=tmp_path)
+    assert cache.get(0xAA) == (ABI, 0)
+    assert cache.get(0xBB) is None
+    assert sorted(p.name for p in tmp_path.iterdir()) == [f"0x{0xAA:064x}.json"]
@@ -0,0 +1,84 @@
+import json
+import os
+
+from conftest import load_module
+
+artifacts = load_module("utils/artifacts.py", "artifacts")
+
+ABI = [
+    {"type": "function", "name": "has_role", "inputs": [], "outputs": []},
+    {"type": "event", "name": "RoleGranted", "kind": "struct", "members": []},
+]
+
+
+def _write_contract_class(path, abi=ABI, **extra):
+    contract_class = {
+        "sierra_program": [hex(i) for i in range(1000)],
+        "sierra_program_debug_info": {"type_names": [[0, "abi"]]},
+        "contract_class_version": "0.1.0",
+        "entry_points_by_type": {"EXTERNAL": [], "L1_HANDLER": [], "CONSTRUCTOR": []},
+        "abi": abi,
+        **extra,
+    }
+    path.write_text(json.dumps(contract_class))
+
+
+def test_extract_abi_without_full_parse(tmp_path):
+    path = tmp_path / "pkg_Contract.contract_class.json"
+    _write_contract_class(path)
+    assert artifacts.extract_abi(path.read_text()) == ABI
+
+
+def test_extract_abi_falls_back_to_full_parse():
+    # The ABI isn't the last "abi" key, and is stored as a string.
+    contract_class = json.dumps({"abi": json.dumps(ABI), "extra": {"abi": 1}})
+    assert artifacts.extract_abi(contract_class) == ABI
+
+
+def test_cache_reuses_values_until_file_changes(tmp_path):
+    path = tmp_path / "pkg_Contract.contract_class.json"
+    _write_contract_class(path)
+    cache = artifacts.ArtifactCache()
+    computed = []
+
+    def compute(text):
+        computed.append(text)
+        return len(text)
+
+    first = cache.derive(path, "length", compute)
+    assert cache.derive(path, "length", compute) == first
+    assert cache.load_abi(path) is cache.load_abi(path)
+    assert len(computed) == 1
+
+    _write_contract_class(path, abi=ABI[:1])
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert cache.load_abi(path) == ABI[:1]
+    cache.derive(path, "length", compute)
+    assert len(computed) == 2
+
+
+def test_load_json(tmp_path):
+    path = tmp_path / "pkg_Contract.compiled_contract_class.json"
+    path.write_text(json.dumps({"bytecode": ["0x1"]}))
+    assert artifacts.ArtifactCache().load_json(path) == {"bytecode": ["0x1"]}
+
+
+def test_cache_keeps_only_recent_artifacts(tmp_path):
+    cache = artifacts.ArtifactCache(max_artifacts=2)
+    paths = [tmp_path / f"pkg_C{i}.contract_class.json" for i in range(3)]
+    for path in paths:
+        _write_contract_class(path)
+    computed = []
+
+    def compute(text):
+        computed.append(text)
+        return len(text)
+
+    for path in paths:
+        cache.derive(path, "length", compute)
+    cache.derive(paths[2], "length", compute)
+    assert len(computed) == 3
+    # The least recently used artifact was dropped.
+    cache.derive(paths[0], "length", compute)
+    assert len(computed) == 4
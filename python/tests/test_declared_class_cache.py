@@ -0,0 +1,25 @@
+from conftest import load_module
+
+declared_class_cache = load_module(
+    "utils/declared_class_cache.py", "declared_class_cache"
+)
+
+
+def test_entries_are_per_node():
+    cache = declared_class_cache.DeclaredClassCache()
+    cache.add("http://mainnet", 0x123)
+    assert cache.contains("http://mainnet", 0x123)
+    assert not cache.contains("http://sepolia", 0x123)
+    assert not cache.contains("http://mainnet", 0x124)
+
+
+def test_persists_across_instances(tmp_path):
+    path = tmp_path / "cache" / "declared.json"
+    cache = declared_class_cache.DeclaredClassCache(path)
+    cache.add("http://mainnet", 0x123)
+    cache.add("http://mainnet", 0x456)
+
+    reloaded = declared_class_cache.DeclaredClassCache(path)
+    assert reloaded.contains("http://mainnet", 0x123)
+    assert reloaded.contains("http://mainnet", 0x456)
+    assert not path.with_suffix(".tmp").exists()
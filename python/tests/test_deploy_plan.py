@@ -0,0 +1,55 @@
+import pytest
+
+from conftest import load_module
+
+deploy_plan = load_module("utils/deploy_plan.py", "deploy_plan")
+ContractRef = deploy_plan.ContractRef
+ContractSpec = deploy_plan.ContractSpec
+
+
+def _names(specs):
+    return [spec.name for spec in specs]
+
+
+def test_deployment_order_puts_dependencies_first():
+    specs = [
+        ContractSpec("bridge", constructor_args={"token": ContractRef("token")}),
+        ContractSpec("token", constructor_args=[ContractRef("governance")]),
+        ContractSpec("governance"),
+        ContractSpec("oracle", constructor_args=[1, 2]),
+    ]
+    assert _names(deploy_plan.deployment_order(specs)) == [
+        "governance",
+        "oracle",
+        "token",
+        "bridge",
+    ]
+
+
+def test_deployment_order_rejects_cycles_and_unknown_refs():
+    with pytest.raises(ValueError, match="Cyclic"):
+        deploy_plan.deployment_order(
+            [
+                ContractSpec("a", constructor_args=[ContractRef("b")]),
+                ContractSpec("b", constructor_args=[ContractRef("a")]),
+            ]
+        )
+    with pytest.raises(ValueError, match="unknown"):
+        deploy_plan.deployment_order(
+            [ContractSpec("a", constructor_args=[ContractRef("missing")])]
+        )
+    with pytest.raises(ValueError, match="Duplicate"):
+        deploy_plan.deployment_order([ContractSpec("a"), ContractSpec("a")])
+
+
+def test_resolve_refs_replaces_nested_references():
+    args = {"owner": 5, "tokens": [ContractRef("a"), (ContractRef("b"), 7)]}
+    assert deploy_plan.resolve_refs(args, {"a": 0xA, "b": 0xB}) == {
+        "owner": 5,
+        "tokens": [0xA, (0xB, 7)],
+    }
+
+
+def test_contract_name_defaults_to_name():
+    assert ContractSpec("token").contract_name == "token"
+    assert ContractSpec("usdc", contract_name="token").contract_name == "token"
@@ -0,0 +1,100 @@
+import contextlib
+
+import pytest
+
+from conftest import load_module
+
+devnet_pool = load_module("test_utils/devnet_pool.py", "devnet_pool")
+
+
+class FakeDevnet:
+    def __init__(self, fail_reset=False):
+        self.fail_reset = fail_reset
+        self.resets = 0
+        self.stopped = False
+
+    def reset(self):
+        if self.fail_reset:
+            raise ConnectionError("devnet is gone")
+        self.resets += 1
+
+
+class FakeFactory:
+    def __init__(self, fail_reset=False, fail_start=False):
+        self.fail_reset = fail_reset
+        self.fail_start = fail_start
+        self.created = []
+
+    @contextlib.contextmanager
+    def __call__(self, **kwargs):
+        if self.fail_start:
+            raise OSError("devnet binary not found")
+        instance = FakeDevnet(**{"fail_reset": self.fail_reset, **kwargs})
+        self.created.append(instance)
+        try:
+            yield instance
+        finally:
+            instance.stopped = True
+
+
+def test_released_instances_are_reset_and_reused():
+    factory = FakeFactory()
+    pool = devnet_pool.DevnetPool(size=1, factory=factory)
+
+    with pool.lease(timeout=5) as first:
+        pass
+    with pool.lease(timeout=5) as second:
+        pass
+    pool.close()
+
+    assert first is second
+    assert first.resets == 2
+    assert len(factory.created) == 1
+    assert first.stopped
+
+
+def test_instance_failing_to_reset_is_replaced():
+    factory = FakeFactory(fail_reset=True)
+    pool = devnet_pool.DevnetPool(size=1, factory=factory)
+
+    first = pool.acquire(timeout=5)
+    pool.release(first)
+    second = pool.acquire(timeout=5)
+    pool.close()
+
+    assert first is not second
+    assert first.stopped
+    assert len(factory.created) == 2
+
+
+def test_acquire_times_out_when_no_instance_is_ready():
+    pool = devnet_pool.DevnetPool(size=1, factory=FakeFactory())
+    instance = pool.acquire(timeout=5)
+
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.01)
+    pool.release(instance)
+    pool.close()
+
+
+def test_acquire_raises_when_every_instance_fails_to_start():
+    pool = devnet_pool.DevnetPool(size=2, factory=FakeFactory(fail_start=True))
+
+    with pytest.raises(RuntimeError) as info:
+        pool.acquire()
+    pool.close()
+
+    assert isinstance(info.value.__cause__, OSError)
+
+
+def test_acquire_waits_for_replacement_of_instance_failing_to_reset():
+    factory = FakeFactory(fail_reset=True)
+    pool = devnet_pool.DevnetPool(size=1, factory=factory)
+    instance = pool.acquire(timeout=5)
+    # The replacement fails to start too: nothing is left to hand out.
+    factory.fail_start = True
+    pool.release(instance)
+
+    with pytest.raises(RuntimeError):
+        pool.acquire(timeout=5)
+    pool.close()
@@ -0,0 +1,103 @@
+import errno
+import subprocess
+import sys
+import tempfile
+
+import pytest
+
+from test_utils.starknet_test_utils import Starknet, StarknetTestUtils, get_free_port
+
+
+def _starknet_running(script: str) -> Starknet:
+    # A Starknet whose "devnet" is a Python script that never serves requests.
+    starknet = Starknet.__new__(Starknet)
+    starknet.port = get_free_port()
+    starknet.err_stream = tempfile.NamedTemporaryFile()
+    starknet.starknet_proc = subprocess.Popen(
+        [sys.executable, "-c", script],
+        stdout=subprocess.DEVNULL,
+        stderr=starknet.err_stream,
+        start_new_session=True,
+    )
+    starknet.is_alive = True
+    return starknet
+
+
+def test_exit_on_port_in_use_raises_address_in_use():
+    starknet = _starknet_running(
+        "import sys; sys.stderr.write('Address already in use'); sys.exit(1)"
+    )
+
+    with pytest.raises(OSError) as error:
+        starknet.wait_until_ready(timeout=10)
+    assert error.value.errno == errno.EADDRINUSE
+    starknet.stop()
+
+
+def test_exit_raises_with_stderr():
+    starknet = _starknet_running(
+        "import sys; sys.stderr.write('invalid fork url'); sys.exit(2)"
+    )
+
+    with pytest.raises(RuntimeError, match="(?s)code 2.*invalid fork url"):
+        starknet.wait_until_ready(timeout=10)
+    starknet.stop()
+
+
+def test_timeout_includes_stderr():
+    starknet = _starknet_running(
+        "import sys, time; sys.stderr.write('loading fork'); sys.stderr.flush(); "
+        "time.sleep(30)"
+    )
+
+    with pytest.raises(TimeoutError, match="loading fork"):
+        starknet.wait_until_ready(timeout=0.5)
+    starknet.stop()
+
+
+def _failing_test_utils(*errors):
+    # StarknetTestUtils whose attempts to start raise ``errors`` in turn, then succeed.
+    class FailingStarknetTestUtils(StarknetTestUtils):
+        attempts = 0
+
+        def __init__(self, **kwargs):
+            FailingStarknetTestUtils.attempts += 1
+            if FailingStarknetTestUtils.attempts <= len(errors):
+                raise errors[FailingStarknetTestUtils.attempts - 1]
+            self.stopped = False
+
+        def stop(self):
+            self.stopped = True
+
+    return FailingStarknetTestUtils
+
+
+def test_context_manager_retries_port_in_use():
+    test_utils = _failing_test_utils(OSError(errno.EADDRINUSE, "Address in use"))
+
+    with test_utils.context_manager(backoff=0) as instance:
+        pass
+
+    assert test_utils.attempts == 2
+    assert instance.stopped
+
+
+def test_context_manager_raises_startup_timeout_without_retrying():
+    test_utils = _failing_test_utils(TimeoutError("devnet didn't start"))
+
+    with pytest.raises(TimeoutError):
+        with test_utils.context_manager(backoff=0):
+            pass
+
+    assert test_utils.attempts == 1
+
+
+def test_context_manager_does_not_retry_errors_of_the_context():
+    test_utils = _failing_test_utils()
+
+    with pytest.raises(ConnectionRefusedError):
+        with test_utils.context_manager(backoff=0) as instance:
+            raise ConnectionRefusedError(errno.ECONNREFUSED, "refused")
+
+    assert test_utils.attempts == 1
+    assert instance.stopped
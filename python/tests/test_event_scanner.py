@@ -0,0 +1,272 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from starknet_py.net.client_errors import ClientError
+
+from conftest import load_module
+
+event_scanner = load_module("utils/event_scanner.py", "event_scanner")
+
+
+class RecordingFetcher:
+    """
+    Returns one event per block. Later chunks complete first, to check ordering.
+    """
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = []
+
+    async def __call__(self, chunk_start, chunk_end):
+        self.calls.append((chunk_start, chunk_end))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.001 * (100 - chunk_start % 100))
+        self.in_flight -= 1
+        return list(range(chunk_start, chunk_end + 1))
+
+
+def test_split_block_range_covers_range():
+    assert event_scanner.split_block_range(0, 25, 10) == [(0, 9), (10, 19), (20, 25)]
+    assert event_scanner.split_block_range(5, 5, 10) == [(5, 5)]
+    assert event_scanner.split_block_range(6, 5, 10) == []
+
+
+def test_split_block_range_rejects_non_positive_chunk():
+    with pytest.raises(ValueError):
+        event_scanner.split_block_range(0, 10, 0)
+
+
+def test_scan_block_ranges_keeps_block_order_and_bounds_concurrency():
+    fetcher = RecordingFetcher()
+    events = asyncio.run(
+        event_scanner.scan_block_ranges(
+            fetcher,
+            event_scanner.split_block_range(0, 99, 10),
+            max_concurrency=3,
+        ),
+    )
+    assert events == list(range(100))
+    assert len(fetcher.calls) == 10
+    assert fetcher.max_in_flight == 3
+
+
+def test_scan_block_ranges_propagates_errors():
+    async def fetch_chunk(chunk_start, chunk_end):
+        if chunk_start == 20:
+            raise RuntimeError("rpc failure")
+        return [chunk_start]
+
+    with pytest.raises(RuntimeError, match="rpc failure"):
+        asyncio.run(
+            event_scanner.scan_block_ranges(
+                fetch_chunk,
+                event_scanner.split_block_range(0, 49, 10),
+                max_concurrency=2,
+            ),
+        )
+
+
+def test_scan_adaptive_shrinks_window_on_dense_chunks_and_failures():
+    calls = []
+
+    async def fetch_chunk(chunk_start, chunk_end):
+        calls.append((chunk_start, chunk_end))
+        if chunk_end - chunk_start + 1 > 400:
+            raise ClientError("Too many events in block range", code=-32000)
+        # 10 events per block.
+        return [block for block in range(chunk_start, chunk_end + 1) for _ in range(10)]
+
+    policy = event_scanner.AdaptiveChunkPolicy(
+        initial_chunk_size=1000,
+        min_chunk_size=50,
+        target_events=1000,
+    )
+    events = asyncio.run(event_scanner.scan_adaptive(fetch_chunk, 0, 599, policy))
+    assert len(events) == 6000
+    assert events == sorted(events)
+    assert calls[:3] == [(0, 599), (0, 499), (0, 249)]
+    # 2500 events in the last window: shrink towards 100 blocks per chunk.
+    assert calls[3] == (250, 349)
+
+
+def test_scan_adaptive_raises_at_min_chunk_size():
+    calls = []
+
+    async def fetch_chunk(chunk_start, chunk_end):
+        calls.append((chunk_start, chunk_end))
+        raise TimeoutError("provider timed out")
+
+    policy = event_scanner.AdaptiveChunkPolicy(
+        initial_chunk_size=400, min_chunk_size=100
+    )
+    with pytest.raises(TimeoutError, match="provider timed out"):
+        asyncio.run(event_scanner.scan_adaptive(fetch_chunk, 0, 1000, policy))
+    assert calls == [(0, 399), (0, 199), (0, 99)]
+
+
+@pytest.mark.parametrize(
+    "error",
+    [RuntimeError("bug"), ClientError("Unauthorized", code="401")],
+)
+def test_scan_adaptive_raises_other_errors_without_shrinking(error):
+    calls = []
+
+    async def fetch_chunk(chunk_start, chunk_end):
+        calls.append((chunk_start, chunk_end))
+        raise error
+
+    policy = event_scanner.AdaptiveChunkPolicy(
+        initial_chunk_size=400, min_chunk_size=100
+    )
+    with pytest.raises(type(error)):
+        asyncio.run(event_scanner.scan_adaptive(fetch_chunk, 0, 1000, policy))
+    assert calls == [(0, 399)]
+
+
+class SparseChain:
+    """
+    Fake event source with events at the given blocks, counting requests.
+    """
+
+    def __init__(self, event_blocks):
+        self.event_blocks = sorted(event_blocks)
+        self.fetch_calls = 0
+        self.probe_calls = 0
+
+    async def fetch_chunk(self, chunk_start, chunk_end):
+        self.fetch_calls += 1
+        return [b for b in self.event_blocks if chunk_start <= b <= chunk_end]
+
+    async def has_events(self, chunk_start, chunk_end):
+        self.probe_calls += 1
+        return any(chunk_start <= b <= chunk_end for b in self.event_blocks)
+
+
+async def chain_find_last(chain, from_block, to_block, chunk_size):
+    return await event_scanner.find_last_event(
+        chain.fetch_chunk, from_block, to_block, chunk_size
+    )
+
+
+async def chain_bisect_last(chain, from_block, to_block, chunk_size):
+    return await event_scanner.bisect_last_event(
+        chain.fetch_chunk, chain.has_events, from_block, to_block, chunk_size
+    )
+
+
+def test_split_block_range_backwards_includes_earliest_chunk():
+    assert event_scanner.split_block_range_backwards(0, 250, 100) == [
+        (151, 250),
+        (51, 150),
+        (0, 50),
+    ]
+    assert event_scanner.split_block_range_backwards(10, 10, 100) == [(10, 10)]
+    assert event_scanner.split_block_range_backwards(11, 10, 100) == []
+
+
+def test_find_last_event_in_earliest_chunk():
+    chain = SparseChain([3])
+    assert asyncio.run(chain_find_last(chain, 0, 250, 100)) == 3
+    assert chain.fetch_calls == 3
+
+
+def test_find_last_event_without_events():
+    chain = SparseChain([])
+    assert asyncio.run(chain_find_last(chain, 0, 250, 100)) is None
+
+
+@pytest.mark.parametrize(
+    "event_blocks,expected",
+    [
+        ([5], 5),
+        ([0], 0),
+        ([1_000_000], 1_000_000),
+        ([12, 777_777, 777_778], 777_778),
+        ([123_456], 123_456),
+        ([], None),
+    ],
+)
+def test_bisect_last_event(event_blocks, expected):
+    chain = SparseChain(event_blocks)
+    assert asyncio.run(chain_bisect_last(chain, 0, 1_000_000, 1_000)) == expected
+    assert chain.fetch_calls <= 1
+    # Linear scanning would need up to 1000 requests.
+    assert chain.probe_calls <= 2 * 20
+
+
+def test_bisect_last_event_respects_from_block():
+    chain = SparseChain([5, 50])
+    assert asyncio.run(chain_bisect_last(chain, 40, 100, 7)) == 50
+    chain = SparseChain([5])
+    assert asyncio.run(chain_bisect_last(chain, 40, 100, 7)) is None
+
+
+def test_group_events_by_selector_keeps_order():
+    events = [
+        SimpleNamespace(keys=[0xA, 1], data=[]),
+        {"keys": ["0xb", "0x2"], "data": []},
+        SimpleNamespace(keys=[0xA, 3], data=[]),
+        SimpleNamespace(keys=[0xC, 4], data=[]),
+    ]
+    grouped = event_scanner.group_events_by_selector(events, [0xA, 0xB, 0xD])
+    assert grouped == {0xA: [events[0], events[2]], 0xB: [events[1]], 0xD: []}
+
+
+async def _collect(iterator):
+    return [item async for item in iterator]
+
+
+def test_stream_block_ranges_yields_in_order_with_bounded_lookahead():
+    fetcher = RecordingFetcher()
+    chunks = asyncio.run(
+        _collect(
+            event_scanner.stream_block_ranges(
+                fetcher, event_scanner.split_block_range(0, 99, 10), max_concurrency=4
+            )
+        )
+    )
+    assert chunks == [list(range(start, start + 10)) for start in range(0, 100, 10)]
+    assert fetcher.max_in_flight <= 4
+
+
+def test_stream_block_ranges_applies_backpressure():
+    fetcher = RecordingFetcher()
+
+    async def consume_first_chunk():
+        stream = event_scanner.stream_block_ranges(
+            fetcher, event_scanner.split_block_range(0, 99, 10), max_concurrency=2
+        )
+        first = await stream.__anext__()
+        await asyncio.sleep(0.2)
+        await stream.aclose()
+        return first
+
+    assert asyncio.run(consume_first_chunk()) == list(range(10))
+    # Only the chunks within the lookahead window were requested.
+    assert len(fetcher.calls) == 3
+
+
+def test_prefetch_bounds_buffer_and_propagates_errors():
+    produced = []
+
+    async def source():
+        for i in range(10):
+            produced.append(i)
+            yield i
+        raise RuntimeError("page failed")
+
+    async def run():
+        stream = event_scanner.prefetch(source(), max_buffered=2)
+        first = await stream.__anext__()
+        await asyncio.sleep(0.01)
+        # One item consumed, two buffered, one blocked on the full queue.
+        assert len(produced) <= 4
+        rest = [item async for item in stream]
+        return [first] + rest
+
+    with pytest.raises(RuntimeError, match="page failed"):
+        asyncio.run(run())
+    assert produced == list(range(10))
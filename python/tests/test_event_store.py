@@ -0,0 +1,23 @@
+from conftest import load_module
+
+event_store = load_module("utils/event_store.py", "event_store")
+
+
+def test_load_missing_record_returns_none(tmp_path):
+    store = event_store.EventStore(tmp_path)
+    assert store.load("0x534e5f5345504f4c4941", 0x1, 0x2) is None
+
+
+def test_save_and_load_round_trip(tmp_path):
+    store = event_store.EventStore(tmp_path)
+    record = event_store.EventStoreRecord(
+        from_block=10,
+        scanned_to_block=20,
+        events=[{"block_number": 12, "keys": [0x2], "data": [0x3]}],
+    )
+    store.save("0x534e5f5345504f4c4941", 0x1, 0x2, record)
+    assert store.load("0x534e5f5345504f4c4941", 0x1, 0x2) == record
+    # Records are separated by chain, contract and selector.
+    assert store.load("0x534e5f4d41494e", 0x1, 0x2) is None
+    assert store.load("0x534e5f5345504f4c4941", 0x1, 0x3) is None
+    assert not list(tmp_path.rglob("*.tmp"))
@@ -0,0 +1,100 @@
+import asyncio
+from types import SimpleNamespace
+
+from starknet_py.net.client_models import EstimatedFee, PriceUnit
+
+from conftest import load_module
+
+fee_estimation = load_module("utils/fee_estimation.py", "fee_estimation")
+
+
+def _fee(scale):
+    return EstimatedFee(
+        l1_gas_consumed=10 * scale,
+        l1_gas_price=100,
+        l2_gas_consumed=20 * scale,
+        l2_gas_price=200,
+        l1_data_gas_consumed=30 * scale,
+        l1_data_gas_price=300,
+        overall_fee=0,
+        unit=PriceUnit.FRI,
+    )
+
+
+class FeeNode:
+    def __init__(self):
+        self.estimate_requests = []
+
+    async def estimate_fee(self, tx, skip_validate=False):
+        self.estimate_requests.append(tx)
+        return [_fee(i + 1) for i in range(len(tx))]
+
+
+def test_estimates_all_transactions_in_one_request():
+    node = FeeNode()
+    margins = fee_estimation.FeeMarginPolicy(
+        l2_gas=fee_estimation.ResourceMargin(amount=2, price=1)
+    )
+
+    bounds = asyncio.run(
+        fee_estimation.estimate_resource_bounds(node, ["tx0", "tx1"], margins)
+    )
+
+    assert node.estimate_requests == [["tx0", "tx1"]]
+    assert [b.l2_gas.max_amount for b in bounds] == [40, 80]
+    assert [b.l2_gas.max_price_per_unit for b in bounds] == [200, 200]
+    assert [b.l1_gas.max_amount for b in bounds] == [15, 30]
+    assert bounds[0].l1_data_gas.max_price_per_unit == 450
+
+
+def test_uniform_policy_scales_everything():
+    bounds = fee_estimation.FeeMarginPolicy.uniform(10).resource_bounds(_fee(1))
+
+    assert bounds.l1_gas.max_amount == 100
+    assert bounds.l1_gas.max_price_per_unit == 1000
+    assert bounds.l1_data_gas.max_amount == 300
+
+
+def _tx(calldata, nonce):
+    return SimpleNamespace(
+        sender_address=0xA, calldata=calldata, account_deployment_data=[], nonce=nonce
+    )
+
+
+def test_default_margins_multiply_everything_by_ten():
+    (bounds,) = asyncio.run(fee_estimation.estimate_resource_bounds(FeeNode(), ["tx0"]))
+
+    assert bounds.l2_gas.max_amount == 200
+    assert bounds.l2_gas.max_price_per_unit == 2000
+
+
+def test_fee_cache_skips_estimates_of_unchanged_transactions():
+    node = FeeNode()
+    fee_cache = fee_estimation.FeeEstimateCache(ttl=60)
+    margins = fee_estimation.FeeMarginPolicy.uniform(1)
+
+    async def estimate(txs):
+        return await fee_estimation.estimate_resource_bounds(
+            node, txs, margins, fee_cache
+        )
+
+    async def run():
+        first = await estimate([_tx([1], 0), _tx([2], 1)])
+        # Same calldata with later nonces: no request.
+        second = await estimate([_tx([1], 2), _tx([2], 3)])
+        # A new transaction: the whole list is estimated again, in order.
+        third = await estimate([_tx([1], 4), _tx([3], 5)])
+        return first, second, third
+
+    first, second, third = asyncio.run(run())
+
+    assert [[tx.nonce for tx in txs] for txs in node.estimate_requests] == [
+        [0, 1],
+        [4, 5],
+    ]
+    assert second == first
+    assert third[1].l2_gas.max_amount == 40
+
+    fee_cache.invalidate()
+    asyncio.run(estimate([_tx([1], 6)]))
+    assert len(node.estimate_requests) == 3
@@ -0,0 +1,78 @@
+from types import SimpleNamespace
+
+import pytest
+
+from conftest import load_module
+
+multicall_packer = load_module("utils/multicall_packer.py", "multicall_packer")
+
+
+def _calls(*calldata_lengths):
+    return [SimpleNamespace(calldata=[0] * n) for n in calldata_lengths]
+
+
+def test_packs_greedily_under_calldata_limit():
+    calls = _calls(5, 5, 5, 5)
+    # Each call takes 8 felts plus 1 for the number of calls.
+    limits = multicall_packer.MulticallLimits(max_calldata_length=17)
+
+    groups = multicall_packer.pack_calls(calls, limits)
+
+    assert groups == [calls[:2], calls[2:]]
+
+
+def test_respects_call_count_and_gas_limits():
+    calls = _calls(1, 1, 1, 1, 1)
+    limits = multicall_packer.MulticallLimits(max_calls=3, max_l2_gas=100)
+
+    groups = multicall_packer.pack_calls(calls, limits, l2_gas=[40, 40, 40, 10, 10])
+
+    assert groups == [calls[:2], calls[2:5]]
+
+
+def test_call_over_gas_limit_gets_its_own_transaction():
+    calls = _calls(1, 1, 1)
+    limits = multicall_packer.MulticallLimits(max_l2_gas=100)
+
+    groups = multicall_packer.pack_calls(calls, limits, l2_gas=[10, 500, 10])
+
+    assert groups == [calls[:1], calls[1:2], calls[2:]]
+
+
+def test_gas_limit_counts_transaction_overhead_once():
+    calls = _calls(1, 1, 1, 1)
+    limits = multicall_packer.MulticallLimits(max_l2_gas=100)
+
+    groups = multicall_packer.pack_calls(
+        calls, limits, l2_gas=[30, 30, 30, 30], l2_gas_overhead=30
+    )
+
+    assert groups == [calls[:2], calls[2:]]
+
+
+def test_rejects_call_over_calldata_limit():
+    limits = multicall_packer.MulticallLimits(max_calldata_length=10)
+
+    with pytest.raises(ValueError, match="Call 1"):
+        multicall_packer.pack_calls(_calls(1, 7), limits)
+
+
+def test_gas_limit_requires_estimates():
+    limits = multicall_packer.MulticallLimits(max_l2_gas=100)
+
+    with pytest.raises(ValueError):
+        multicall_packer.pack_calls(_calls(1), limits)
+    assert multicall_packer.pack_calls([]) == []
+
+
+def test_split_groups_halves_only_the_given_groups():
+    groups = [[1, 2, 3], [4], [5, 6]]
+
+    assert multicall_packer.split_groups(groups, {0, 1, 2}) == [
+        [1],
+        [2, 3],
+        [4],
+        [5],
+        [6],
+    ]
+    assert multicall_packer.split_groups(groups, {2}) == [[1, 2, 3], [4], [5], [6]]
@@ -0,0 +1,160 @@
+import asyncio
+
+import pytest
+
+from conftest import load_module
+
+nonce_manager = load_module("utils/nonce_manager.py", "nonce_manager")
+
+
+class FakeNode:
+    def __init__(self, nonces):
+        self.nonces = nonces
+        self.fetches = 0
+
+    async def get_contract_nonce(self, contract_address):
+        self.fetches += 1
+        await asyncio.sleep(0.001)
+        return self.nonces[contract_address]
+
+
+def test_hands_out_sequential_nonces_with_one_fetch():
+    node = FakeNode({0xA: 7, 0xB: 0})
+    manager = nonce_manager.NonceManager(node)
+
+    async def run():
+        a = await asyncio.gather(*(manager.next_nonce("0xa") for _ in range(5)))
+        b = await manager.next_nonce(0xB)
+        return a, b
+
+    a, b = asyncio.run(run())
+    assert sorted(a) == [7, 8, 9, 10, 11]
+    assert b == 0
+    assert node.fetches == 2
+
+
+def test_reserve_resyncs_on_failed_submission():
+    node = FakeNode({0xA: 3})
+    manager = nonce_manager.NonceManager(node)
+
+    async def run():
+        async with manager.reserve(0xA) as first:
+            # The first transaction reaches the node.
+            node.nonces[0xA] = 4
+        with pytest.raises(RuntimeError):
+            async with manager.reserve(0xA) as second:
+                assert second == first + 1
+                raise RuntimeError("invalid transaction nonce")
+        return first, await manager.next_nonce(0xA)
+
+    assert asyncio.run(run()) == (3, 4)
+    assert node.fetches == 2
+
+
+def test_failed_reservation_keeps_nonces_of_concurrent_ones():
+    node = FakeNode({0xA: 0})
+    manager = nonce_manager.NonceManager(node)
+    second_reserved = asyncio.Event()
+    first_failed = asyncio.Event()
+
+    async def first():
+        with pytest.raises(RuntimeError):
+            async with manager.reserve(0xA) as nonce:
+                await second_reserved.wait()
+                raise RuntimeError(f"nonce {nonce} rejected")
+        first_failed.set()
+
+    async def second():
+        await asyncio.sleep(0.01)
+        async with manager.reserve(0xA) as nonce:
+            second_reserved.set()
+            await first_failed.wait()
+            # The second transaction is still in flight: its nonce isn't handed out again.
+            during = await manager.next_nonce(0xA)
+        return nonce, during
+
+    async def run():
+        _, (nonce, during) = await asyncio.gather(first(), second())
+        return nonce, during, await manager.next_nonce(0xA)
+
+    nonce, during, after = asyncio.run(run())
+    assert (nonce, during) == (1, 2)
+    # Once nothing is in flight, the sender is resynced to fill the gap.
+    assert after == 0
+    assert node.fetches == 2
+
+
+def test_failed_batch_hands_back_unsubmitted_nonces():
+    node = FakeNode({0xA: 3})
+    manager = nonce_manager.NonceManager(node)
+
+    async def run():
+        with pytest.raises(RuntimeError):
+            async with manager.reserve_batch(0xA, 3) as batch:
+                batch.submitted += 1
+                raise RuntimeError("invalid transaction nonce")
+        return batch.nonces, await manager.next_nonce(0xA)
+
+    assert asyncio.run(run()) == ([3, 4, 5], 4)
+    assert node.fetches == 1
+
+
+def test_failed_batch_resyncs_after_concurrent_reservations():
+    node = FakeNode({0xA: 0})
+    manager = nonce_manager.NonceManager(node)
+
+    async def run():
+        async with manager.reserve(0xA) as nonce:
+            with pytest.raises(RuntimeError):
+                async with manager.reserve_batch(0xA, 2) as batch:
+                    raise RuntimeError("estimate failed")
+            # The concurrent reservation is in flight: its nonce isn't handed out again.
+            during = await manager.next_nonce(0xA)
+        return nonce, batch.nonces, during, await manager.next_nonce(0xA)
+
+    assert asyncio.run(run()) == (0, [1, 2], 3, 0)
+    assert node.fetches == 2
+
+
+def test_request_resync_waits_for_reservations_in_flight():
+    node = FakeNode({0xA: 0})
+    manager = nonce_manager.NonceManager(node)
+
+    async def run():
+        await manager.next_nonce(0xA)
+        async with manager.reserve(0xA) as nonce:
+            # The transaction of nonce 0 was rejected after its submission.
+            await manager.request_resync(0xA)
+            during = await manager.next_nonce(0xA)
+        return nonce, during, await manager.next_nonce(0xA)
+
+    assert asyncio.run(run()) == (1, 2, 0)
+    assert node.fetches == 2
+
+
+def test_forget_refetches_nonce():
+    node = FakeNode({0xA: 1})
+    manager = nonce_manager.NonceManager(node)
+
+    async def run():
+        await manager.next_nonce(0xA)
+        node.nonces[0xA] = 10
+        manager.forget(0xA)
+        return await manager.next_nonce(0xA)
+
+    assert asyncio.run(run()) == 10
+
+
+def test_peek_does_not_reserve():
+    node = FakeNode({0xA: 4})
+    manager = nonce_manager.NonceManager(node)
+
+    async def run():
+        return [
+            await manager.peek("0xa"),
+            await manager.next_nonce("0xa"),
+            await manager.peek("0xa"),
+        ]
+
+    assert asyncio.run(run()) == [4, 4, 5]
+    assert node.fetches == 1
@@ -1,23 +1,17 @@
 import asyncio
-import importlib.util
-from pathlib import Path
 from types import SimpleNamespace
 
 import pytest
 from marshmallow.exceptions import ValidationError
 from starknet_py.hash.selector import get_selector_from_name
 
+from conftest import load_module
 
-def _load_role_discovery_module():
-    module_path = Path(__file__).resolve().parents[1] / "utils" / "role_discovery.py"
-    spec = importlib.util.spec_from_file_location("role_discovery", module_path)
-    assert spec is not None and spec.loader is not None
-    module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(module)
-    return module
-
-
-role_discovery = _load_role_discovery_module()
+load_module("utils/event_scanner.py", "event_scanner", register=True)
+load_module("utils/rpc_batch.py", "rpc_batch", register=True)
+load_module("utils/rpc_pool.py", "rpc_pool", register=True)
+load_module("utils/rpc_limits.py", "rpc_limits", register=True)
+role_discovery = load_module("utils/role_discovery.py", "role_discovery", register=True)
 
 
 APP_GOVERNOR = role_discovery.ROLE_IDS[role_discovery.RoleName.AppGovernor]
@@ -130,3 +124,279 @@ def test_validation_error_uses_raw_get_events_fallback():
         ),
     )
     assert roles == {"AppGovernor": ["0x222"]}
+
+
+class ChunkRecordingClient(MissingEntrypointClient):
+    def __init__(self):
+        super().__init__()
+        self.ranges = []
+
+    async def get_block_number(self):
+        return 250_000
+
+    async def get_events(self, **kwargs):
+        self.ranges.append((kwargs["from_block_number"], kwargs["to_block_number"]))
+        return SimpleNamespace(events=[])
+
+
+def test_fixed_chunks_cover_whole_range():
+    client = ChunkRecordingClient()
+    asyncio.run(role_discovery._fetch_role_granted_events(client, "0x1"))
+    assert client.ranges == [(0, 99_999), (100_000, 199_999), (200_000, 250_000)]
+
+
+def test_adaptive_chunks_grow_on_quiet_contract():
+    client = ChunkRecordingClient()
+    asyncio.run(
+        role_discovery._fetch_role_granted_events(
+            client,
+            "0x1",
+            chunk_policy=role_discovery.AdaptiveChunkPolicy(initial_chunk_size=10_000),
+        ),
+    )
+    assert client.ranges == [
+        (0, 9_999),
+        (10_000, 49_999),
+        (50_000, 209_999),
+        (210_000, 250_000),
+    ]
+
+
+class ManyGranteesClient:
+    """
+    Grants AppGovernor to 0x100..0x13f; only even accounts still hold the role.
+    """
+
+    def __init__(self, has_role_missing=False):
+        self.has_role_missing = has_role_missing
+        self.has_role_calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get_block_number(self):
+        return 10
+
+    async def get_events(self, **kwargs):
+        return SimpleNamespace(
+            events=[
+                SimpleNamespace(keys=[ROLE_GRANTED, APP_GOVERNOR], data=[acct, 0xAAA])
+                for acct in reversed(range(0x100, 0x140))
+            ],
+        )
+
+    async def call_contract(self, call, block_number="latest"):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.001)
+        self.in_flight -= 1
+        if call.selector == HAS_ROLE_SELECTOR:
+            self.has_role_calls += 1
+            if self.has_role_missing:
+                raise Exception("Entry point has_role not found in contract")
+        return [1] if call.calldata[-1] % 2 == 0 else [0]
+
+
+EXPECTED_EVEN_HOLDERS = {"AppGovernor": [hex(a) for a in range(0x100, 0x140, 2)]}
+
+
+def test_concurrent_checks_are_bounded_and_deterministic():
+    client = ManyGranteesClient()
+    roles = asyncio.run(
+        role_discovery.extract_common_roles(client, "0x1", max_concurrency=4)
+    )
+    assert roles == EXPECTED_EVEN_HOLDERS
+    assert client.max_in_flight == 4
+    # Probe + one check per grantee.
+    assert client.has_role_calls == 1 + 0x40
+
+
+def test_concurrent_checks_use_legacy_entrypoints_when_has_role_missing():
+    client = ManyGranteesClient(has_role_missing=True)
+    roles = asyncio.run(
+        role_discovery.extract_common_roles(client, "0x1", max_concurrency=4)
+    )
+    assert roles == EXPECTED_EVEN_HOLDERS
+    assert client.has_role_calls == 1
+
+
+class BatchRpcHttpClient:
+    """
+    Answers batched ``starknet_call`` requests like ``ManyGranteesClient``.
+    """
+
+    url = "http://node"
+    method_prefix = "starknet"
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    async def request(self, address, http_method, payload):
+        self.batch_sizes.append(len(payload))
+        return [
+            {
+                "jsonrpc": "2.0",
+                "id": request["id"],
+                "result": [
+                    hex(int(request["params"]["request"]["calldata"][-1], 16) % 2 ^ 1)
+                ],
+            }
+            for request in payload
+        ]
+
+
+class BatchedGranteesClient(ManyGranteesClient):
+    def __init__(self):
+        super().__init__()
+        self._client = BatchRpcHttpClient()
+
+    async def call_contract(self, call, block_number="latest"):
+        raise AssertionError("membership checks should be batched")
+
+
+def test_batch_calls_send_membership_checks_in_few_requests():
+    client = BatchedGranteesClient()
+    roles = asyncio.run(
+        role_discovery.extract_common_roles(
+            client, "0x1", max_concurrency=64, batch_calls=True
+        )
+    )
+    assert roles == EXPECTED_EVEN_HOLDERS
+    # Probe, then all 64 checks in two batches of at most 50.
+    assert client._client.batch_sizes == [1, 50, 14]
+
+
+ROLE_REVOKED = role_discovery.ROLE_REVOKED_SELECTOR
+APP_GOVERNOR_ADDED = get_selector_from_name("AppGovernorAdded")
+APP_GOVERNOR_REMOVED = get_selector_from_name("AppGovernorRemoved")
+
+
+def _event(keys, data, block_number, transaction_index=0, event_index=0):
+    return SimpleNamespace(
+        keys=keys,
+        data=data,
+        block_number=block_number,
+        transaction_index=transaction_index,
+        event_index=event_index,
+    )
+
+
+class ReplayClient:
+    def __init__(self, holders):
+        self.holders = holders
+        self.has_role_calls = []
+        self.requested_keys = None
+
+    async def get_block_number(self):
+        return 10
+
+    async def get_events(self, **kwargs):
+        self.requested_keys = kwargs["keys"]
+        # Deliberately out of order: replay must sort by (block, tx, event).
+        return SimpleNamespace(
+            events=[
+                _event([ROLE_REVOKED, APP_GOVERNOR, 0x222, 0xAAA], [], 3),
+                _event([ROLE_GRANTED, APP_GOVERNOR, 0x111, 0xAAA], [], 1),
+                _event([ROLE_GRANTED, APP_GOVERNOR, 0x222, 0xAAA], [], 1, 1),
+                _event([APP_GOVERNOR_ADDED], [0x333, 0xAAA], 2, 0, 1),
+                _event([APP_GOVERNOR_REMOVED], [0x111, 0xAAA], 4),
+                _event([APP_GOVERNOR_ADDED], [0x111, 0xAAA], 4, 0, 1),
+                _event([APP_GOVERNOR_REMOVED], [0x333, 0xAAA], 4, 1, 0),
+            ],
+        )
+
+    async def call_contract(self, call, block_number="latest"):
+        if call.selector == HAS_ROLE_SELECTOR:
+            self.has_role_calls.append(call.calldata[1])
+            return [1] if call.calldata[1] in self.holders else [0]
+        return [0]
+
+
+def test_replay_events_computes_holders_with_one_spot_check():
+    client = ReplayClient(holders={0x111})
+    roles = asyncio.run(
+        role_discovery.extract_common_roles(client, "0x1", replay_events=True)
+    )
+    assert roles == {"AppGovernor": ["0x111"]}
+    # One scan for all role events.
+    assert len(client.requested_keys) == 1
+    assert int(hex(ROLE_REVOKED), 16) in [int(k, 16) for k in client.requested_keys[0]]
+    # Probe + a single spot-check instead of one call per candidate.
+    assert client.has_role_calls == [0, 0x111]
+
+
+def test_replay_events_falls_back_to_full_check_on_mismatch():
+    client = ReplayClient(holders={0x222})
+    roles = asyncio.run(
+        role_discovery.extract_common_roles(client, "0x1", replay_events=True)
+    )
+    assert roles == {"AppGovernor": ["0x222"]}
+    assert sorted(client.has_role_calls[2:]) == [0x111, 0x222, 0x333]
+
+
+def test_role_timeline_point_in_time_queries():
+    client = ReplayClient(holders=set())
+    timeline = asyncio.run(role_discovery.build_role_timeline(client, "0x1"))
+    app_governor = role_discovery.RoleName.AppGovernor
+    assert timeline.holders_at(app_governor, 0) == []
+    assert timeline.holders_at(app_governor, 1) == [0x111, 0x222]
+    assert timeline.holders_at(app_governor, 2) == [0x111, 0x222, 0x333]
+    assert timeline.holders_at(app_governor, 3) == [0x111, 0x333]
+    assert timeline.holders_at(app_governor, 4) == [0x111]
+    assert timeline.account_history(0x111) == {APP_GOVERNOR: [[1, 4], [4, None]]}
+    assert timeline.account_history(0x222) == {APP_GOVERNOR: [[1, 3]]}
+    assert timeline.account_history(0x444) == {}
+    assert timeline.current_holders() == {APP_GOVERNOR: {0x111}}
+    # No has_role calls are needed.
+    assert client.has_role_calls == []
+
+
+def test_role_timeline_dict_round_trip():
+    timeline = asyncio.run(
+        role_discovery.build_role_timeline(ReplayClient(holders=set()), "0x1")
+    )
+    restored = role_discovery.RoleTimeline.from_dict(timeline.to_dict())
+    assert restored.to_dict() == timeline.to_dict()
+    assert restored.holders_at(APP_GOVERNOR, 3) == [0x111, 0x333]
+
+
+class PerContractClient(MissingEntrypointClient):
+    async def get_events(self, **kwargs):
+        if kwargs["address"] == "0x2":
+            raise Exception("rpc timeout")
+        return await super().get_events(**kwargs)
+
+
+def test_batch_yields_results_and_errors_per_contract():
+    async def run():
+        return [
+            item
+            async for item in role_discovery.extract_common_roles_batch(
+                PerContractClient(), ["0x1", "0x2", "0x3"], max_contracts=2
+            )
+        ]
+
+    results = dict(asyncio.run(run()))
+    assert results["0x1"] == {"AppGovernor": ["0x111"]}
+    assert results["0x3"] == {"AppGovernor": ["0x111"]}
+    assert str(results["0x2"]) == "rpc timeout"
+
+
+def test_read_contract_addresses_skips_blanks_and_comments(tmp_path):
+    path = tmp_path / "addresses.txt"
+    path.write_text("0x1\n\n# bridge\n0x2  # token\n")
+    assert role_discovery._read_contract_addresses(str(path)) == ["0x1", "0x2"]
+
+
+def test_parser_accepts_address_after_rpc():
+    args = role_discovery._build_parser().parse_args(["--rpc", "http://x", "0xabc"])
+
+    assert args.rpc == ["http://x"]
+    assert args.contract_address == "0xabc"
+
+
+def test_parser_collects_repeated_rpc_urls():
+    args = role_discovery._build_parser().parse_args(
+        ["0xabc", "--rpc", "http://x", "--rpc", "http://y"]
+    )
+
+    assert args.rpc == ["http://x", "http://y"]
@@ -0,0 +1,86 @@
+import pytest
+
+from conftest import load_module
+
+role_grants = load_module("test_utils/role_grants.py", "role_grants")
+RoleChange = role_grants.RoleChange
+
+GOVERNANCE_ADMIN = 0x1
+APP_ROLE_ADMIN = 0x2
+
+
+def test_plan_groups_changes_by_admin_in_stages():
+    changes = role_grants.role_grants(
+        {
+            "app_governor": [0x10],
+            "app_role_admin": [APP_ROLE_ADMIN],
+            "operator": [0x11, 0x12],
+            "security_agent": [0x13],
+            "upgrade_governor": [0x14],
+        }
+    )
+
+    stages = role_grants.plan_role_changes(
+        changes,
+        {"governance_admin": [GOVERNANCE_ADMIN], "security_admin": [GOVERNANCE_ADMIN]},
+    )
+
+    assert stages == [
+        {
+            GOVERNANCE_ADMIN: [
+                RoleChange("app_role_admin", APP_ROLE_ADMIN),
+                RoleChange("security_agent", 0x13),
+                RoleChange("upgrade_governor", 0x14),
+            ]
+        },
+        {
+            APP_ROLE_ADMIN: [
+                RoleChange("app_governor", 0x10),
+                RoleChange("operator", 0x11),
+                RoleChange("operator", 0x12),
+            ]
+        },
+    ]
+
+
+def test_plan_puts_removals_after_registrations():
+    changes = [
+        RoleChange("governance_admin", GOVERNANCE_ADMIN, grant=False),
+        RoleChange("governance_admin", 0x20),
+    ]
+
+    stages = role_grants.plan_role_changes(
+        changes, {"governance_admin": [GOVERNANCE_ADMIN]}
+    )
+
+    assert stages == [{GOVERNANCE_ADMIN: [changes[1], changes[0]]}]
+    assert changes[0].entrypoint == "remove_governance_admin"
+
+
+def test_plan_removes_admin_role_after_the_changes_it_executes():
+    changes = [
+        RoleChange("app_role_admin", APP_ROLE_ADMIN, grant=False),
+        RoleChange("operator", 0x11),
+    ]
+
+    stages = role_grants.plan_role_changes(
+        changes,
+        {
+            "governance_admin": [GOVERNANCE_ADMIN],
+            "app_role_admin": [APP_ROLE_ADMIN],
+        },
+    )
+
+    assert stages == [
+        {APP_ROLE_ADMIN: [changes[1]]},
+        {GOVERNANCE_ADMIN: [changes[0]]},
+    ]
+
+
+def test_plan_rejects_changes_without_admin():
+    with pytest.raises(ValueError, match="register_operator"):
+        role_grants.plan_role_changes(
+            [RoleChange("operator", 0x10)], {"governance_admin": [GOVERNANCE_ADMIN]}
+        )
+    with pytest.raises(ValueError, match="Unknown role"):
+        role_grants.plan_role_changes([RoleChange("owner", 0x10)], {})
@@ -0,0 +1,139 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from starknet_py.net.client_errors import ClientError
+from starknet_py.net.client_models import Call
+
+from conftest import load_module
+
+rpc_batch = load_module("utils/rpc_batch.py", "rpc_batch")
+
+
+class FakeRpcHttpClient:
+    """
+    Answers ``starknet_call`` with the last calldata felt; fails for contract 0xbad.
+    """
+
+    url = "http://node"
+    method_prefix = "starknet"
+
+    def __init__(self, supports_batches=True, batch_error=None):
+        self.supports_batches = supports_batches
+        self.batch_error = batch_error
+        self.batch_sizes = []
+        self.single_calls = 0
+
+    @staticmethod
+    def _answer(request):
+        params = request["params"]
+        if params["request"]["contract_address"] == "0xbad":
+            return {
+                "jsonrpc": "2.0",
+                "id": request["id"],
+                "error": {"code": 21, "message": "Invalid message selector"},
+            }
+        return {
+            "jsonrpc": "2.0",
+            "id": request["id"],
+            "result": [params["request"]["calldata"][-1]],
+        }
+
+    async def request(self, address, http_method, payload):
+        self.batch_sizes.append(len(payload))
+        if self.batch_error is not None:
+            raise self.batch_error
+        if not self.supports_batches:
+            return {"jsonrpc": "2.0", "id": None, "error": {"code": -32600}}
+        # Responses may come back in any order.
+        return [self._answer(request) for request in reversed(payload)]
+
+    async def call(self, method_name, params):
+        self.single_calls += 1
+        response = self._answer({"id": 0, "params": params})
+        if "error" in response:
+            raise ClientError(message=response["error"]["message"])
+        return response["result"]
+
+
+def _call(contract_address, value):
+    return Call(to_addr=contract_address, selector=0x1234, calldata=[value])
+
+
+async def _call_all(client, calls):
+    return await asyncio.gather(
+        *(client.call_contract(call, block_number="latest") for call in calls),
+        return_exceptions=True,
+    )
+
+
+def test_concurrent_calls_share_batches():
+    http_client = FakeRpcHttpClient()
+    client = rpc_batch.BatchingClient(
+        SimpleNamespace(_client=http_client), max_batch_size=40
+    )
+    results = asyncio.run(_call_all(client, [_call(0x1, v) for v in range(100)]))
+    assert results == [[v] for v in range(100)]
+    assert http_client.batch_sizes == [40, 40, 20]
+
+
+def test_per_item_errors_reach_their_caller():
+    http_client = FakeRpcHttpClient()
+    client = rpc_batch.BatchingClient(SimpleNamespace(_client=http_client))
+    results = asyncio.run(_call_all(client, [_call(0x1, 5), _call(0xBAD, 6)]))
+    assert results[0] == [5]
+    assert isinstance(results[1], ClientError)
+    assert "Invalid message selector" in results[1].message
+    assert http_client.batch_sizes == [2]
+
+
+def test_falls_back_to_single_requests_without_batch_support():
+    http_client = FakeRpcHttpClient(supports_batches=False)
+    client = rpc_batch.BatchingClient(SimpleNamespace(_client=http_client))
+
+    async def run():
+        first = await _call_all(client, [_call(0x1, v) for v in range(3)])
+        second = await _call_all(client, [_call(0x1, 7)])
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first == [[0], [1], [2]]
+    assert second == [[7]]
+    assert http_client.batch_sizes == [3]
+    assert http_client.single_calls == 4
+
+
+def test_falls_back_to_single_requests_when_batches_get_http_4xx():
+    http_client = FakeRpcHttpClient(
+        batch_error=ClientError(code="413", message="Payload Too Large")
+    )
+    client = rpc_batch.BatchingClient(SimpleNamespace(_client=http_client))
+
+    results = asyncio.run(_call_all(client, [_call(0x1, v) for v in range(3)]))
+
+    assert results == [[0], [1], [2]]
+    assert http_client.batch_sizes == [3]
+    assert http_client.single_calls == 3
+
+
+def test_rate_limited_batch_fails_its_callers():
+    http_client = FakeRpcHttpClient(
+        batch_error=ClientError(code="429", message="Too Many Requests")
+    )
+    client = rpc_batch.BatchingClient(SimpleNamespace(_client=http_client))
+
+    results = asyncio.run(_call_all(client, [_call(0x1, v) for v in range(2)]))
+
+    assert all(isinstance(result, ClientError) for result in results)
+    assert http_client.single_calls == 0
+    assert client.batcher._batching_supported
+
+
+def test_other_attributes_are_delegated():
+    inner = SimpleNamespace(_client=FakeRpcHttpClient(), net="mainnet")
+    assert rpc_batch.BatchingClient(inner).net == "mainnet"
+
+
+def test_rejects_non_positive_batch_size():
+    with pytest.raises(ValueError):
+        rpc_batch.JsonRpcBatcher(SimpleNamespace(_client=None), max_batch_size=0)
@@ -0,0 +1,124 @@
+import asyncio
+import time
+
+import aiohttp
+import pytest
+from starknet_py.net.client_errors import ClientError
+
+from conftest import load_module
+
+load_module("utils/rpc_pool.py", "rpc_pool", register=True)
+rpc_limits = load_module("utils/rpc_limits.py", "rpc_limits", register=True)
+
+BLOCK_NUMBER = {"jsonrpc": "2.0", "method": "starknet_blockNumber", "id": 0}
+ADD_INVOKE = {"jsonrpc": "2.0", "method": "starknet_addInvokeTransaction", "id": 0}
+NO_DELAY = rpc_limits.RetryPolicy(max_retries=3, base_delay=0)
+
+
+class ScriptedRpcHttpClient:
+    """
+    Fails with the scripted errors first, then answers every request.
+    """
+
+    url = "http://node"
+    session = None
+    method_prefix = "starknet"
+
+    def __init__(self, failures=()):
+        self.failures = list(failures)
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def request(self, address, http_method, params=None, payload=None):
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.001)
+            if self.failures:
+                failure = self.failures.pop(0)
+                if isinstance(failure, dict):
+                    return failure
+                raise failure
+            return {"jsonrpc": "2.0", "id": 0, "result": self.requests}
+        finally:
+            self.in_flight -= 1
+
+
+def _request(client, payload=BLOCK_NUMBER):
+    return client.request(
+        address=client.url, http_method=rpc_limits.HttpMethod.POST, payload=payload
+    )
+
+
+def test_retries_transient_read_failures():
+    inner = ScriptedRpcHttpClient(
+        [
+            ClientError(code="429", message="throttled"),
+            ClientError(code="503", message="unavailable"),
+            aiohttp.ClientConnectionError("reset"),
+            {"jsonrpc": "2.0", "id": 0, "error": {"code": -32005, "message": "limit"}},
+        ]
+    )
+    client = rpc_limits.RateLimitedRpcHttpClient(
+        inner, retry_policy=rpc_limits.RetryPolicy(max_retries=4, base_delay=0)
+    )
+    assert asyncio.run(_request(client))["result"] == 5
+
+
+def test_gives_up_after_max_retries():
+    inner = ScriptedRpcHttpClient([ClientError(code="503", message="down")] * 10)
+    client = rpc_limits.RateLimitedRpcHttpClient(inner, retry_policy=NO_DELAY)
+    with pytest.raises(ClientError):
+        asyncio.run(_request(client))
+    assert inner.requests == 4
+
+
+def test_does_not_retry_non_transient_errors():
+    inner = ScriptedRpcHttpClient([ClientError(code="400", message="bad request")])
+    client = rpc_limits.RateLimitedRpcHttpClient(inner, retry_policy=NO_DELAY)
+    with pytest.raises(ClientError):
+        asyncio.run(_request(client))
+    assert inner.requests == 1
+
+
+def test_writes_are_retried_only_when_not_processed():
+    inner = ScriptedRpcHttpClient([ClientError(code="429", message="throttled")])
+    client = rpc_limits.RateLimitedRpcHttpClient(inner, retry_policy=NO_DELAY)
+    assert asyncio.run(_request(client, ADD_INVOKE))["result"] == 2
+
+    inner = ScriptedRpcHttpClient([ClientError(code="502", message="bad gateway")])
+    client = rpc_limits.RateLimitedRpcHttpClient(inner, retry_policy=NO_DELAY)
+    with pytest.raises(ClientError):
+        asyncio.run(_request(client, ADD_INVOKE))
+    assert inner.requests == 1
+
+
+def test_limiter_bounds_rate_and_in_flight():
+    inner = ScriptedRpcHttpClient()
+    limiter = rpc_limits.RateLimiter(requests_per_second=200, max_in_flight=3, burst=5)
+    client = rpc_limits.RateLimitedRpcHttpClient(inner, limiter=limiter)
+
+    async def run():
+        started_at = time.monotonic()
+        await asyncio.gather(*(_request(client) for _ in range(25)))
+        return time.monotonic() - started_at
+
+    # 5 burst tokens, then 20 more at 200 per second.
+    assert asyncio.run(run()) >= 0.09
+    assert inner.max_in_flight == 3
+
+
+def test_retry_delay_is_capped_and_jittered():
+    policy = rpc_limits.RetryPolicy(base_delay=1, max_delay=4)
+    delays = [policy.delay(10) for _ in range(100)]
+    assert all(0 <= delay <= 4 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+def test_rejects_invalid_limits():
+    with pytest.raises(ValueError):
+        rpc_limits.RateLimiter(requests_per_second=0)
+    with pytest.raises(ValueError):
+        rpc_limits.RateLimiter(max_in_flight=0)
@@ -0,0 +1,139 @@
+import asyncio
+
+import aiohttp
+import pytest
+from starknet_py.net.client_errors import ClientError
+
+from conftest import load_module
+
+rpc_pool = load_module("utils/rpc_pool.py", "rpc_pool")
+
+BLOCK_NUMBER = {"jsonrpc": "2.0", "method": "starknet_blockNumber", "id": 0}
+ADD_INVOKE = {"jsonrpc": "2.0", "method": "starknet_addInvokeTransaction", "id": 0}
+
+
+class FakeResponse:
+    def __init__(self, url, status, delay):
+        self.url = url
+        self.status = status
+        self.delay = delay
+
+    async def __aenter__(self):
+        await asyncio.sleep(self.delay)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def text(self):
+        return "error"
+
+    async def json(self, content_type=None):
+        return {"jsonrpc": "2.0", "id": 0, "result": self.url}
+
+
+class FakeSession:
+    """
+    Answers every request with the URL of the endpoint that served it.
+    """
+
+    def __init__(self, statuses=None, delays=None, unreachable=()):
+        self.statuses = statuses or {}
+        self.delays = delays or {}
+        self.unreachable = set(unreachable)
+        self.requests = []
+
+    def request(self, method, url, params=None, json=None, headers=None):
+        self.requests.append((url, headers))
+        if url in self.unreachable:
+            raise aiohttp.ClientConnectionError("connection refused")
+        return FakeResponse(
+            url, self.statuses.get(url, 200), self.delays.get(url, 0.001)
+        )
+
+
+def _request(pool, payload=BLOCK_NUMBER):
+    return pool.request(
+        address=pool.url, http_method=rpc_pool.HttpMethod.POST, payload=payload
+    )
+
+
+def test_routes_to_fastest_endpoint():
+    session = FakeSession(delays={"a": 0.05, "b": 0.001})
+    pool = rpc_pool.RpcPool(["a", "b"], session=session, hedge_after=None)
+
+    async def run():
+        # Learn both latencies, then route by them.
+        await _request(pool)
+        pool.stats["a"].latency = 0.05
+        return [(await _request(pool))["result"] for _ in range(3)]
+
+    assert asyncio.run(run()) == ["b", "b", "b"]
+
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_fails_over_on_throttling_and_server_errors(status):
+    session = FakeSession(statuses={"a": status})
+    pool = rpc_pool.RpcPool(["a", "b"], session=session)
+
+    async def run():
+        return [(await _request(pool))["result"] for _ in range(3)]
+
+    assert asyncio.run(run()) == ["b", "b", "b"]
+    # "a" is skipped while cooling down.
+    assert [url for url, _ in session.requests] == ["a", "b", "b", "b"]
+    assert pool.stats["a"].failures == 1
+
+
+def test_fails_over_on_unreachable_endpoint():
+    session = FakeSession(unreachable={"a"})
+    pool = rpc_pool.RpcPool(["a", "b"], session=session)
+    assert asyncio.run(_request(pool))["result"] == "b"
+
+
+def test_client_errors_are_not_retried():
+    session = FakeSession(statuses={"a": 400})
+    pool = rpc_pool.RpcPool(["a", "b"], session=session)
+    with pytest.raises(ClientError):
+        asyncio.run(_request(pool))
+    assert len(session.requests) == 1
+
+
+def test_raises_last_error_when_all_endpoints_fail():
+    session = FakeSession(statuses={"a": 503, "b": 429})
+    pool = rpc_pool.RpcPool(["a", "b"], session=session)
+    with pytest.raises(ClientError) as e:
+        asyncio.run(_request(pool))
+    assert e.value.code == "429"
+
+
+def test_hedges_slow_reads():
+    session = FakeSession(delays={"a": 0.5, "b": 0.001})
+    pool = rpc_pool.RpcPool(["a", "b"], session=session, hedge_after=0.01)
+    assert asyncio.run(_request(pool))["result"] == "b"
+    assert [url for url, _ in session.requests] == ["a", "b"]
+
+
+def test_writes_are_not_hedged_or_failed_over_on_server_errors():
+    session = FakeSession(statuses={"a": 503}, delays={"a": 0.05})
+    pool = rpc_pool.RpcPool(["a", "b"], session=session, hedge_after=0.01)
+    with pytest.raises(ClientError):
+        asyncio.run(_request(pool, ADD_INVOKE))
+    assert [url for url, _ in session.requests] == ["a"]
+
+
+def test_endpoint_headers_are_sent_only_to_their_endpoint():
+    session = FakeSession(statuses={"a": 429})
+    pool = rpc_pool.RpcPool(
+        [rpc_pool.RpcEndpoint("a"), rpc_pool.RpcEndpoint("b", {"x-apikey": "k"})],
+        session=session,
+    )
+    asyncio.run(_request(pool))
+    assert session.requests == [("a", {}), ("b", {"x-apikey": "k"})]
+
+
+def test_create_pooled_client_routes_client_calls():
+    session = FakeSession(statuses={"a": 503})
+    client = rpc_pool.create_pooled_client(["a", "b"], session=session)
+    client._client._is_spec_version_verified = True
+    assert asyncio.run(client._client.call("blockNumber")) == "b"
@@ -0,0 +1,706 @@
+import asyncio
+import importlib
+import sys
+import types
+from dataclasses import replace
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from starknet_py.net.client_errors import ClientError
+from starknet_py.net.client_models import (
+    Call,
+    EmittedEvent,
+    EstimatedFee,
+    EventsChunk,
+    PriceUnit,
+    TransactionExecutionStatus,
+    TransactionStatus,
+    TransactionStatusResponse,
+)
+from starknet_py.transaction_errors import TransactionFailedError
+
+
+def _load_starknet_py_utils_module():
+    # starknet_py_utils is a subpackage of a project that provides the ``config`` module it imports
+    # from its parent package. Only the constants it reads are defined here.
+    package = types.ModuleType("starknet_utils_test_pkg")
+    package.__path__ = []
+    config = types.ModuleType("starknet_utils_test_pkg.config")
+    # Read by utils.split_chunks; the fetch_events tests pass chunk_size explicitly.
+    config.CHUNK_SIZE = 100
+    for name in [
+        "TX_CALLDATA",
+        "TX_NONCE",
+        "TX_SENDER_ADDRESS",
+        "TX_VERSION",
+        "TX_ACCOUNT_DEPLOYMENT_DATA",
+        "TX_RESOURCE_BOUNDS",
+        "TX_SIGNATURE",
+    ]:
+        setattr(config, name, name.lower())
+    utils = types.ModuleType("starknet_utils_test_pkg.utils")
+    utils.__path__ = [str(Path(__file__).resolve().parents[1] / "utils")]
+    sys.modules[package.__name__] = package
+    sys.modules[config.__name__] = config
+    sys.modules[utils.__name__] = utils
+    return importlib.import_module("starknet_utils_test_pkg.utils.starknet_py_utils")
+
+
+starknet_py_utils = _load_starknet_py_utils_module()
+deploy_plan = sys.modules["starknet_utils_test_pkg.utils.deploy_plan"]
+tx_waiter = sys.modules["starknet_utils_test_pkg.utils.tx_waiter"]
+
+CONTRACT = "0x123"
+EVENT = "RoleGranted"
+
+
+class EventsNode:
+    def __init__(self, latest_block, event_blocks):
+        self.latest_block = latest_block
+        self.event_blocks = event_blocks
+        self.ranges = []
+
+    async def get_block_number(self):
+        return self.latest_block
+
+    async def get_chain_id(self):
+        return "0x534e5f5345504f4c4941"
+
+    async def get_events(
+        self, address, keys, from_block_number, to_block_number, **kwargs
+    ):
+        self.ranges.append((from_block_number, to_block_number))
+        return EventsChunk(
+            events=[
+                EmittedEvent(
+                    from_address=int(address, 16),
+                    keys=[int(keys[0][0], 16)],
+                    data=[block],
+                    transaction_hash=block,
+                    transaction_index=0,
+                    event_index=0,
+                    block_hash=block,
+                    block_number=block,
+                )
+                for block in self.event_blocks
+                if from_block_number <= block <= to_block_number
+            ],
+            continuation_token=None,
+        )
+
+
+def _fetch_cached(node, store, from_block=0, **kwargs):
+    return asyncio.run(
+        starknet_py_utils.fetch_events_cached(
+            CONTRACT,
+            EVENT,
+            node,
+            store,
+            from_block=from_block,
+            chunk_size=1000,
+            finality_margin=10,
+            **kwargs,
+        )
+    )
+
+
+def _stored_record(store):
+    return store.load(
+        "0x534e5f5345504f4c4941",
+        int(CONTRACT, 16),
+        starknet_py_utils.get_selector_from_name(EVENT),
+    )
+
+
+def test_fetch_events_cached_resumes_after_stored_blocks(tmp_path):
+    store = starknet_py_utils.EventStore(tmp_path)
+    node = EventsNode(latest_block=100, event_blocks=[5, 50, 95])
+
+    events = _fetch_cached(node, store)
+
+    assert [e.block_number for e in events] == [5, 50, 95]
+    # The final blocks are stored, the tail within the finality margin isn't.
+    assert node.ranges == [(0, 90), (91, 100)]
+    record = _stored_record(store)
+    assert record.scanned_to_block == 90
+    assert [e["block_number"] for e in record.events] == [5, 50]
+
+    node.latest_block = 120
+    node.event_blocks.append(105)
+    node.ranges.clear()
+    events = _fetch_cached(node, store)
+
+    assert [e.block_number for e in events] == [5, 50, 95, 105]
+    assert node.ranges == [(91, 110), (111, 120)]
+    assert _stored_record(store).scanned_to_block == 110
+
+
+def test_fetch_events_cached_resets_record_for_earlier_from_block(tmp_path):
+    store = starknet_py_utils.EventStore(tmp_path)
+    node = EventsNode(latest_block=100, event_blocks=[5, 50])
+    _fetch_cached(node, store, from_block=40)
+    node.ranges.clear()
+
+    events = _fetch_cached(node, store, from_block=0)
+
+    assert [e.block_number for e in events] == [5, 50]
+    assert node.ranges == [(0, 90), (91, 100)]
+    record = _stored_record(store)
+    assert (record.from_block, record.scanned_to_block) == (0, 90)
+
+
+def test_fetch_events_cached_passes_max_concurrency_to_every_fetch(
+    tmp_path, monkeypatch
+):
+    calls = []
+    fetch_events = starknet_py_utils.fetch_events
+
+    async def recording_fetch_events(*args, **kwargs):
+        calls.append(kwargs["max_concurrency"])
+        return await fetch_events(*args, **kwargs)
+
+    monkeypatch.setattr(starknet_py_utils, "fetch_events", recording_fetch_events)
+    store = starknet_py_utils.EventStore(tmp_path)
+
+    _fetch_cached(EventsNode(100, []), store, max_concurrency=4)
+
+    assert calls == [4, 4]
+
+
+def test_wait_for_tx_acceptance_subscription_stops_after_retries(monkeypatch):
+    async def never_finalized(ws_url, tx_hash, timeout):
+        await asyncio.wait_for(asyncio.Event().wait(), timeout)
+
+    monkeypatch.setattr(tx_waiter, "subscribe_transaction", never_finalized)
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(
+            starknet_py_utils.wait_for_tx_acceptance(
+                0x1, None, check_interval=0.01, retries=3, ws_url="ws://node"
+            )
+        )
+
+
+def test_setup_node_limits_the_client_only_when_asked():
+    async def run():
+        plain, _ = starknet_py_utils.setup_node(
+            None, "local", None, local_rpc="http://localhost:5050"
+        )
+        limited, _ = starknet_py_utils.setup_node(
+            None,
+            "local",
+            None,
+            local_rpc="http://localhost:5050",
+            retry_policy=starknet_py_utils.RetryPolicy(max_retries=1),
+        )
+        return type(plain._client).__name__, type(limited._client).__name__
+
+    assert asyncio.run(run()) == ("RpcHttpClient", "RateLimitedRpcHttpClient")
+
+
+class SlowStatusNode:
+    def __init__(self):
+        self.checks = 0
+
+    async def get_transaction_status(self, tx_hash):
+        self.checks += 1
+        await asyncio.sleep(0.05)
+        return TransactionStatusResponse(finality_status=TransactionStatus.RECEIVED)
+
+
+def test_wait_for_txs_acceptance_stops_after_retries_times_check_interval():
+    node = SlowStatusNode()
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(
+            starknet_py_utils.wait_for_txs_acceptance(
+                [0x1], node, check_interval=0.01, retries=50
+            )
+        )
+    # 50 checks of 0.05s would take 2.5s: the 0.5s bound stops the wait first.
+    assert node.checks < 20
+
+
+def _fee():
+    return EstimatedFee(
+        l1_gas_consumed=1,
+        l1_gas_price=1,
+        l2_gas_consumed=1,
+        l2_gas_price=1,
+        l1_data_gas_consumed=1,
+        l1_data_gas_price=1,
+        overall_fee=3,
+        unit=PriceUnit.FRI,
+    )
+
+
+class InvokeNode:
+    def __init__(self, nonce):
+        self.nonce = nonce
+        self.estimated = []
+
+    async def get_contract_nonce(self, address):
+        return self.nonce
+
+    async def estimate_fee(self, tx, skip_validate=False):
+        self.estimated.append(tx)
+        return [_fee() for _ in tx]
+
+
+def test_generate_invoke_txs_with_fee_reserves_every_nonce():
+    node = InvokeNode(nonce=5)
+    nonce_manager = starknet_py_utils.NonceManager(node)
+
+    async def run():
+        txs = await starknet_py_utils.generate_invoke_txs_with_fee(
+            [[1], [2], [3]], "0xa", node, nonce_manager=nonce_manager
+        )
+        return txs, await nonce_manager.next_nonce("0xa")
+
+    txs, next_nonce = asyncio.run(run())
+
+    assert [tx.nonce for tx in txs] == [5, 6, 7]
+    assert next_nonce == 8
+    # One estimate for the whole batch.
+    assert [[tx.nonce for tx in batch] for batch in node.estimated] == [[5, 6, 7]]
+
+
+class MulticallAccount:
+    def __init__(self, client, fail_at=None):
+        self.address = ACCOUNT_ADDRESS
+        self.client = client
+        self.fail_at = fail_at
+        self.executed = []
+
+    async def execute_v3(self, calls, resource_bounds, nonce):
+        assert resource_bounds is not None
+        if len(self.executed) == self.fail_at:
+            raise ClientError(message="Invalid transaction nonce")
+        self.executed.append((calls, nonce))
+        return SimpleNamespace(transaction_hash=len(self.executed))
+
+
+def _call_felts(multicall_calldata):
+    # The calldata holds the number of calls, then each call: address, selector, calldata
+    # length and calldata. The calls of these tests have one felt of calldata.
+    return multicall_calldata[4::4]
+
+
+class GasNode(InvokeNode):
+    """Estimates a multicall at 50 L2 gas plus the calldata felt of each of its calls."""
+
+    def __init__(self, nonce, reverting_call=None):
+        super().__init__(nonce)
+        self.reverting_call = reverting_call
+
+    async def estimate_fee(self, tx, skip_validate=False):
+        self.estimated.append(tx)
+        call_felts = [_call_felts(t.calldata) for t in tx]
+        for index, felts in enumerate(call_felts):
+            if self.reverting_call in felts:
+                raise ClientError(
+                    "Transaction execution error",
+                    code="41",
+                    data={"transaction_index": index},
+                )
+        return [
+            replace(_fee(), l2_gas_consumed=50 + sum(felts)) for felts in call_felts
+        ]
+
+
+def _multicall_calls(*gas):
+    return [Call(to_addr=0xC, selector=0x5E1, calldata=[g]) for g in gas]
+
+
+def test_execute_multicalls_splits_multicalls_over_the_gas_limit():
+    node = GasNode(nonce=3)
+    account = MulticallAccount(node)
+    calls = _multicall_calls(20, 20, 20, 20, 20)
+    limits = starknet_py_utils.MulticallLimits(max_l2_gas=110)
+
+    tx_hashes = asyncio.run(
+        starknet_py_utils.execute_multicalls(calls, account, limits, wait=False)
+    )
+
+    # The single multicall of 150 gas is split in half, and the halves fit. Then the
+    # multicalls are estimated for their fees.
+    assert [[tx.nonce for tx in batch] for batch in node.estimated] == [
+        [3],
+        [3, 4],
+        [3, 4],
+    ]
+    assert account.executed == [(calls[:2], 3), (calls[2:], 4)]
+    assert tx_hashes == [1, 2]
+
+
+def test_execute_multicalls_estimates_all_multicalls_together():
+    node = InvokeNode(nonce=3)
+    account = MulticallAccount(node)
+    calls = _multicall_calls(1, 2, 3, 4, 5)
+    limits = starknet_py_utils.MulticallLimits(max_calls=2)
+
+    asyncio.run(
+        starknet_py_utils.execute_multicalls(calls, account, limits, wait=False)
+    )
+
+    # Each multicall is estimated on the state left by the earlier ones, in a single request.
+    assert [[tx.nonce for tx in batch] for batch in node.estimated] == [[3, 4, 5]]
+    assert [tx.calldata[0] for tx in node.estimated[0]] == [2, 2, 1]
+    assert account.executed == [(calls[:2], 3), (calls[2:4], 4), (calls[4:], 5)]
+
+
+def test_execute_multicalls_estimates_gas_after_transactions_in_flight():
+    node = GasNode(nonce=3)
+    account = MulticallAccount(node)
+    nonce_manager = starknet_py_utils.NonceManager(node)
+    calls = _multicall_calls(20, 20, 20)
+    limits = starknet_py_utils.MulticallLimits(max_l2_gas=110)
+
+    async def run():
+        # Another transaction of the account is in flight with nonce 3.
+        await nonce_manager.next_nonce(ACCOUNT_ADDRESS)
+        await starknet_py_utils.execute_multicalls(
+            calls, account, limits, nonce_manager=nonce_manager, wait=False
+        )
+
+    asyncio.run(run())
+
+    assert [[tx.nonce for tx in batch] for batch in node.estimated] == [[4], [4]]
+    assert account.executed == [(calls, 4)]
+
+
+def test_execute_multicalls_releases_nonces_when_the_estimate_fails():
+    node = GasNode(nonce=3, reverting_call=7)
+    account = MulticallAccount(node)
+    nonce_manager = starknet_py_utils.NonceManager(node)
+    limits = starknet_py_utils.MulticallLimits(max_calls=1)
+
+    async def run():
+        with pytest.raises(ClientError):
+            await starknet_py_utils.execute_multicalls(
+                _multicall_calls(1, 7, 2),
+                account,
+                limits,
+                nonce_manager=nonce_manager,
+                wait=False,
+            )
+        return await nonce_manager.next_nonce(ACCOUNT_ADDRESS)
+
+    assert asyncio.run(run()) == 3
+    assert account.executed == []
+
+
+def test_execute_multicalls_hands_back_only_unsubmitted_nonces():
+    node = InvokeNode(nonce=3)
+    account = MulticallAccount(node, fail_at=1)
+    nonce_manager = starknet_py_utils.NonceManager(node)
+    limits = starknet_py_utils.MulticallLimits(max_calls=1)
+
+    async def run():
+        with pytest.raises(ClientError):
+            await starknet_py_utils.execute_multicalls(
+                _multicall_calls(1, 2, 3),
+                account,
+                limits,
+                nonce_manager=nonce_manager,
+                wait=False,
+            )
+        return await nonce_manager.next_nonce(ACCOUNT_ADDRESS)
+
+    # The node doesn't count the first, pending multicall yet: its nonce isn't reused.
+    assert asyncio.run(run()) == 4
+    assert [nonce for _, nonce in account.executed] == [3]
+
+
+class RejectingNode(InvokeNode):
+    """Accepts every transaction but the rejected ones."""
+
+    def __init__(self, nonce, rejected):
+        super().__init__(nonce)
+        self.rejected = rejected
+
+    async def get_transaction_status(self, tx_hash):
+        if tx_hash in self.rejected:
+            return TransactionStatusResponse(
+                finality_status="REJECTED", failure_reason="Invalid nonce"
+            )
+        return TransactionStatusResponse(
+            finality_status=TransactionStatus.ACCEPTED_ON_L2,
+            execution_status=TransactionExecutionStatus.SUCCEEDED,
+        )
+
+
+def test_execute_multicalls_resyncs_when_a_multicall_is_rejected():
+    node = RejectingNode(nonce=3, rejected={2})
+    account = MulticallAccount(node)
+    nonce_manager = starknet_py_utils.NonceManager(node)
+    limits = starknet_py_utils.MulticallLimits(max_calls=1)
+
+    async def run():
+        await nonce_manager.peek(ACCOUNT_ADDRESS)
+        # Once the multicalls are processed, only the first one used its nonce.
+        node.nonce = 4
+        with pytest.raises(TransactionFailedError):
+            await starknet_py_utils.execute_multicalls(
+                _multicall_calls(1, 2, 3),
+                account,
+                limits,
+                nonce_manager=nonce_manager,
+            )
+        return await nonce_manager.next_nonce(ACCOUNT_ADDRESS)
+
+    assert asyncio.run(run()) == 4
+    assert [nonce for _, nonce in account.executed] == [3, 4, 5]
+
+
+def test_pack_calls_by_l2_gas_names_the_reverting_call():
+    node = GasNode(nonce=0, reverting_call=7)
+    account = MulticallAccount(node)
+    limits = starknet_py_utils.MulticallLimits(max_l2_gas=1000)
+
+    with pytest.raises(ValueError, match="Call 1 fails"):
+        asyncio.run(
+            starknet_py_utils.pack_calls_by_l2_gas(
+                _multicall_calls(20, 7, 20), account, limits
+            )
+        )
+    # The failing multicall is split until the failing call is on its own.
+    assert [len(batch) for batch in node.estimated] == [1, 2, 3]
+
+
+DEPLOY_ABI = [
+    {
+        "type": "constructor",
+        "name": "constructor",
+        "inputs": [
+            {
+                "name": "other",
+                "type": "core::starknet::contract_address::ContractAddress",
+            }
+        ],
+    }
+]
+ACCOUNT_ADDRESS = 0xACC
+
+
+class DeployAccount:
+    def __init__(self, fail_at=None):
+        self.address = ACCOUNT_ADDRESS
+        self.client = DeployNode()
+        self.fail_at = fail_at
+        self.executed = []
+
+    async def execute_v3(self, calls, resource_bounds, nonce):
+        if len(self.executed) == self.fail_at:
+            raise ClientError(message="Invalid transaction nonce")
+        self.executed.append((nonce, calls))
+        return SimpleNamespace(transaction_hash=0x100 + nonce)
+
+
+class DeployNode(InvokeNode):
+    url = "http://devnet"
+
+    def __init__(self):
+        super().__init__(nonce=3)
+        self.status_checks = []
+
+    async def get_transaction_status(self, tx_hash):
+        self.status_checks.append(tx_hash)
+        return TransactionStatusResponse(
+            finality_status=TransactionStatus.ACCEPTED_ON_L2,
+            execution_status=TransactionExecutionStatus.SUCCEEDED,
+        )
+
+
+@pytest.fixture
+def fake_declares(monkeypatch):
+    declared = []
+
+    async def declare(contract_name, contract_folder, package, account, **kwargs):
+        # Declarations of classes that aren't declared yet take a nonce.
+        async with kwargs["nonce_manager"].reserve(account.address) as nonce:
+            # Later nonces reach the node first if the declarations are sent concurrently.
+            await asyncio.sleep(0.01 / (nonce + 1))
+            declared.append((contract_name, nonce))
+        return f"0x{len(contract_name):064x}"
+
+    monkeypatch.setattr(starknet_py_utils, "_declare_contract", declare)
+    monkeypatch.setattr(
+        starknet_py_utils, "get_contract_abi", lambda *args, **kwargs: DEPLOY_ABI
+    )
+    return declared
+
+
+DEPLOY_SPECS = [
+    deploy_plan.ContractSpec("A", "Token", [deploy_plan.ContractRef("B")], salt=1),
+    deploy_plan.ContractSpec("B", "Registry", [0x5], salt=2),
+    deploy_plan.ContractSpec(
+        "C", "Token", {"other": deploy_plan.ContractRef("A")}, salt=3
+    ),
+]
+
+
+def test_deploy_contracts_deploys_in_dependency_order(fake_declares):
+    account = DeployAccount()
+
+    manifest = asyncio.run(
+        starknet_py_utils.deploy_contracts(
+            DEPLOY_SPECS, "contracts", "pkg", account, max_deploys_per_tx=2
+        )
+    )
+
+    # The declarations are submitted in nonce order.
+    assert fake_declares == [("Registry", 3), ("Token", 4)]
+    # B before A before C; the multicalls use the nonces after the declarations.
+    assert [nonce for nonce, _ in account.executed] == [5, 6]
+    assert [len(calls) for _, calls in account.executed] == [2, 1]
+    deployed = [call for _, calls in account.executed for call in calls]
+    # UDC deployContract calldata: class hash, salt, unique, calldata length, calldata.
+    assert [call.calldata[1] for call in deployed] == [2, 1, 3]
+    assert deployed[1].calldata[4:] == [int(manifest["B"], 16)]
+    assert deployed[2].calldata[4:] == [int(manifest["A"], 16)]
+    # Both multicalls are estimated together, then awaited together.
+    assert [[tx.nonce for tx in batch] for batch in account.client.estimated] == [
+        [5, 6]
+    ]
+    assert set(account.client.status_checks) == {0x105, 0x106}
+
+
+def test_deploy_contracts_stops_at_failed_submission(fake_declares, tmp_path):
+    account = DeployAccount(fail_at=1)
+
+    with pytest.raises(ClientError):
+        asyncio.run(
+            starknet_py_utils.deploy_contracts(
+                DEPLOY_SPECS,
+                "contracts",
+                "pkg",
+                account,
+                max_deploys_per_tx=1,
+                manifest_path=tmp_path / "manifest.json",
+            )
+        )
+
+    assert [nonce for nonce, _ in account.executed] == [5]
+    assert account.client.status_checks == []
+    assert not (tmp_path / "manifest.json").exists()
+
+
+class ClassNode:
+    url = "http://devnet"
+
+    def __init__(self, error=None):
+        self.error = error
+        self.class_requests = []
+
+    async def get_class_by_hash(self, class_hash):
+        self.class_requests.append(class_hash)
+        if self.error is not None:
+            raise self.error
+        return SimpleNamespace(abi="[]")
+
+
+@pytest.fixture
+def contract_artifacts(tmp_path):
+    target = tmp_path / "target" / "release"
+    target.mkdir(parents=True)
+    contract_class = target / "pkg_Token.contract_class.json"
+    contract_class.write_text('{"abi": []}')
+    (target / "pkg_Token.compiled_contract_class.json").write_text("{}")
+    # Stands in for the Sierra class hash of the artifact.
+    starknet_py_utils.ARTIFACT_CACHE.derive(
+        contract_class, "sierra_class_hash", lambda _: 0x1234
+    )
+    return tmp_path
+
+
+@pytest.fixture
+def declares(monkeypatch):
+    declares = []
+
+    async def declare_v3(account, compiled_contract, compiled_contract_casm, **kwargs):
+        declares.append(kwargs["nonce"])
+        return SimpleNamespace(hash=0x99, class_hash=0x1234)
+
+    monkeypatch.setattr(
+        starknet_py_utils.Contract, "declare_v3", staticmethod(declare_v3)
+    )
+    return declares
+
+
+def _declare(contract_folder, node, **kwargs):
+    account = SimpleNamespace(address=ACCOUNT_ADDRESS, client=node)
+    return asyncio.run(
+        starknet_py_utils._declare_contract(
+            "Token", str(contract_folder), "pkg", account, wait=False, **kwargs
+        )
+    )
+
+
+def test_declared_class_is_not_declared_again(contract_artifacts, declares):
+    node = ClassNode()
+
+    result = _declare(contract_artifacts, node)
+
+    assert result == f"0x{0x1234:064x}"
+    assert node.class_requests == [0x1234]
+    assert declares == []
+
+
+def test_declared_class_cache_skips_the_node(contract_artifacts, declares):
+    node = ClassNode(error=AssertionError("unexpected request"))
+    declared_classes = starknet_py_utils.DeclaredClassCache()
+    declared_classes.add(node.url, 0x1234)
+
+    result = _declare(contract_artifacts, node, declared_classes=declared_classes)
+
+    assert result == f"0x{0x1234:064x}"
+    assert node.class_requests == []
+    assert declares == []
+
+
+def test_class_not_found_is_declared(contract_artifacts, declares):
+    node = ClassNode(
+        error=ClientError(code=starknet_py_utils.CLASS_HASH_NOT_FOUND, message="")
+    )
+
+    result = _declare(contract_artifacts, node)
+
+    assert result.hash == 0x99
+    assert declares == [None]
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        ClientError(code=starknet_py_utils.CLASS_ALREADY_DECLARED, message=""),
+        ClientError(code=-32603, message="Class with hash 0x1234 is already declared."),
+    ],
+)
+def test_class_declared_concurrently_returns_class_hash(
+    contract_artifacts, monkeypatch, error
+):
+    async def declare_v3(account, compiled_contract, compiled_contract_casm, **kwargs):
+        raise error
+
+    monkeypatch.setattr(
+        starknet_py_utils.Contract, "declare_v3", staticmethod(declare_v3)
+    )
+    node = ClassNode(
+        error=ClientError(code=starknet_py_utils.CLASS_HASH_NOT_FOUND, message="")
+    )
+    declared_classes = starknet_py_utils.DeclaredClassCache()
+
+    result = _declare(contract_artifacts, node, declared_classes=declared_classes)
+
+    assert result == f"0x{0x1234:064x}"
+    assert declared_classes.contains(node.url, 0x1234)
+
+
+def test_other_class_errors_propagate(contract_artifacts, declares):
+    node = ClassNode(error=ClientError(code="503", message="Service Unavailable"))
+
+    with pytest.raises(ClientError, match="503"):
+        _declare(contract_artifacts, node)
+    assert declares == []
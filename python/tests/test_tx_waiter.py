@@ -0,0 +1,261 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import aiohttp
+import pytest
+from starknet_py.net.client_errors import ClientError
+from starknet_py.net.client_models import (
+    TransactionExecutionStatus,
+    TransactionStatus,
+    TransactionStatusResponse,
+)
+from starknet_py.transaction_errors import (
+    TransactionNotReceivedError,
+    TransactionRevertedError,
+)
+
+from conftest import load_module
+
+load_module("utils/rpc_batch.py", "rpc_batch", register=True)
+tx_waiter = load_module("utils/tx_waiter.py", "tx_waiter", register=True)
+
+FAST = tx_waiter.PollingBackoff(initial_interval=0.001, max_interval=0.004)
+RECEIVED = TransactionStatusResponse(finality_status=TransactionStatus.RECEIVED)
+ACCEPTED = TransactionStatusResponse(
+    finality_status=TransactionStatus.ACCEPTED_ON_L2,
+    execution_status=TransactionExecutionStatus.SUCCEEDED,
+)
+REVERTED = TransactionStatusResponse(
+    finality_status=TransactionStatus.ACCEPTED_ON_L2,
+    execution_status=TransactionExecutionStatus.REVERTED,
+    failure_reason="assert failed",
+)
+
+
+NOT_FOUND = ClientError(code=29, message="Transaction hash not found")
+
+
+class ScriptedNode:
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.checks = 0
+
+    async def get_transaction_status(self, tx_hash):
+        self.checks += 1
+        status = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+        if isinstance(status, Exception):
+            raise status
+        return status
+
+
+def test_backoff_intervals_grow_to_max():
+    backoff = tx_waiter.PollingBackoff(
+        initial_interval=0.25, max_interval=2, multiplier=2
+    )
+    intervals = backoff.intervals()
+    assert [next(intervals) for _ in range(6)] == [0.25, 0.5, 1, 2, 2, 2]
+
+
+def test_polls_until_accepted():
+    node = ScriptedNode([NOT_FOUND, RECEIVED, RECEIVED, ACCEPTED])
+    assert asyncio.run(tx_waiter.poll_transaction(node, 0x1, FAST)) == 4
+
+
+def test_reverted_transaction_raises():
+    node = ScriptedNode([RECEIVED, REVERTED])
+    with pytest.raises(TransactionRevertedError, match="assert failed"):
+        asyncio.run(tx_waiter.poll_transaction(node, 0x1, FAST))
+
+
+def test_gives_up_after_max_checks():
+    node = ScriptedNode([RECEIVED])
+    with pytest.raises(TimeoutError):
+        asyncio.run(tx_waiter.poll_transaction(node, 0x1, FAST, max_checks=5))
+    assert node.checks == 5
+
+
+def test_never_received_transaction_raises():
+    node = ScriptedNode([NOT_FOUND])
+    with pytest.raises(TransactionNotReceivedError):
+        asyncio.run(tx_waiter.poll_transaction(node, 0x1, FAST, timeout=0.02))
+
+
+def test_other_errors_are_raised():
+    node = ScriptedNode([ClientError(code=-32603, message="internal")])
+    with pytest.raises(ClientError):
+        asyncio.run(tx_waiter.poll_transaction(node, 0x1, FAST))
+
+
+class FakeWebSocket:
+    def __init__(self, messages):
+        self.messages = messages
+        self.sent = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def send_json(self, data):
+        self.sent.append(data)
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        for message in self.messages:
+            yield SimpleNamespace(
+                type=aiohttp.WSMsgType.TEXT, json=lambda m=message: json.loads(m)
+            )
+
+
+def _notification(finality_status, execution_status=None):
+    return json.dumps(
+        {
+            "jsonrpc": "2.0",
+            "method": "starknet_subscriptionTransactionStatus",
+            "params": {
+                "subscription_id": "1",
+                "result": {
+                    "transaction_hash": "0x1",
+                    "status": {
+                        "finality_status": finality_status,
+                        "execution_status": execution_status,
+                    },
+                },
+            },
+        }
+    )
+
+
+def test_subscription_waits_for_acceptance():
+    ws = FakeWebSocket(
+        [
+            json.dumps({"jsonrpc": "2.0", "id": 0, "result": "1"}),
+            _notification("RECEIVED"),
+            _notification("ACCEPTED_ON_L2", "SUCCEEDED"),
+        ]
+    )
+    session = SimpleNamespace(ws_connect=lambda url: ws)
+    asyncio.run(tx_waiter.subscribe_transaction("ws://node", 0x1, session=session))
+    assert ws.sent[0]["method"] == "starknet_subscribeTransactionStatus"
+    assert ws.sent[0]["params"] == {"transaction_hash": "0x1"}
+
+
+def test_subscription_reports_reverts():
+    ws = FakeWebSocket([_notification("ACCEPTED_ON_L2", "REVERTED")])
+    session = SimpleNamespace(ws_connect=lambda url: ws)
+    with pytest.raises(TransactionRevertedError):
+        asyncio.run(tx_waiter.subscribe_transaction("ws://node", 0x1, session=session))
+
+
+def test_falls_back_to_polling_without_subscriptions():
+    node = ScriptedNode([RECEIVED, ACCEPTED])
+    asyncio.run(
+        tx_waiter.wait_for_transaction(
+            node, 0x1, FAST, timeout=5, ws_url="ws://127.0.0.1:1"
+        )
+    )
+    assert node.checks == 2
+
+
+class StatusRpcHttpClient:
+    """
+    Answers batched ``starknet_getTransactionStatus`` requests: every transaction is accepted
+    on its third check; 0xbad reverts.
+    """
+
+    url = "http://node"
+    method_prefix = "starknet"
+
+    def __init__(self):
+        self.batch_sizes = []
+        self.checks = {}
+
+    def _status(self, tx_hash):
+        self.checks[tx_hash] = self.checks.get(tx_hash, 0) + 1
+        if self.checks[tx_hash] < 3:
+            return {"finality_status": "RECEIVED"}
+        return {
+            "finality_status": "ACCEPTED_ON_L2",
+            "execution_status": "REVERTED" if tx_hash == "0xbad" else "SUCCEEDED",
+            "failure_reason": "out of gas" if tx_hash == "0xbad" else None,
+        }
+
+    async def request(self, address, http_method, payload):
+        self.batch_sizes.append(len(payload))
+        return [
+            {
+                "jsonrpc": "2.0",
+                "id": request["id"],
+                "result": self._status(request["params"]["transaction_hash"]),
+            }
+            for request in payload
+        ]
+
+
+def test_tracker_checks_all_transactions_in_one_batch_per_round():
+    node = SimpleNamespace(_client=StatusRpcHttpClient())
+    tx_hashes = list(range(1, 201))
+    results = asyncio.run(tx_waiter.wait_for_transactions(node, tx_hashes, FAST))
+    assert results == [None] * 200
+    # Three rounds of 200 checks, in batches of at most 50.
+    assert node._client.batch_sizes == [50] * 12
+
+
+def test_tracker_reports_failures_per_transaction():
+    node = SimpleNamespace(_client=StatusRpcHttpClient())
+    results = asyncio.run(
+        tx_waiter.wait_for_transactions(
+            node, [0x1, 0xBAD, 0x2], FAST, return_exceptions=True
+        )
+    )
+    assert results[0] is None and results[2] is None
+    assert isinstance(results[1], TransactionRevertedError)
+    assert "out of gas" in str(results[1])
+
+
+def test_tracker_times_out_per_transaction():
+    node = ScriptedNode([RECEIVED])
+
+    async def run():
+        tracker = tx_waiter.TransactionTracker(node, FAST, max_checks=3, batch=False)
+        return await tracker.wait([0x1, 0x2], return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, TimeoutError) for result in results)
+    assert node.checks == 6
+
+
+def test_tracker_accepts_transactions_added_while_running():
+    node = ScriptedNode([RECEIVED, RECEIVED, ACCEPTED])
+
+    async def run():
+        tracker = tx_waiter.TransactionTracker(node, FAST, batch=False)
+        first = tracker.track(0x1)
+        await asyncio.sleep(0)
+        second = tracker.track("0x2")
+        assert tracker.track(0x2) is second
+        await asyncio.gather(first, second)
+        return tracker.rounds
+
+    assert asyncio.run(run()) <= 3
+
+
+def test_tracker_untracks_remaining_transactions_after_a_failure():
+    class FailFirstNode:
+        async def get_transaction_status(self, tx_hash):
+            return REVERTED if tx_hash == 0x1 else RECEIVED
+
+    async def run():
+        tracker = tx_waiter.TransactionTracker(FailFirstNode(), FAST, batch=False)
+        with pytest.raises(TransactionRevertedError):
+            await tracker.wait([0x1, 0x2])
+        await asyncio.sleep(0.02)
+        return tracker
+
+    tracker = asyncio.run(run())
+    assert tracker._pending == {}
+    assert tracker._loop_task.done()
@@ -0,0 +1,115 @@
+"""
+Cache of contract ABIs keyed by class hash.
+
+A class hash commits to the class contents, so an ABI cached for a class hash never goes stale and
+is valid on every network. Resolving the ABI of a contract then costs one ``get_class_hash_at``
+when its class was seen before, instead of downloading the whole class.
+"""
+
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+
+from starknet_py.net.client import Client
+from starknet_py.net.client_models import SierraContractClass
+
+# (abi, cairo_version)
+CachedAbi = tuple[list, int]
+
+
+class AbiCache:
+    """
+    In-memory LRU of ABIs by class hash, optionally backed by a directory with one JSON file per
+    class.
+    """
+
+    def __init__(self, max_entries: int = 256, path: str | Path | None = None):
+        """
+        :param max_entries: The number of ABIs kept in memory.
+        :param path: Directory to persist the ABIs in. In memory only if None.
+        """
+        self.max_entries = max_entries
+        self.path = None if path is None else Path(path)
+        self._entries: OrderedDict[int, CachedAbi] = OrderedDict()
+
+    def _file(self, class_hash: int) -> Path:
+        assert self.path is not None
+        return self.path / f"0x{class_hash:064x}.json"
+
+    def _remember(self, class_hash: int, entry: CachedAbi):
+        self._entries[class_hash] = entry
+        self._entries.move_to_end(class_hash)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, class_hash: int) -> CachedAbi | None:
+        """
+        Return the cached ABI and Cairo version of a class, or None.
+
+        :param class_hash: The class hash.
+        """
+        entry = self._entries.get(class_hash)
+        if entry is not None:
+            self._entries.move_to_end(class_hash)
+            return entry
+        if self.path is None:
+            return None
+        try:
+            with open(self._file(class_hash), "r") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        entry = (data["abi"], data["cairo_version"])
+        self._remember(class_hash, entry)
+        return entry
+
+    def put(self, class_hash: int, abi: list, cairo_version: int):
+        """
+        Cache the ABI and Cairo version of a class.
+
+        :param class_hash: The class hash.
+        :param abi: The ABI.
+        :param cairo_version: The Cairo version of the class.
+        """
+        self._remember(class_hash, (abi, cairo_version))
+        if self.path is None:
+            return
+        self.path.mkdir(parents=True, exist_ok=True)
+        file = self._file(class_hash)
+        tmp_file = file.with_suffix(".tmp")
+        with open(tmp_file, "w") as f:
+            json.dump({"abi": abi, "cairo_version": cairo_version}, f)
+        os.replace(tmp_file, file)
+
+    async def get_abi_at(self, client: Client, address: int | str) -> CachedAbi:
+        """
+        Return the ABI and Cairo version of the contract at ``address``. Proxies are not resolved.
+
+        :param client: The client to fetch the class with.
+        :param address: The contract address.
+        """
+        if isinstance(address, str):
+            address = int(address, 16)
+        class_hash = await client.get_class_hash_at(address)
+        entry = self.get(class_hash)
+        if entry is not None:
+            return entry
+        contract_class = await client.get_class_by_hash(class_hash)
+        if contract_class.abi is None:
+            raise ValueError(f"Class 0x{class_hash:064x} has no ABI.")
+        if isinstance(contract_class, SierraContractClass):
+            abi, cairo_version = json.loads(contract_class.abi), 1
+        else:
+            abi, cairo_version = contract_class.abi, 0
+        self.put(class_hash, abi, cairo_version)
+        return abi, cairo_version
+
+    def clear(self):
+        """
+        Drop the in-memory entries. Persisted ABIs are kept.
+        """
+        self._entries.clear()
+
+
+ABI_CACHE = AbiCache()
@@ -0,0 +1,124 @@
+"""
+Cached loading of Scarb build artifacts (``target/<profile>/*.contract_class.json`` etc.).
+
+Artifacts are often several MB. ``ArtifactCache`` keeps the values derived from them (ABI, class
+hashes, parsed JSON) keyed by path, but not their raw contents, and invalidates an entry when the
+file's modification time or size changes, so a rebuild is picked up without restarting. Only the
+most recently used artifacts are kept. The ABI is extracted without parsing the Sierra program
+when possible. ``orjson`` is used if installed.
+"""
+
+import json
+import os
+import re
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+
+try:
+    import orjson
+
+    def _loads(data: str) -> Any:
+        return orjson.loads(data)
+
+except ImportError:  # orjson is optional.
+
+    def _loads(data: str) -> Any:
+        return json.loads(data)
+
+
+T = TypeVar("T")
+
+_ABI_KEY_PATTERN = re.compile(r'"abi"\s*:\s*')
+DEFAULT_MAX_ARTIFACTS = 64
+
+
+def extract_abi(contract_class_json: str) -> list:
+    """
+    Return the ``abi`` of a Sierra contract class JSON.
+
+    Scarb writes the ABI after the Sierra program, so it is decoded on its own from its last key
+    occurrence; the whole document is parsed only if that fails.
+
+    :param contract_class_json: The contents of a ``*.contract_class.json`` file.
+    :return: The ABI.
+    """
+    matches = list(_ABI_KEY_PATTERN.finditer(contract_class_json))
+    if matches:
+        try:
+            abi, _ = json.JSONDecoder().raw_decode(
+                contract_class_json, matches[-1].end()
+            )
+            if isinstance(abi, list):
+                return abi
+        except json.JSONDecodeError:
+            pass
+    abi = _loads(contract_class_json)["abi"]
+    # Old artifacts store the ABI as a JSON string.
+    return _loads(abi) if isinstance(abi, str) else abi
+
+
+class ArtifactCache:
+    """
+    Per-process cache of values derived from artifacts, for the ``max_artifacts`` most recently
+    used artifacts.
+    """
+
+    def __init__(self, max_artifacts: int = DEFAULT_MAX_ARTIFACTS):
+        self.max_artifacts = max_artifacts
+        self._entries: OrderedDict[Path, tuple[tuple[int, int], dict[str, Any]]] = (
+            OrderedDict()
+        )
+
+    def _entry(self, path: str | Path) -> dict[str, Any]:
+        path = Path(path).resolve()
+        stat = os.stat(path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = self._entries.get(path)
+        if cached is None or cached[0] != version:
+            cached = (version, {})
+            self._entries[path] = cached
+        self._entries.move_to_end(path)
+        while len(self._entries) > self.max_artifacts:
+            self._entries.popitem(last=False)
+        return cached[1]
+
+    def derive(self, path: str | Path, name: str, compute: Callable[[str], T]) -> T:
+        """
+        Return ``compute(contents)`` for the artifact at ``path``, computed once per version of
+        the file.
+
+        :param path: The artifact path.
+        :param name: A name identifying ``compute``.
+        :param compute: Computes the value from the file contents.
+        :return: The value.
+        """
+        entry = self._entry(path)
+        if name not in entry:
+            entry[name] = compute(self.read_text(path))
+        return entry[name]
+
+    def read_text(self, path: str | Path) -> str:
+        """
+        Return the contents of the artifact at ``path``. The contents aren't cached.
+        """
+        return Path(path).read_text("utf-8")
+
+    def load_json(self, path: str | Path) -> Any:
+        """
+        Return the parsed artifact at ``path``. Don't mutate the result: it is shared.
+        """
+        return self.derive(path, "json", _loads)
+
+    def load_abi(self, path: str | Path) -> list:
+        """
+        Return the ABI of the contract class artifact at ``path``. Don't mutate the result: it is
+        shared.
+        """
+        return self.derive(path, "abi", extract_abi)
+
+    def clear(self):
+        self._entries.clear()
+
+
+ARTIFACT_CACHE = ArtifactCache()
@@ -0,0 +1,58 @@
+"""
+Cache of class hashes known to be declared on a node.
+
+Declarations are permanent, so entries never expire. Don't persist a cache for a devnet: a
+restarted devnet forgets its classes while keeping its URL.
+"""
+
+import json
+import os
+from pathlib import Path
+
+
+class DeclaredClassCache:
+    """
+    Keeps the declared class hashes per node URL, optionally in a JSON file at ``path``.
+    """
+
+    def __init__(self, path: str | Path | None = None):
+        self.path = None if path is None else Path(path)
+        self._declared: dict[str, set[int]] = {}
+        if self.path is not None and self.path.exists():
+            with open(self.path, "r") as f:
+                self._declared = {
+                    node_url: {int(class_hash, 16) for class_hash in class_hashes}
+                    for node_url, class_hashes in json.load(f).items()
+                }
+
+    def contains(self, node_url: str, class_hash: int) -> bool:
+        """
+        Return whether ``class_hash`` is known to be declared on the node at ``node_url``.
+        """
+        return class_hash in self._declared.get(node_url, set())
+
+    def add(self, node_url: str, class_hash: int):
+        """
+        Record that ``class_hash`` is declared on the node at ``node_url``.
+        """
+        class_hashes = self._declared.setdefault(node_url, set())
+        if class_hash in class_hashes:
+            return
+        class_hashes.add(class_hash)
+        if self.path is not None:
+            self._save()
+
+    def _save(self):
+        assert self.path is not None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(
+                {
+                    node_url: sorted(hex(class_hash) for class_hash in class_hashes)
+                    for node_url, class_hashes in self._declared.items()
+                },
+                f,
+                indent=2,
+            )
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,112 @@
+"""
+Dependency planning for multi-contract deployments.
+
+A deployment is a list of ``ContractSpec``. Constructor arguments may reference the address of
+another contract of the same deployment with ``ContractRef("<name>")``, anywhere inside lists and
+dicts. Since UDC addresses are known before deploying, referenced addresses can be computed up
+front; the deploys only need to execute in dependency order.
+"""
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ContractRef:
+    """
+    The address of the contract deployed as ``name``.
+    """
+
+    name: str
+
+
+@dataclass
+class ContractSpec:
+    """
+    :param name: Unique name of the deployment, used by ``ContractRef`` and in the manifest.
+    :param contract_name: Name of the contract class to deploy. Defaults to ``name``.
+    :param constructor_args: The constructor arguments, possibly containing ``ContractRef``.
+    :param salt: The UDC salt. Random if None.
+    """
+
+    name: str
+    contract_name: str | None = None
+    constructor_args: list | dict | None = None
+    salt: int | None = None
+
+    def __post_init__(self):
+        if self.contract_name is None:
+            self.contract_name = self.name
+
+
+def _refs(value) -> set[str]:
+    if isinstance(value, ContractRef):
+        return {value.name}
+    if isinstance(value, dict):
+        value = list(value.values())
+    if isinstance(value, (list, tuple)):
+        return set().union(*(_refs(item) for item in value))
+    return set()
+
+
+def dependencies(spec: ContractSpec) -> set[str]:
+    """
+    Return the names of the contracts referenced by the constructor arguments of ``spec``.
+    """
+    return _refs(spec.constructor_args)
+
+
+def deployment_order(specs: list[ContractSpec]) -> list[ContractSpec]:
+    """
+    Order the specs so that every contract comes after the contracts it references.
+    Independent contracts keep their relative order.
+
+    :param specs: The contracts to deploy.
+    :return: The specs in deployment order.
+    """
+    by_name = {}
+    for spec in specs:
+        if spec.name in by_name:
+            raise ValueError(f"Duplicate deployment name: {spec.name}.")
+        by_name[spec.name] = spec
+    remaining_deps = {}
+    for spec in specs:
+        deps = dependencies(spec)
+        unknown = deps - by_name.keys()
+        if unknown:
+            raise ValueError(
+                f"{spec.name} references unknown deployments: {', '.join(sorted(unknown))}."
+            )
+        remaining_deps[spec.name] = deps
+
+    ordered = []
+    while remaining_deps:
+        ready = [name for name, deps in remaining_deps.items() if not deps]
+        if not ready:
+            raise ValueError(
+                f"Cyclic references between: {', '.join(sorted(remaining_deps))}."
+            )
+        for name in ready:
+            del remaining_deps[name]
+            ordered.append(by_name[name])
+        for deps in remaining_deps.values():
+            deps.difference_update(ready)
+    return ordered
+
+
+def resolve_refs(value, addresses: dict[str, int]):
+    """
+    Replace every ``ContractRef`` in ``value`` with the address of the referenced contract.
+
+    :param value: Constructor arguments, possibly nested lists and dicts.
+    :param addresses: The addresses by deployment name.
+    :return: A copy of ``value`` without references.
+    """
+    if isinstance(value, ContractRef):
+        return addresses[value.name]
+    if isinstance(value, dict):
+        return {key: resolve_refs(item, addresses) for key, item in value.items()}
+    if isinstance(value, list):
+        return [resolve_refs(item, addresses) for item in value]
+    if isinstance(value, tuple):
+        return tuple(resolve_refs(item, addresses) for item in value)
+    return value
@@ -0,0 +1,419 @@
+"""
+Block-range scanning helpers for Starknet event fetching.
+
+The helpers here are agnostic of the RPC client: callers provide a ``fetch_chunk(start, end)``
+coroutine that returns the events emitted in the inclusive block range ``[start, end]``.
+This module has no package-relative imports so it can be used both from ``starknet_py_utils``
+and from the standalone ``role_discovery.py`` script.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, Callable
+
+from starknet_py.net.client_errors import ClientError
+
+logger = logging.getLogger(__name__)
+
+ChunkFetcher = Callable[[int, int], Awaitable[list]]
+
+# Fragments of the messages providers return when a getEvents block range is too large.
+WINDOW_ERROR_MESSAGES = (
+    "too many",
+    "range",
+    "limit exceeded",
+    "more than",
+    "timeout",
+    "timed out",
+)
+# HTTP statuses of a request that took too long.
+WINDOW_ERROR_STATUSES = {"408", "504"}
+
+
+@dataclass
+class AdaptiveChunkPolicy:
+    """
+    Controls how ``scan_adaptive`` resizes its block window.
+
+    After every chunk the window is rescaled so that the next chunk is expected to return about
+    ``target_events`` events within ``target_latency`` seconds. A chunk that fails because the
+    window was too large (see ``is_window_error``) is retried with half the window.
+    """
+
+    initial_chunk_size: int = 100_000
+    min_chunk_size: int = 100
+    max_chunk_size: int = 5_000_000
+    target_events: int = 1_000
+    target_latency: float = 5.0
+    max_growth_factor: float = 4.0
+    request_timeout: float | None = 60.0
+
+
+def is_window_error(error: BaseException) -> bool:
+    """
+    Whether a chunk failing with ``error`` may succeed with a smaller block window: a timeout, or
+    a provider error about the block range or the number of results.
+    """
+    if isinstance(error, (TimeoutError, asyncio.TimeoutError)):
+        return True
+    if not isinstance(error, ClientError):
+        return False
+    message = str(error.message).lower()
+    return str(error.code) in WINDOW_ERROR_STATUSES or any(
+        fragment in message for fragment in WINDOW_ERROR_MESSAGES
+    )
+
+
+def event_selector(event) -> int:
+    """
+    Return the first key of an event, which is the event selector for events filtered by it.
+
+    :param event: An event object (e.g. ``EmittedEvent``) or a raw getEvents dictionary.
+    :return: The selector.
+    """
+    keys = event["keys"] if isinstance(event, dict) else event.keys
+    return int(str(keys[0]), 0)
+
+
+def group_events_by_selector(events: list, selectors: list[int]) -> dict[int, list]:
+    """
+    Split the events of a multi-selector scan by their selector, keeping their order.
+
+    :param events: The events, each with one of ``selectors`` as its first key.
+    :param selectors: The selectors that were requested.
+    :return: A dictionary from every requested selector to its events.
+    """
+    events_by_selector = {selector: [] for selector in selectors}
+    for event in events:
+        selector = event_selector(event)
+        if selector in events_by_selector:
+            events_by_selector[selector].append(event)
+    return events_by_selector
+
+
+def split_block_range(
+    from_block: int, to_block: int, chunk_size: int
+) -> list[tuple[int, int]]:
+    """
+    Split the inclusive block range ``[from_block, to_block]`` into consecutive chunks.
+
+    :param from_block: First block of the range.
+    :param to_block: Last block of the range (inclusive).
+    :param chunk_size: Maximum number of blocks in one chunk.
+    :return: A list of inclusive ``(chunk_start, chunk_end)`` tuples in ascending order.
+    """
+    if chunk_size <= 0:
+        raise ValueError("Argument chunk_size has to be greater than 0.")
+    return [
+        (chunk_start, min(chunk_start + chunk_size - 1, to_block))
+        for chunk_start in range(from_block, to_block + 1, chunk_size)
+    ]
+
+
+def split_block_range_backwards(
+    from_block: int, to_block: int, chunk_size: int
+) -> list[tuple[int, int]]:
+    """
+    Split the inclusive block range ``[from_block, to_block]`` into consecutive chunks, starting
+    from ``to_block``.
+
+    :param from_block: First block of the range.
+    :param to_block: Last block of the range (inclusive).
+    :param chunk_size: Maximum number of blocks in one chunk.
+    :return: A list of inclusive ``(chunk_start, chunk_end)`` tuples in descending order.
+    """
+    if chunk_size <= 0:
+        raise ValueError("Argument chunk_size has to be greater than 0.")
+    block_ranges = []
+    chunk_end = to_block
+    while chunk_end >= from_block:
+        chunk_start = max(chunk_end - chunk_size + 1, from_block)
+        block_ranges.append((chunk_start, chunk_end))
+        chunk_end = chunk_start - 1
+    return block_ranges
+
+
+async def scan_block_ranges(
+    fetch_chunk: ChunkFetcher,
+    block_ranges: list[tuple[int, int]],
+    max_concurrency: int = 1,
+) -> list:
+    """
+    Fetch the events of all block ranges with at most ``max_concurrency`` requests in flight.
+
+    :param fetch_chunk: Coroutine returning the events of an inclusive block range.
+    :param block_ranges: The block ranges to fetch.
+    :param max_concurrency: Maximum number of chunks fetched concurrently.
+    :return: The events of all ranges, in the order of ``block_ranges``.
+    """
+    if max_concurrency <= 0:
+        raise ValueError("Argument max_concurrency has to be greater than 0.")
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _fetch(chunk_start: int, chunk_end: int) -> list:
+        async with semaphore:
+            return await fetch_chunk(chunk_start, chunk_end)
+
+    tasks = [
+        asyncio.ensure_future(_fetch(chunk_start, chunk_end))
+        for chunk_start, chunk_end in block_ranges
+    ]
+    try:
+        chunks = await asyncio.gather(*tasks)
+    finally:
+        # If one chunk failed, don't leave the remaining requests running in the background.
+        for task in tasks:
+            task.cancel()
+
+    events = []
+    for chunk in chunks:
+        events.extend(chunk)
+    return events
+
+
+async def stream_block_ranges(
+    fetch_chunk: ChunkFetcher,
+    block_ranges: list[tuple[int, int]],
+    max_concurrency: int = 1,
+) -> AsyncIterator[list]:
+    """
+    Yield the events of each block range, in order, as soon as they are available.
+
+    At most ``max_concurrency`` chunks are fetched or waiting to be consumed at any time, so
+    fetching overlaps with the consumer's processing while memory stays bounded.
+
+    :param fetch_chunk: Coroutine returning the events of an inclusive block range.
+    :param block_ranges: The block ranges to fetch.
+    :param max_concurrency: Maximum number of chunks fetched ahead of the consumer.
+    :return: An async iterator over the events of each range.
+    """
+    if max_concurrency <= 0:
+        raise ValueError("Argument max_concurrency has to be greater than 0.")
+
+    remaining = iter(block_ranges)
+    pending = deque()
+
+    def _schedule_next():
+        block_range = next(remaining, None)
+        if block_range is not None:
+            pending.append(asyncio.ensure_future(fetch_chunk(*block_range)))
+
+    try:
+        for _ in range(max_concurrency):
+            _schedule_next()
+        while pending:
+            chunk = await pending.popleft()
+            _schedule_next()
+            yield chunk
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def prefetch(iterator: AsyncIterator, max_buffered: int = 1) -> AsyncIterator:
+    """
+    Consume ``iterator`` in a background task, at most ``max_buffered`` items ahead.
+
+    :param iterator: The async iterator to consume.
+    :param max_buffered: Maximum number of items produced but not yet consumed.
+    :return: An async iterator over the same items.
+    """
+    if max_buffered <= 0:
+        raise ValueError("Argument max_buffered has to be greater than 0.")
+
+    queue = asyncio.Queue(maxsize=max_buffered)
+    done = object()
+
+    async def _produce():
+        try:
+            async for item in iterator:
+                await queue.put((item, None))
+        except Exception as e:
+            await queue.put((done, e))
+        else:
+            await queue.put((done, None))
+
+    producer = asyncio.ensure_future(_produce())
+    try:
+        while True:
+            item, error = await queue.get()
+            if error is not None:
+                raise error
+            if item is done:
+                return
+            yield item
+    finally:
+        producer.cancel()
+
+
+def _next_chunk_size(
+    policy: AdaptiveChunkPolicy, span: int, n_events: int, latency: float
+) -> int:
+    """
+    Scale the last window by how far it was from the event and latency targets.
+    """
+    ratio = min(
+        policy.target_events / max(n_events, 1),
+        policy.target_latency / max(latency, 1e-3),
+    )
+    ratio = min(max(ratio, 1 / policy.max_growth_factor), policy.max_growth_factor)
+    return min(max(int(span * ratio), policy.min_chunk_size), policy.max_chunk_size)
+
+
+async def stream_adaptive(
+    fetch_chunk: ChunkFetcher,
+    from_block: int,
+    to_block: int,
+    policy: AdaptiveChunkPolicy | None = None,
+) -> AsyncIterator[list]:
+    """
+    Yield the events of ``[from_block, to_block]`` chunk by chunk, with a window that adapts to
+    the event density and response latency observed so far.
+
+    :param fetch_chunk: Coroutine returning the events of an inclusive block range.
+    :param from_block: First block of the range.
+    :param to_block: Last block of the range (inclusive).
+    :param policy: The window sizing policy. Defaults to ``AdaptiveChunkPolicy()``.
+    :return: An async iterator over the events of each chunk, in block order.
+    """
+    if policy is None:
+        policy = AdaptiveChunkPolicy()
+    if not 0 < policy.min_chunk_size <= policy.max_chunk_size:
+        raise ValueError(
+            "Invalid policy: 0 < min_chunk_size <= max_chunk_size must hold."
+        )
+
+    chunk_size = min(
+        max(policy.initial_chunk_size, policy.min_chunk_size), policy.max_chunk_size
+    )
+    chunk_start = from_block
+    while chunk_start <= to_block:
+        chunk_end = min(chunk_start + chunk_size - 1, to_block)
+        started_at = time.monotonic()
+        try:
+            chunk = await asyncio.wait_for(
+                fetch_chunk(chunk_start, chunk_end), timeout=policy.request_timeout
+            )
+        except Exception as e:
+            if not is_window_error(e) or chunk_size <= policy.min_chunk_size:
+                raise
+            chunk_size = max(chunk_size // 2, policy.min_chunk_size)
+            logger.debug(
+                "Fetching blocks %s-%s failed (%r); retrying with a %s block window.",
+                chunk_start,
+                chunk_end,
+                e,
+                chunk_size,
+            )
+            continue
+        latency = time.monotonic() - started_at
+        chunk_size = _next_chunk_size(
+            policy, chunk_end - chunk_start + 1, len(chunk), latency
+        )
+        logger.debug(
+            "Fetched %d events from blocks %s-%s in %.2fs; next window is %s blocks.",
+            len(chunk),
+            chunk_start,
+            chunk_end,
+            latency,
+            chunk_size,
+        )
+        chunk_start = chunk_end + 1
+        yield chunk
+
+
+async def scan_adaptive(
+    fetch_chunk: ChunkFetcher,
+    from_block: int,
+    to_block: int,
+    policy: AdaptiveChunkPolicy | None = None,
+) -> list:
+    """
+    Fetch the events of ``[from_block, to_block]`` with a window that adapts to the event density
+    and response latency observed so far.
+
+    :param fetch_chunk: Coroutine returning the events of an inclusive block range.
+    :param from_block: First block of the range.
+    :param to_block: Last block of the range (inclusive).
+    :param policy: The window sizing policy. Defaults to ``AdaptiveChunkPolicy()``.
+    :return: The events, in block order.
+    """
+    events = []
+    async for chunk in stream_adaptive(fetch_chunk, from_block, to_block, policy):
+        events.extend(chunk)
+    return events
+
+
+async def find_last_event(
+    fetch_chunk: ChunkFetcher, from_block: int, to_block: int, chunk_size: int
+):
+    """
+    Find the last event in ``[from_block, to_block]`` by scanning chunks backwards.
+
+    :param fetch_chunk: Coroutine returning the events of an inclusive block range.
+    :param from_block: First block of the range.
+    :param to_block: Last block of the range (inclusive).
+    :param chunk_size: Maximum number of blocks in one chunk.
+    :return: The last event, or None if there is no event in the range.
+    """
+    for chunk_start, chunk_end in split_block_range_backwards(
+        from_block, to_block, chunk_size
+    ):
+        events = await fetch_chunk(chunk_start, chunk_end)
+        if len(events) > 0:
+            return events[-1]
+    return None
+
+
+async def bisect_last_event(
+    fetch_chunk: ChunkFetcher,
+    has_events: Callable[[int, int], Awaitable[bool]],
+    from_block: int,
+    to_block: int,
+    chunk_size: int,
+):
+    """
+    Find the last event in ``[from_block, to_block]`` with a logarithmic number of requests.
+
+    Windows of exponentially growing size are probed backwards from ``to_block`` until one
+    contains an event. That window is then bisected down to ``chunk_size`` blocks, which are
+    fetched in full.
+
+    :param fetch_chunk: Coroutine returning the events of an inclusive block range.
+    :param has_events: Coroutine returning whether an inclusive block range has any event.
+        It should be cheaper than ``fetch_chunk``, e.g. request a single event.
+    :param from_block: First block of the range.
+    :param to_block: Last block of the range (inclusive).
+    :param chunk_size: Size of the first probed window and of the final fetched window.
+    :return: The last event, or None if there is no event in the range.
+    """
+    if chunk_size <= 0:
+        raise ValueError("Argument chunk_size has to be greater than 0.")
+
+    # Invariant: there are no events in (window_end, to_block].
+    window_end = to_block
+    window_size = chunk_size
+    while True:
+        if window_end < from_block:
+            return None
+        window_start = max(window_end - window_size + 1, from_block)
+        if await has_events(window_start, window_end):
+            break
+        window_end = window_start - 1
+        window_size *= 2
+
+    # Invariant: [window_start, window_end] contains the last event.
+    while window_end - window_start + 1 > chunk_size:
+        mid = (window_start + window_end) // 2
+        if await has_events(mid + 1, window_end):
+            window_start = mid + 1
+        else:
+            window_end = mid
+    logger.debug("Last event is in blocks %s-%s.", window_start, window_end)
+
+    events = await fetch_chunk(window_start, window_end)
+    return events[-1] if len(events) > 0 else None
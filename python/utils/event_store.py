@@ -0,0 +1,77 @@
+"""
+On-disk store for fetched Starknet events.
+
+Events are kept per ``(chain, contract, selector)`` together with the block range that was fully
+scanned, so a later scan only needs to fetch the blocks after ``scanned_to_block``. Only
+finalized blocks should be recorded; callers refetch the unfinalized tail on every run.
+"""
+
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+
+
+@dataclass
+class EventStoreRecord:
+    from_block: int
+    scanned_to_block: int
+    events: list[dict] = field(default_factory=list)
+
+
+class EventStore:
+    """
+    Stores one JSON file per ``(chain, contract, selector)`` under ``root``.
+    """
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+
+    def _path(self, chain: str, contract_address: int, selector: int) -> Path:
+        return self.root / chain / hex(contract_address) / f"{hex(selector)}.json"
+
+    def load(
+        self, chain: str, contract_address: int, selector: int
+    ) -> EventStoreRecord | None:
+        """
+        Load the stored events of a contract and event selector.
+
+        :param chain: The chain identifier (e.g. the hex chain id).
+        :param contract_address: The address of the contract that emitted the events.
+        :param selector: The selector of the event.
+        :return: The stored record, or None if nothing was stored yet.
+        """
+        path = self._path(chain, contract_address, selector)
+        if not path.exists():
+            return None
+        with open(path, "r") as f:
+            return EventStoreRecord(**json.load(f))
+
+    def save(
+        self,
+        chain: str,
+        contract_address: int,
+        selector: int,
+        record: EventStoreRecord,
+    ):
+        """
+        Atomically replace the stored events of a contract and event selector.
+
+        :param chain: The chain identifier (e.g. the hex chain id).
+        :param contract_address: The address of the contract that emitted the events.
+        :param selector: The selector of the event.
+        :param record: The record to store.
+        """
+        path = self._path(chain, contract_address, selector)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(
+                {
+                    "from_block": record.from_block,
+                    "scanned_to_block": record.scanned_to_block,
+                    "events": record.events,
+                },
+                f,
+            )
+        os.replace(tmp_path, path)
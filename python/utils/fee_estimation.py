@@ -0,0 +1,152 @@
+"""
+Resource bounds for invoke transactions from batched fee estimates.
+
+``estimate_resource_bounds`` estimates a list of transactions in a single ``starknet_estimateFee``
+request. Transactions of the same sender are simulated in order, so consecutive nonces estimate
+correctly. The bounds are the estimates scaled by a per-resource ``FeeMarginPolicy``, by default
+``DEFAULT_FEE_MARGINS``. A ``FeeEstimateCache`` skips the request when every transaction was
+estimated within its TTL.
+"""
+
+import time
+from dataclasses import dataclass, field
+
+from starknet_py.net.client_models import (
+    EstimatedFee,
+    ResourceBounds,
+    ResourceBoundsMapping,
+)
+from starknet_py.net.full_node_client import FullNodeClient
+from starknet_py.net.models.transaction import AccountTransaction
+
+RESOURCES = ("l1_gas", "l1_data_gas", "l2_gas")
+
+
+@dataclass(frozen=True)
+class ResourceMargin:
+    """
+    :param amount: Multiplier applied to the estimated amount.
+    :param price: Multiplier applied to the price per unit.
+    """
+
+    amount: float = 1.5
+    price: float = 1.5
+
+
+@dataclass(frozen=True)
+class FeeMarginPolicy:
+    """
+    The margins applied to each resource. A resource not given gets ``ResourceMargin()``.
+    """
+
+    l1_gas: ResourceMargin = field(default_factory=ResourceMargin)
+    l1_data_gas: ResourceMargin = field(default_factory=ResourceMargin)
+    l2_gas: ResourceMargin = field(default_factory=ResourceMargin)
+
+    @classmethod
+    def uniform(cls, multiplier: float) -> "FeeMarginPolicy":
+        """
+        A policy multiplying every amount and price by ``multiplier``.
+        """
+        margin = ResourceMargin(amount=multiplier, price=multiplier)
+        return cls(l1_gas=margin, l1_data_gas=margin, l2_gas=margin)
+
+    def resource_bounds(self, fee: EstimatedFee) -> ResourceBoundsMapping:
+        """
+        Return the resource bounds for a fee estimate.
+
+        :param fee: The fee estimate.
+        :return: The resource bounds.
+        """
+        bounds = {}
+        for resource in RESOURCES:
+            margin: ResourceMargin = getattr(self, resource)
+            amount = getattr(fee, f"{resource}_consumed")
+            price = getattr(fee, f"{resource}_price")
+            bounds[resource] = ResourceBounds(
+                max_amount=int(amount * margin.amount),
+                max_price_per_unit=int(price * margin.price),
+            )
+        return ResourceBoundsMapping(**bounds)
+
+
+# Multiplier of every estimated amount and price when no margins are given.
+DEFAULT_MARGIN_MULTIPLIER = 10
+DEFAULT_FEE_MARGINS = FeeMarginPolicy.uniform(DEFAULT_MARGIN_MULTIPLIER)
+
+
+def _tx_key(tx: AccountTransaction) -> tuple:
+    return (
+        type(tx).__name__,
+        tx.sender_address,
+        tuple(tx.calldata),
+        tuple(tx.account_deployment_data),
+    )
+
+
+class FeeEstimateCache:
+    """
+    The fee estimates of invoke transactions, by sender and calldata, kept for ``ttl`` seconds.
+
+    A transaction estimated again within the TTL reuses the earlier amounts and prices, whatever
+    its nonce. Only use it for transactions whose cost doesn't depend on state changed meanwhile,
+    e.g. the same call repeated by a keeper.
+    """
+
+    def __init__(self, ttl: float = 10.0):
+        """
+        :param ttl: How long, in seconds, an estimate is reused.
+        """
+        self.ttl = ttl
+        self._fees: dict[tuple, tuple[float, EstimatedFee]] = {}
+
+    def get(self, tx: AccountTransaction) -> EstimatedFee | None:
+        """
+        Return the estimate of a transaction, or None if it's missing or expired.
+        """
+        entry = self._fees.get(_tx_key(tx))
+        if entry is None or time.monotonic() - entry[0] > self.ttl:
+            return None
+        return entry[1]
+
+    def add(self, tx: AccountTransaction, fee: EstimatedFee):
+        self._fees[_tx_key(tx)] = (time.monotonic(), fee)
+
+    def invalidate(self):
+        """
+        Drop all estimates.
+        """
+        self._fees.clear()
+
+
+async def estimate_resource_bounds(
+    node: FullNodeClient,
+    txs: list[AccountTransaction],
+    margins: FeeMarginPolicy | None = None,
+    fee_cache: FeeEstimateCache | None = None,
+) -> list[ResourceBoundsMapping]:
+    """
+    Estimate the resource bounds of transactions with a single request.
+
+    :param node: The node to estimate with.
+    :param txs: The transactions, in submission order.
+    :param margins: The margins applied to the estimates. Defaults to DEFAULT_FEE_MARGINS.
+    :param fee_cache: Earlier estimates. No request is sent if it holds all the transactions.
+        Otherwise, all of them are estimated, as they are simulated in order, and cached.
+    :return: The resource bounds of each transaction.
+    """
+    if not txs:
+        return []
+    if margins is None:
+        margins = DEFAULT_FEE_MARGINS
+    fees = None
+    if fee_cache is not None:
+        fees = [fee_cache.get(tx) for tx in txs]
+        if None in fees:
+            fees = None
+    if fees is None:
+        fees = await node.estimate_fee(list(txs), skip_validate=True)
+        if fee_cache is not None:
+            for tx, fee in zip(txs, fees):
+                fee_cache.add(tx, fee)
+    return [margins.resource_bounds(fee) for fee in fees]
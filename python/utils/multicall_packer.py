@@ -0,0 +1,111 @@
+"""
+Packing of many calls into as few multicall transactions as fit the network limits.
+
+Calls are grouped greedily in order, so the transactions execute them in the original order. A
+transaction is closed when adding the next call would exceed the calldata length, the number of
+calls, or the L2 gas limit. Cairo steps are paid in L2 gas, so the gas limit also bounds the steps.
+The gas of a transaction is estimated as its overhead (validation, fee transfer, an empty
+``__execute__``) plus the gas of each of its calls. When only the gas of whole multicalls is known,
+``split_groups`` halves the ones over the limit so they can be estimated again.
+"""
+
+from dataclasses import dataclass
+from typing import Protocol, Sequence, TypeVar
+
+# Maximum calldata length of a transaction on Starknet.
+MAX_CALLDATA_LENGTH = 4000
+
+
+class CallLike(Protocol):
+    calldata: list[int]
+
+
+C = TypeVar("C", bound=CallLike)
+
+
+@dataclass(frozen=True)
+class MulticallLimits:
+    """
+    :param max_calldata_length: Maximum length of the ``__execute__`` calldata.
+    :param max_calls: Maximum number of calls per transaction. Unlimited if None.
+    :param max_l2_gas: Maximum estimated L2 gas per transaction. Unlimited if None.
+    """
+
+    max_calldata_length: int = MAX_CALLDATA_LENGTH
+    max_calls: int | None = None
+    max_l2_gas: int | None = None
+
+
+def call_calldata_length(call: CallLike) -> int:
+    """
+    Return the length a call adds to the ``__execute__`` calldata: address, selector, calldata
+    length and calldata.
+    """
+    return 3 + len(call.calldata)
+
+
+def pack_calls(
+    calls: Sequence[C],
+    limits: MulticallLimits = MulticallLimits(),
+    l2_gas: Sequence[int] | None = None,
+    l2_gas_overhead: int = 0,
+) -> list[list[C]]:
+    """
+    Group calls into multicalls within ``limits``, keeping their order.
+
+    :param calls: The calls.
+    :param limits: The limits of a multicall.
+    :param l2_gas: The estimated L2 gas of each call. Required if ``limits.max_l2_gas`` is set.
+    :param l2_gas_overhead: The estimated L2 gas of a transaction without calls.
+    :return: The calls of each multicall.
+    """
+    if limits.max_l2_gas is not None and l2_gas is None:
+        raise ValueError("max_l2_gas requires the L2 gas of each call.")
+    if l2_gas is not None and len(l2_gas) != len(calls):
+        raise ValueError("Expected one L2 gas value per call.")
+
+    groups: list[list[C]] = []
+    group: list[C] = []
+    # The calldata starts with the number of calls.
+    calldata_length = 1
+    gas = l2_gas_overhead
+    for i, call in enumerate(calls):
+        call_length = call_calldata_length(call)
+        call_gas = 0 if l2_gas is None else l2_gas[i]
+        if 1 + call_length > limits.max_calldata_length:
+            raise ValueError(
+                f"Call {i} has {call_length} calldata felts, over the limit of "
+                f"{limits.max_calldata_length}."
+            )
+        if group and (
+            calldata_length + call_length > limits.max_calldata_length
+            or (limits.max_calls is not None and len(group) >= limits.max_calls)
+            or (limits.max_l2_gas is not None and gas + call_gas > limits.max_l2_gas)
+        ):
+            groups.append(group)
+            group, calldata_length, gas = [], 1, l2_gas_overhead
+        # A call over the gas limit on its own still gets a transaction of its own.
+        group.append(call)
+        calldata_length += call_length
+        gas += call_gas
+    if group:
+        groups.append(group)
+    return groups
+
+
+def split_groups(groups: Sequence[list[C]], indexes: set[int]) -> list[list[C]]:
+    """
+    Split the groups at ``indexes`` in half, keeping the order of the calls.
+
+    :param groups: The calls of each multicall.
+    :param indexes: The indexes of the groups to split. Groups of one call are kept.
+    :return: The calls of each multicall.
+    """
+    split: list[list[C]] = []
+    for i, group in enumerate(groups):
+        if i in indexes and len(group) > 1:
+            middle = len(group) // 2
+            split.extend([group[:middle], group[middle:]])
+        else:
+            split.append(group)
+    return split
@@ -0,0 +1,206 @@
+"""
+Local nonce management for pipelined transaction submission.
+
+``NonceManager`` fetches the nonce of each sender once and then hands out sequential nonces
+locally, so many transactions can be submitted back-to-back without waiting for each one to be
+accepted. When a submission fails, the sender is resynced with the node's nonce once none of its
+other reservations is in flight, so nonces handed out meanwhile are never handed out again. The
+same goes for a submitted transaction that the node rejects later. A batch whose later
+transactions weren't submitted hands their nonces back directly when nothing else was reserved
+since, as the node doesn't count the batch's pending transactions yet.
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator
+
+from starknet_py.net.full_node_client import FullNodeClient
+
+logger = logging.getLogger(__name__)
+
+
+def _to_int(address: int | str) -> int:
+    return address if isinstance(address, int) else int(address, 16)
+
+
+@dataclass
+class NonceBatch:
+    """
+    Consecutive nonces reserved by ``NonceManager.reserve_batch``.
+
+    :param nonces: The nonces, in submission order.
+    :param submitted: How many of them were submitted. Count each submission as it succeeds.
+    """
+
+    nonces: list[int]
+    submitted: int = 0
+
+
+class NonceManager:
+    """
+    Hands out sequential nonces per sender address.
+    """
+
+    def __init__(self, node: FullNodeClient):
+        self.node = node
+        self._next_nonce: dict[int, int] = {}
+        self._locks: dict[int, asyncio.Lock] = {}
+        # Reservations in flight per sender, and the senders to resync when they complete.
+        self._outstanding: dict[int, int] = {}
+        self._needs_resync: set[int] = set()
+
+    def _lock(self, address: int) -> asyncio.Lock:
+        return self._locks.setdefault(address, asyncio.Lock())
+
+    async def _fetch(self, address: int) -> int:
+        # The default block identifier includes pending transactions.
+        return await self.node.get_contract_nonce(address)
+
+    async def next_nonce(self, address: int | str) -> int:
+        """
+        Reserve the next nonce of a sender.
+
+        :param address: The address of the sender.
+        :return: The nonce.
+        """
+        (nonce,) = await self._take(_to_int(address), 1)
+        return nonce
+
+    async def _take(self, address: int, count: int) -> list[int]:
+        async with self._lock(address):
+            if address not in self._next_nonce:
+                self._next_nonce[address] = await self._fetch(address)
+            first = self._next_nonce[address]
+            self._next_nonce[address] = first + count
+            return list(range(first, first + count))
+
+    async def peek(self, address: int | str) -> int:
+        """
+        Return the next nonce of a sender without reserving it, e.g. to estimate transactions
+        that follow the ones in flight.
+
+        :param address: The address of the sender.
+        :return: The nonce.
+        """
+        address = _to_int(address)
+        async with self._lock(address):
+            if address not in self._next_nonce:
+                self._next_nonce[address] = await self._fetch(address)
+            return self._next_nonce[address]
+
+    async def resync(self, address: int | str) -> int:
+        """
+        Reset the next nonce of a sender to the node's nonce.
+
+        Call this after a submission failed, when no other nonce of the sender is in flight: the
+        nonces handed out after the failed one leave a gap and their transactions have to be
+        resubmitted. ``reserve`` does this automatically.
+
+        :param address: The address of the sender.
+        :return: The next nonce.
+        """
+        address = _to_int(address)
+        async with self._lock(address):
+            nonce = await self._fetch(address)
+            if self._next_nonce.get(address) != nonce:
+                logger.debug(
+                    "Resynced nonce of %s: %s -> %s.",
+                    hex(address),
+                    self._next_nonce.get(address),
+                    nonce,
+                )
+            self._next_nonce[address] = nonce
+            return nonce
+
+    def forget(self, address: int | str):
+        """
+        Drop the local nonce of a sender, so the next one is fetched from the node.
+
+        :param address: The address of the sender.
+        """
+        self._next_nonce.pop(_to_int(address), None)
+
+    async def request_resync(self, address: int | str):
+        """
+        Resync a sender once none of its reservations is in flight, e.g. after one of its
+        submitted transactions was rejected: the node didn't use its nonce.
+
+        :param address: The address of the sender.
+        """
+        address = _to_int(address)
+        if address in self._outstanding:
+            self._needs_resync.add(address)
+        else:
+            await self.resync(address)
+
+    @asynccontextmanager
+    async def reserve(self, address: int | str) -> AsyncIterator[int]:
+        """
+        Reserve the next nonce of a sender for one submission. If the block raises, the sender is
+        resynced once its last reservation in flight completes.
+
+        :param address: The address of the sender.
+        :return: The nonce.
+        """
+        address = _to_int(address)
+        self._outstanding[address] = self._outstanding.get(address, 0) + 1
+        try:
+            nonce = await self.next_nonce(address)
+            yield nonce
+        except Exception:
+            self._needs_resync.add(address)
+            raise
+        finally:
+            self._outstanding[address] -= 1
+            if self._outstanding[address] == 0:
+                del self._outstanding[address]
+                if address in self._needs_resync:
+                    self._needs_resync.discard(address)
+                    await self.resync(address)
+
+    @asynccontextmanager
+    async def reserve_batch(
+        self, address: int | str, count: int
+    ) -> AsyncIterator[NonceBatch]:
+        """
+        Reserve ``count`` consecutive nonces of a sender for submissions made in order. If the
+        block raises, the nonces that weren't submitted are handed back when no other nonce of
+        the sender was reserved since. Otherwise, the sender is resynced once its last
+        reservation in flight completes.
+
+        :param address: The address of the sender.
+        :param count: The number of nonces.
+        :return: The batch. Increment its ``submitted`` after each submission.
+        """
+        if count <= 0:
+            raise ValueError("Argument count has to be greater than 0.")
+        address = _to_int(address)
+        self._outstanding[address] = self._outstanding.get(address, 0) + 1
+        try:
+            batch = NonceBatch(await self._take(address, count))
+            try:
+                yield batch
+            except Exception:
+                self._release(address, batch)
+                raise
+        finally:
+            self._outstanding[address] -= 1
+            if self._outstanding[address] == 0:
+                del self._outstanding[address]
+                if address in self._needs_resync:
+                    self._needs_resync.discard(address)
+                    await self.resync(address)
+
+    def _release(self, address: int, batch: NonceBatch):
+        unsubmitted = batch.nonces[batch.submitted :]
+        if not unsubmitted:
+            return
+        if (
+            self._outstanding[address] == 1
+            and self._next_nonce.get(address) == batch.nonces[-1] + 1
+        ):
+            self._next_nonce[address] = unsubmitted[0]
+        else:
+            self._needs_resync.add(address)
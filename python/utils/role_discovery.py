@@ -20,6 +20,8 @@ Repo-wide setup (existing project workflow):
 Usage (standalone):
     python role_discovery.py 0x<contract_address> [--chain mainnet|sepolia] [--include-past]
     python role_discovery.py 0x<contract_address> --rpc <RPC_URL> --include-unknown
+    python role_discovery.py 0x<contract_address> --rpc <RPC_URL> --rpc <RPC_URL>  # failover pool
+    python role_discovery.py --batch addresses.txt   # or --batch - to read stdin; JSON lines out
 
 Usage (importable):
     from role_discovery import extract_common_roles
@@ -34,14 +36,36 @@ import sys
 import warnings
 from collections import defaultdict
 from enum import Enum
-from typing import Dict, List
+from typing import AsyncIterator, Dict, List
 
+import aiohttp
 from marshmallow.exceptions import ValidationError
 from starknet_py.hash.selector import get_selector_from_name
 from starknet_py.net.client_models import Call
 from starknet_py.net.full_node_client import FullNodeClient
 from starknet_py.net.http_client import IncompatibleRPCVersionWarning
 
+try:
+    from .event_scanner import (
+        AdaptiveChunkPolicy,
+        split_block_range,
+        stream_adaptive,
+        stream_block_ranges,
+    )
+    from .rpc_batch import BatchingClient
+    from .rpc_limits import RateLimiter, RetryPolicy, limit_client
+    from .rpc_pool import create_pooled_client
+except ImportError:  # Running as a standalone script.
+    from event_scanner import (
+        AdaptiveChunkPolicy,
+        split_block_range,
+        stream_adaptive,
+        stream_block_ranges,
+    )
+    from rpc_batch import BatchingClient
+    from rpc_limits import RateLimiter, RetryPolicy, limit_client
+    from rpc_pool import create_pooled_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -77,6 +101,14 @@ ROLE_IDS: Dict[RoleName, int] = {
 ROLE_ID_TO_NAME: Dict[int, RoleName] = {v: k for k, v in ROLE_IDS.items()}
 
 ROLE_GRANTED_SELECTOR = get_selector_from_name("RoleGranted")
+ROLE_REVOKED_SELECTOR = get_selector_from_name("RoleRevoked")
+# Named RolesComponent events (packages/utils/src/components/roles/interface.cairo):
+#   keys = [sn_keccak("<Role>Added" | "<Role>Removed")]
+#   data = [account, sender]
+NAMED_ROLE_EVENTS: Dict[int, tuple[RoleName, bool]] = {
+    **{get_selector_from_name(f"{r.value}Added"): (r, True) for r in RoleName},
+    **{get_selector_from_name(f"{r.value}Removed"): (r, False) for r in RoleName},
+}
 HAS_ROLE_SELECTOR = get_selector_from_name("has_role")
 ROLE_CHECK_ENTRYPOINTS: Dict[RoleName, str] = {
     RoleName.AppGovernor: "is_app_governor",
@@ -97,18 +129,25 @@ RPCS = {
 }
 
 EVENT_CHUNK_SIZE = 100_000
+EVENT_PAGE_SIZE = 1000
+ROLE_CHECK_CONCURRENCY = 10
+BATCH_CONTRACT_CONCURRENCY = 8
+# Upper bound on open HTTP connections (and so on in-flight RPC requests) per process.
+MAX_CONNECTIONS = 32
 
 
 def _to_int(address) -> int:
     return int(str(address), 0)
 
 
-def _extract_role_and_account(ev: object) -> tuple[int, int] | None:
+def _extract_role_and_account(
+    ev: object, selector: int = ROLE_GRANTED_SELECTOR
+) -> tuple[int, int] | None:
     """
-    Extract (role_id, account) from RoleGranted event variants.
+    Extract (role_id, account) from RoleGranted (or, with *selector*, RoleRevoked) event variants.
     Supports:
-      - flat component keys: [RoleGrantedSelector, role, account, sender]
-      - nested component keys: [..., RoleGrantedSelector, role, account, sender]
+      - flat component keys: [Selector, role, account, sender]
+      - nested component keys: [..., Selector, role, account, sender]
       - older/non-key layouts using keys[1]=role and data[0]=account
       - full data layouts using data=[role, account, sender]
     """
@@ -117,8 +156,8 @@ def _extract_role_and_account(ev: object) -> tuple[int, int] | None:
     keys = [_to_int(v) for v in keys_raw]
     data = [_to_int(v) for v in data_raw]
 
-    if ROLE_GRANTED_SELECTOR in keys:
-        selector_pos = keys.index(ROLE_GRANTED_SELECTOR)
+    if selector in keys:
+        selector_pos = keys.index(selector)
         if len(keys) >= selector_pos + 3:
             return keys[selector_pos + 1], keys[selector_pos + 2]
 
@@ -131,11 +170,143 @@ def _extract_role_and_account(ev: object) -> tuple[int, int] | None:
     return None
 
 
+def _extract_role_change(ev: object) -> tuple[int, int, bool] | None:
+    """
+    Extract (role_id, account, granted) from a RoleGranted, RoleRevoked or named
+    ``<Role>Added`` / ``<Role>Removed`` event.
+    """
+    keys_raw = ev["keys"] if isinstance(ev, dict) else ev.keys
+    data_raw = ev["data"] if isinstance(ev, dict) else ev.data
+    keys = [_to_int(v) for v in keys_raw]
+    if keys and keys[0] in NAMED_ROLE_EVENTS:
+        if not data_raw:
+            return None
+        role_name, granted = NAMED_ROLE_EVENTS[keys[0]]
+        return ROLE_IDS[role_name], _to_int(data_raw[0]), granted
+
+    if ROLE_REVOKED_SELECTOR in keys:
+        extracted = _extract_role_and_account(ev, ROLE_REVOKED_SELECTOR)
+        granted = False
+    else:
+        extracted = _extract_role_and_account(ev)
+        granted = True
+    if extracted is None:
+        return None
+    return extracted[0], extracted[1], granted
+
+
+def _event_order_key(ev: object, seq: int) -> tuple[int, int, int, int]:
+    """
+    Chronological sort key (block, tx index, event index, arrival order) of an event.
+    Raw getEvents fallbacks may lack the indices; arrival order breaks the tie then.
+    """
+
+    def field(name: str) -> int | None:
+        value = ev.get(name) if isinstance(ev, dict) else getattr(ev, name, None)
+        return None if value is None else _to_int(value)
+
+    block_number = field("block_number")
+    return (
+        sys.maxsize if block_number is None else block_number,
+        field("transaction_index") or 0,
+        field("event_index") or 0,
+        seq,
+    )
+
+
+class RoleTimeline:
+    """
+    Index of role membership over time, built by replaying grant and revoke events.
+
+    For every (role, account) it keeps the ``[start, end]`` block intervals during which the
+    account held the role: granted in block ``start`` and revoked in block ``end``
+    (``None`` while still held). A block-level query reflects the state at the end of the block.
+    """
+
+    def __init__(self):
+        self.intervals: Dict[int, Dict[int, list[list[int | None]]]] = defaultdict(dict)
+
+    @classmethod
+    def from_changes(
+        cls, role_changes: list[tuple[tuple, int, int, bool]]
+    ) -> "RoleTimeline":
+        """
+        Build a timeline from ``(order_key, role_id, account, granted)`` changes, where
+        ``order_key`` starts with the block number (see ``_event_order_key``).
+        """
+        timeline = cls()
+        for order_key, role_id, account, granted in sorted(
+            role_changes, key=lambda c: c[0]
+        ):
+            timeline._apply(order_key[0], role_id, account, granted)
+        return timeline
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RoleTimeline":
+        """Load a timeline saved with ``to_dict``."""
+        timeline = cls()
+        for role_hex, accounts in data.items():
+            for account_hex, intervals in accounts.items():
+                timeline.intervals[_to_int(role_hex)][_to_int(account_hex)] = [
+                    list(interval) for interval in intervals
+                ]
+        return timeline
+
+    def to_dict(self) -> dict:
+        """``{hex_role_id: {hex_account: [[start, end], ...]}}``, JSON serializable."""
+        return {
+            hex(role_id): {
+                hex(account): intervals
+                for account, intervals in sorted(accounts.items())
+            }
+            for role_id, accounts in sorted(self.intervals.items())
+        }
+
+    def _apply(self, block: int, role_id: int, account: int, granted: bool):
+        intervals = self.intervals[role_id].get(account)
+        is_held = intervals is not None and intervals[-1][1] is None
+        if granted and not is_held:
+            self.intervals[role_id].setdefault(account, []).append([block, None])
+        elif not granted and is_held:
+            intervals[-1][1] = block
+
+    def holders_at(self, role: RoleName | int, block: int) -> list[int]:
+        """Accounts holding *role* at the end of *block*, sorted."""
+        role_id = ROLE_IDS[role] if isinstance(role, RoleName) else role
+        return sorted(
+            account
+            for account, intervals in self.intervals.get(role_id, {}).items()
+            if any(
+                start <= block and (end is None or end > block)
+                for start, end in intervals
+            )
+        )
+
+    def current_holders(self) -> Dict[int, set]:
+        """Accounts holding each role after the last replayed event."""
+        return {
+            role_id: {
+                account
+                for account, intervals in accounts.items()
+                if intervals[-1][1] is None
+            }
+            for role_id, accounts in self.intervals.items()
+        }
+
+    def account_history(self, account: int) -> Dict[int, list[list[int | None]]]:
+        """The ``[start, end]`` intervals of every role *account* ever held."""
+        return {
+            role_id: accounts[account]
+            for role_id, accounts in self.intervals.items()
+            if account in accounts
+        }
+
+
 async def _get_events_chunk_raw(
     client: FullNodeClient,
     *,
     contract_address: str,
-    key_selector_hex: str,
+    key_selectors_hex: list[str],
     from_block_number: int,
     to_block_number: int,
     continuation_token: str | None = None,
@@ -146,10 +317,10 @@ async def _get_events_chunk_raw(
     """
     params = {
         "address": contract_address,
-        "keys": [[key_selector_hex]],
+        "keys": [key_selectors_hex],
         "from_block": {"block_number": from_block_number},
         "to_block": {"block_number": to_block_number},
-        "chunk_size": 1000,
+        "chunk_size": EVENT_PAGE_SIZE,
     }
     if continuation_token is not None:
         params["continuation_token"] = continuation_token
@@ -256,50 +427,89 @@ async def _has_legacy_role(
         return False
 
 
-async def _fetch_role_granted_events(
+async def _iter_role_events(
     client: FullNodeClient,
     contract_address: str | int,
+    selectors: list[int],
     from_block: int = 0,
     to_block: str | int = "latest",
-) -> list:
-    """Fetch all OZ AccessControl ``RoleGranted`` events emitted by *contract_address*."""
+    chunk_policy: AdaptiveChunkPolicy | None = None,
+) -> AsyncIterator[list]:
+    """
+    Yield the events with any of *selectors* as first key emitted by *contract_address*, one
+    block chunk at a time, in a single scan. The next chunk is fetched while the caller
+    processes the current one.
+
+    Blocks are scanned in ``EVENT_CHUNK_SIZE`` windows, or with an adaptive window when
+    *chunk_policy* is given.
+    """
     address_hex = hex(_to_int(contract_address))
-    key_selector_hex = hex(ROLE_GRANTED_SELECTOR)
+    key_selectors_hex = [hex(selector) for selector in selectors]
     if isinstance(to_block, str):
         to_block = await client.get_block_number()
 
-    all_events = []
-    for chunk_start in range(from_block, to_block + 1, EVENT_CHUNK_SIZE):
-        chunk_end = min(chunk_start + EVENT_CHUNK_SIZE - 1, to_block)
+    async def fetch_chunk(chunk_start: int, chunk_end: int) -> list:
         try:
             resp = await client.get_events(
                 address=address_hex,
-                keys=[[key_selector_hex]],
+                keys=[key_selectors_hex],
                 from_block_number=chunk_start,
                 to_block_number=chunk_end,
                 follow_continuation_token=True,
+                chunk_size=EVENT_PAGE_SIZE,
             )
-            all_events.extend(resp.events)
+            return resp.events
         except ValidationError:
             logger.warning(
                 "RPC omitted event indices; using raw getEvents fallback for blocks %s-%s",
                 chunk_start,
                 chunk_end,
             )
+            chunk_events = []
             token = None
             while True:
                 events, token = await _get_events_chunk_raw(
                     client,
                     contract_address=address_hex,
-                    key_selector_hex=key_selector_hex,
+                    key_selectors_hex=key_selectors_hex,
                     from_block_number=chunk_start,
                     to_block_number=chunk_end,
                     continuation_token=token,
                 )
-                all_events.extend(events)
+                chunk_events.extend(events)
                 if token is None:
                     break
-    return all_events
+            return chunk_events
+
+    if chunk_policy is not None:
+        chunks = stream_adaptive(fetch_chunk, from_block, to_block, chunk_policy)
+    else:
+        chunks = stream_block_ranges(
+            fetch_chunk, split_block_range(from_block, to_block, EVENT_CHUNK_SIZE)
+        )
+    async for chunk in chunks:
+        yield chunk
+
+
+async def _fetch_role_granted_events(
+    client: FullNodeClient,
+    contract_address: str | int,
+    from_block: int = 0,
+    to_block: str | int = "latest",
+    chunk_policy: AdaptiveChunkPolicy | None = None,
+) -> list:
+    """Fetch all OZ AccessControl ``RoleGranted`` events emitted by *contract_address*."""
+    events = []
+    async for chunk in _iter_role_events(
+        client,
+        contract_address,
+        [ROLE_GRANTED_SELECTOR],
+        from_block=from_block,
+        to_block=to_block,
+        chunk_policy=chunk_policy,
+    ):
+        events.extend(chunk)
+    return events
 
 
 async def extract_common_roles(
@@ -309,6 +519,10 @@ async def extract_common_roles(
     to_block: str | int = "latest",
     include_past: bool = False,
     include_unknown: bool = False,
+    adaptive_chunks: bool = False,
+    max_concurrency: int = ROLE_CHECK_CONCURRENCY,
+    replay_events: bool = False,
+    batch_calls: bool = False,
 ) -> Dict[str, List[str]]:
     """
     Extract current (or historical) role owners from a Starknet contract that
@@ -320,30 +534,67 @@ async def extract_common_roles(
     role is returned without verifying current membership.
     When *include_unknown* is ``True``, discovered role IDs not in ``ROLE_IDS``
     are also returned as ``UNKNOWN_ROLE_<hex_role_id>``.
+    When *adaptive_chunks* is ``True``, the block window of the event scan grows or
+    shrinks with the observed event density and RPC latency.
+    Up to *max_concurrency* membership checks are in flight at once.
+    When *replay_events* is ``True``, ``RoleRevoked`` and the named ``<Role>Added`` /
+    ``<Role>Removed`` events are fetched in the same scan and replayed to compute the
+    current holders locally. Only one holder per role is then confirmed with ``has_role``;
+    roles whose spot-check disagrees fall back to checking every candidate.
+    When *batch_calls* is ``True``, concurrent membership checks are sent as JSON-RPC
+    batches instead of one HTTP request each. Passing a ``BatchingClient`` has the same
+    effect and also lets concurrent contracts share batches.
     """
+    if max_concurrency <= 0:
+        raise ValueError("max_concurrency must be greater than 0")
     addr_int = _to_int(contract_address)
-    events = await _fetch_role_granted_events(
-        client,
-        contract_address,
-        from_block=from_block,
-        to_block=to_block,
+    call_client = (
+        BatchingClient(client)
+        if batch_calls and not isinstance(client, BatchingClient)
+        else client
     )
-    logger.info("Fetched %d RoleGranted events from %s", len(events), hex(addr_int))
+
+    selectors = [ROLE_GRANTED_SELECTOR]
+    if replay_events:
+        selectors += [ROLE_REVOKED_SELECTOR, *NAMED_ROLE_EVENTS.keys()]
 
     # Event layout (OZ AccessControl, #[flat] component embedding):
     #   keys = [sn_keccak("RoleGranted"), role_id]
     #   data = [account, sender]
     role_grants: Dict[int, set] = defaultdict(set)
-    for ev in events:
-        extracted = _extract_role_and_account(ev)
-        if extracted is None:
-            continue
-        role_id, account = extracted
-        role_grants[role_id].add(account)
+    role_changes: list[tuple[tuple, int, int, bool]] = []
+    n_events = 0
+    async for chunk in _iter_role_events(
+        client,
+        contract_address,
+        selectors,
+        from_block=from_block,
+        to_block=to_block,
+        chunk_policy=(
+            AdaptiveChunkPolicy(initial_chunk_size=EVENT_CHUNK_SIZE)
+            if adaptive_chunks
+            else None
+        ),
+    ):
+        for ev in chunk:
+            extracted = _extract_role_change(ev)
+            if extracted is None:
+                continue
+            role_id, account, granted = extracted
+            if granted:
+                role_grants[role_id].add(account)
+            if replay_events:
+                role_changes.append(
+                    (_event_order_key(ev, n_events), role_id, account, granted)
+                )
+            n_events += 1
+    logger.info("Fetched %d role events from %s", n_events, hex(addr_int))
 
     role_owners: Dict[str, List[str]] = {}
     block_arg: str | int = to_block if isinstance(to_block, int) else "latest"
-    has_role_supported = await _supports_has_role(client, addr_int, block=block_arg)
+    has_role_supported = await _supports_has_role(
+        call_client, addr_int, block=block_arg
+    )
     if not has_role_supported:
         logger.debug(
             "Contract does not expose has_role(role, account); using legacy is_<role>(account) checks."
@@ -355,53 +606,93 @@ async def extract_common_roles(
             if role_id not in ROLE_ID_TO_NAME:
                 roles_to_check.append((f"UNKNOWN_ROLE_{hex(role_id)}", role_id))
 
-    for role_name, role_id in roles_to_check:
-        candidates = role_grants.get(role_id, set())
-        if not candidates:
-            continue
-
-        if include_past:
-            owners = sorted(candidates)
-        else:
-            owners = []
-            for acct in sorted(candidates):
-                if has_role_supported:
-                    try:
-                        has_it = await _has_role(
-                            client,
-                            addr_int,
-                            role_id,
-                            acct,
-                            block=block_arg,
-                        )
-                    except Exception as e:
-                        if _is_missing_entrypoint_error(e):
-                            # Missing entry point means this contract uses legacy role check entrypoints.
-                            has_role_supported = False
-                            logger.debug(
-                                "has_role missing entrypoint (%s); switching to legacy is_<role>(account) checks for this contract run.",
-                                e,
-                            )
-                            has_it = await _has_legacy_role(
-                                client,
-                                addr_int,
-                                role_name,
-                                acct,
-                                block=block_arg,
-                            )
-                        else:
-                            raise
-                else:
-                    has_it = await _has_legacy_role(
-                        client,
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def check_membership(
+        role_name: RoleName | str, role_id: int, acct: int
+    ) -> bool:
+        nonlocal has_role_supported
+        async with semaphore:
+            if has_role_supported:
+                try:
+                    return await _has_role(
+                        call_client,
                         addr_int,
-                        role_name,
+                        role_id,
                         acct,
                         block=block_arg,
                     )
-                if has_it:
-                    owners.append(acct)
+                except Exception as e:
+                    if not _is_missing_entrypoint_error(e):
+                        raise
+                    # Missing entry point means this contract uses legacy role check entrypoints.
+                    # Checks that were already in flight fail the same way; switch only once.
+                    if has_role_supported:
+                        has_role_supported = False
+                        logger.debug(
+                            "has_role missing entrypoint (%s); switching to legacy is_<role>(account) checks for this contract run.",
+                            e,
+                        )
+            return await _has_legacy_role(
+                call_client,
+                addr_int,
+                role_name,
+                acct,
+                block=block_arg,
+            )
 
+    async def run_checks(checks: list[tuple[RoleName | str, int, int]]) -> list[bool]:
+        tasks = [asyncio.ensure_future(check_membership(*check)) for check in checks]
+        try:
+            return await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    checks = [
+        (role_name, role_id, acct)
+        for role_name, role_id in roles_to_check
+        for acct in sorted(role_grants.get(role_id, set()))
+    ]
+    if include_past:
+        results = [True] * len(checks)
+    elif replay_events:
+        holders = RoleTimeline.from_changes(role_changes).current_holders()
+        spot_checks = [
+            (role_name, role_id, min(holders[role_id]))
+            for role_name, role_id in roles_to_check
+            if holders.get(role_id)
+        ]
+        spot_results = await run_checks(spot_checks)
+        mismatched_roles = set()
+        for (role_name, _, acct), has_it in zip(spot_checks, spot_results):
+            if not has_it:
+                logger.warning(
+                    "Replayed events say %s holds %s, but has_role disagrees; checking all candidates.",
+                    hex(acct),
+                    role_name,
+                )
+                mismatched_roles.add(role_name)
+        recheck = [check for check in checks if check[0] in mismatched_roles]
+        rechecked = dict(zip(recheck, await run_checks(recheck)))
+        results = [
+            (
+                rechecked[check]
+                if check in rechecked
+                else check[2] in holders.get(check[1], set())
+            )
+            for check in checks
+        ]
+    else:
+        results = await run_checks(checks)
+
+    owners_by_role: Dict[RoleName | str, list] = defaultdict(list)
+    for (role_name, _, acct), has_it in zip(checks, results):
+        if has_it:
+            owners_by_role[role_name].append(acct)
+
+    for role_name, _ in roles_to_check:
+        owners = owners_by_role.get(role_name)
         if owners:
             role_name_str = (
                 role_name.value if isinstance(role_name, RoleName) else role_name
@@ -426,11 +717,131 @@ async def extract_common_roles(
     return role_owners
 
 
+async def build_role_timeline(
+    client: FullNodeClient,
+    contract_address: str | int,
+    from_block: int = 0,
+    to_block: str | int = "latest",
+    adaptive_chunks: bool = False,
+) -> RoleTimeline:
+    """
+    Scan all role events of *contract_address* once and index them by block.
+
+    The timeline answers point-in-time questions ("who held SecurityAdmin at block N",
+    "when did account A hold any role") without further RPC calls. Only events from
+    *from_block* on are included, so use the default of 0 for a complete history.
+    """
+    role_changes: list[tuple[tuple, int, int, bool]] = []
+    async for chunk in _iter_role_events(
+        client,
+        contract_address,
+        [ROLE_GRANTED_SELECTOR, ROLE_REVOKED_SELECTOR, *NAMED_ROLE_EVENTS.keys()],
+        from_block=from_block,
+        to_block=to_block,
+        chunk_policy=(
+            AdaptiveChunkPolicy(initial_chunk_size=EVENT_CHUNK_SIZE)
+            if adaptive_chunks
+            else None
+        ),
+    ):
+        for ev in chunk:
+            extracted = _extract_role_change(ev)
+            if extracted is None:
+                continue
+            role_changes.append((_event_order_key(ev, len(role_changes)), *extracted))
+    logger.info(
+        "Indexed %d role events from %s",
+        len(role_changes),
+        hex(_to_int(contract_address)),
+    )
+    return RoleTimeline.from_changes(role_changes)
+
+
+async def extract_common_roles_batch(
+    client: FullNodeClient,
+    contract_addresses: list[str | int],
+    max_contracts: int = BATCH_CONTRACT_CONCURRENCY,
+    **kwargs,
+) -> AsyncIterator[tuple[str | int, Dict[str, List[str]] | Exception]]:
+    """
+    Run ``extract_common_roles`` on many contracts over one shared client.
+
+    Up to *max_contracts* contracts are processed at once; *kwargs* are passed to
+    ``extract_common_roles``. Yields ``(contract_address, roles)`` as each contract finishes,
+    or ``(contract_address, exception)`` if it failed, so one bad contract doesn't stop the
+    batch.
+    """
+    if max_contracts <= 0:
+        raise ValueError("max_contracts must be greater than 0")
+    semaphore = asyncio.Semaphore(max_contracts)
+
+    async def run(
+        contract_address: str | int,
+    ) -> tuple[str | int, Dict[str, List[str]] | Exception]:
+        async with semaphore:
+            try:
+                return contract_address, await extract_common_roles(
+                    client, contract_address, **kwargs
+                )
+            except Exception as e:
+                logger.warning("Role discovery failed for %s: %s", contract_address, e)
+                return contract_address, e
+
+    tasks = [asyncio.ensure_future(run(address)) for address in contract_addresses]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def _read_contract_addresses(path: str) -> list[str]:
+    """Read one address per line from *path* (``-`` for stdin), skipping blanks and ``#`` comments."""
+    if path == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(path, "r") as f:
+            lines = f.read().splitlines()
+    addresses = [line.split("#", 1)[0].strip() for line in lines]
+    return [address for address in addresses if address]
+
+
 def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="Extract role owners from a Starknet contract using CommonRoles.",
     )
-    parser.add_argument("contract_address", help="Contract address (hex)")
+    parser.add_argument("contract_address", nargs="?", help="Contract address (hex)")
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        default=None,
+        help="Run on every address listed in FILE (- for stdin) and print one JSON line per contract",
+    )
+    parser.add_argument(
+        "--batch-concurrency",
+        type=int,
+        default=BATCH_CONTRACT_CONCURRENCY,
+        help=f"Contracts processed concurrently in --batch mode (default: {BATCH_CONTRACT_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--max-connections",
+        type=int,
+        default=MAX_CONNECTIONS,
+        help=f"Maximum open RPC connections shared by all requests (default: {MAX_CONNECTIONS})",
+    )
+    parser.add_argument(
+        "--requests-per-second",
+        type=float,
+        default=None,
+        help="Maximum RPC requests per second (default: unlimited)",
+    )
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=RetryPolicy.max_retries,
+        help=f"Retries of RPC reads failing with 429, 5xx or connection errors (default: {RetryPolicy.max_retries})",
+    )
     parser.add_argument(
         "--chain",
         choices=["mainnet", "sepolia"],
@@ -439,8 +850,9 @@ def _build_parser() -> argparse.ArgumentParser:
     )
     parser.add_argument(
         "--rpc",
+        action="append",
         default=None,
-        help="Custom RPC URL (overrides --chain)",
+        help="Custom RPC URL (overrides --chain). Repeat to add endpoints; requests go to the fastest healthy one",
     )
     parser.add_argument(
         "--from-block",
@@ -458,6 +870,32 @@ def _build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Include discovered role IDs not mapped to CommonRoles constants",
     )
+    parser.add_argument(
+        "--adaptive-chunks",
+        action="store_true",
+        help="Resize the event scan window based on event density and RPC latency",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=ROLE_CHECK_CONCURRENCY,
+        help=f"Maximum concurrent role membership checks (default: {ROLE_CHECK_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--replay-events",
+        action="store_true",
+        help="Compute current holders by replaying grant/revoke events instead of calling has_role per account",
+    )
+    parser.add_argument(
+        "--batch-calls",
+        action="store_true",
+        help="Send concurrent membership checks as JSON-RPC batches",
+    )
+    parser.add_argument(
+        "--timeline",
+        action="store_true",
+        help="Print the block intervals during which every account held every role",
+    )
     parser.add_argument(
         "--log_level",
         choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
@@ -473,8 +911,36 @@ def _build_parser() -> argparse.ArgumentParser:
     return parser
 
 
+async def _run_batch(client: FullNodeClient, args: argparse.Namespace) -> bool:
+    """Print one JSON line per contract as it finishes. Returns whether all succeeded."""
+    all_succeeded = True
+    async for contract_address, result in extract_common_roles_batch(
+        client,
+        _read_contract_addresses(args.batch),
+        max_contracts=args.batch_concurrency,
+        from_block=args.from_block,
+        include_past=args.include_past,
+        include_unknown=args.include_unknown,
+        adaptive_chunks=args.adaptive_chunks,
+        max_concurrency=args.max_concurrency,
+        replay_events=args.replay_events,
+    ):
+        if isinstance(result, Exception):
+            all_succeeded = False
+            line = {"contract_address": contract_address, "error": str(result)}
+        else:
+            line = {"contract_address": contract_address, "roles": result}
+        print(json.dumps(line, sort_keys=True), flush=True)
+    return all_succeeded
+
+
 async def _main():
-    args = _build_parser().parse_args()
+    parser = _build_parser()
+    args = parser.parse_args()
+    if (args.contract_address is None) == (args.batch is None):
+        parser.error("exactly one of contract_address or --batch is required")
+    if args.batch is not None and args.timeline:
+        parser.error("--timeline can't be combined with --batch")
     effective_log_level = "DEBUG" if args.verbose else args.log_level
 
     if effective_log_level != "DEBUG":
@@ -485,21 +951,51 @@ async def _main():
         stream=sys.stderr,
     )
 
-    rpc_url = args.rpc or RPCS[args.chain]
-    client = FullNodeClient(rpc_url)
-
-    try:
-        roles = await extract_common_roles(
+    rpc_urls = args.rpc or [RPCS[args.chain]]
+    # One pooled session for all requests (starknet_py opens a new one per call otherwise).
+    async with aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=args.max_connections)
+    ) as session:
+        if len(rpc_urls) > 1:
+            client = create_pooled_client(rpc_urls, session=session)
+        else:
+            client = FullNodeClient(rpc_urls[0], session=session)
+        limit_client(
             client,
-            contract_address=args.contract_address,
-            from_block=args.from_block,
-            include_past=args.include_past,
-            include_unknown=args.include_unknown,
+            limiter=RateLimiter(requests_per_second=args.requests_per_second),
+            retry_policy=RetryPolicy(max_retries=args.max_retries),
         )
-        print(json.dumps(roles, sort_keys=True, indent=2))
-    except Exception as e:
-        print(json.dumps({"error": str(e)}, sort_keys=True, indent=2))
-        raise SystemExit(1)
+        if args.batch_calls:
+            client = BatchingClient(client)
+        if args.batch is not None:
+            if not await _run_batch(client, args):
+                raise SystemExit(1)
+            return
+
+        try:
+            if args.timeline:
+                timeline = await build_role_timeline(
+                    client,
+                    contract_address=args.contract_address,
+                    from_block=args.from_block,
+                    adaptive_chunks=args.adaptive_chunks,
+                )
+                print(json.dumps(timeline.to_dict(), sort_keys=True, indent=2))
+                return
+            roles = await extract_common_roles(
+                client,
+                contract_address=args.contract_address,
+                from_block=args.from_block,
+                include_past=args.include_past,
+                include_unknown=args.include_unknown,
+                adaptive_chunks=args.adaptive_chunks,
+                max_concurrency=args.max_concurrency,
+                replay_events=args.replay_events,
+            )
+            print(json.dumps(roles, sort_keys=True, indent=2))
+        except Exception as e:
+            print(json.dumps({"error": str(e)}, sort_keys=True, indent=2))
+            raise SystemExit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,220 @@
+"""
+JSON-RPC request batching for Starknet nodes.
+
+Requests issued within ``max_delay`` seconds of each other are sent together as one JSON-RPC
+batch (an array of requests in a single HTTP POST). Each caller awaits only its own result,
+and per-item errors are raised to their caller as the usual starknet.py ``ClientError``.
+"""
+
+import asyncio
+import logging
+from typing import Any, Optional, Union
+
+from starknet_py.net.client_errors import ClientError
+from starknet_py.net.client_models import (
+    Call,
+    Hash,
+    Tag,
+    TransactionStatusResponse,
+)
+from starknet_py.net.client_utils import _to_rpc_felt, get_block_identifier
+from starknet_py.net.full_node_client import FullNodeClient
+from starknet_py.net.http_client import HttpMethod, RpcHttpClient, ServerError
+from starknet_py.net.schemas.rpc.transactions import TransactionStatusResponseSchema
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BATCH_SIZE = 50
+DEFAULT_MAX_DELAY = 0.002
+# Rate limiting is not a rejection of batches.
+HTTP_TOO_MANY_REQUESTS = 429
+
+
+def _rejects_batches(error: Exception) -> bool:
+    """
+    Whether ``error`` is an HTTP 4xx answer to a batch, which nodes and proxies without batch
+    support send instead of a JSON-RPC response.
+    """
+    if not isinstance(error, ClientError) or not str(error.code).isdigit():
+        return False
+    status = int(error.code)
+    return 400 <= status < 500 and status != HTTP_TOO_MANY_REQUESTS
+
+
+class JsonRpcBatcher:
+    """
+    Collects JSON-RPC requests and sends them to the node of ``client`` in batches.
+
+    If the node rejects batch requests, the batcher falls back to sending requests one by one.
+    """
+
+    def __init__(
+        self,
+        client: FullNodeClient,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_delay: float = DEFAULT_MAX_DELAY,
+    ):
+        if max_batch_size <= 0:
+            raise ValueError("Argument max_batch_size has to be greater than 0.")
+        self.client = client
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.batches_sent = 0
+        self._http_client: RpcHttpClient = client._client  # pyright: ignore
+        self._batching_supported = True
+        self._pending: list[tuple[str, dict, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._in_flight: set[asyncio.Task] = set()
+
+    async def request(self, method_name: str, params: dict) -> Any:
+        """
+        Send ``starknet_<method_name>`` with ``params`` as part of the next batch.
+
+        :param method_name: The RPC method name without the ``starknet_`` prefix.
+        :param params: The request params.
+        :return: The ``result`` field of the response.
+        """
+        if not self._batching_supported:
+            return await self._http_client.call(method_name=method_name, params=params)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((method_name, params, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self.max_delay, self._flush
+            )
+        return await future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if len(batch) == 0:
+            return
+        task = asyncio.ensure_future(self._send(batch))
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+
+    async def _send(self, batch: list[tuple[str, dict, asyncio.Future]]):
+        payload = [
+            {
+                "jsonrpc": "2.0",
+                "method": f"{self._http_client.method_prefix}_{method_name}",
+                "id": request_id,
+                "params": params,
+            }
+            for request_id, (method_name, params, _) in enumerate(batch)
+        ]
+        try:
+            self.batches_sent += 1
+            response = await self._http_client.request(
+                http_method=HttpMethod.POST,
+                address=self._http_client.url,
+                payload=payload,
+            )
+        except Exception as e:
+            if _rejects_batches(e):
+                await self._disable_batching(batch)
+                return
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        if not isinstance(response, list):
+            await self._disable_batching(batch)
+            return
+
+        responses_by_id = {item.get("id"): item for item in response}
+        for request_id, (_, _, future) in enumerate(batch):
+            if future.done():
+                continue
+            item = responses_by_id.get(request_id)
+            if item is None:
+                future.set_exception(ServerError(body={"batch_response": response}))
+            elif "result" in item:
+                future.set_result(item["result"])
+            else:
+                try:
+                    RpcHttpClient.handle_rpc_error(item)
+                except Exception as e:
+                    future.set_exception(e)
+
+    async def _disable_batching(self, batch: list[tuple[str, dict, asyncio.Future]]):
+        logger.warning(
+            "Node at %s doesn't support JSON-RPC batches; sending requests one by one.",
+            self._http_client.url,
+        )
+        self._batching_supported = False
+        await asyncio.gather(*(self._send_single(*request) for request in batch))
+
+    async def _send_single(
+        self, method_name: str, params: dict, future: asyncio.Future
+    ):
+        try:
+            result = await self._http_client.call(
+                method_name=method_name, params=params
+            )
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            return
+        if not future.done():
+            future.set_result(result)
+
+
+class BatchingClient:
+    """
+    Wraps a ``FullNodeClient`` so that ``call_contract`` and ``get_transaction_status`` requests
+    are batched.
+
+    All other attributes are delegated to the wrapped client, so it can be passed wherever a
+    ``FullNodeClient`` is expected.
+    """
+
+    def __init__(
+        self,
+        client: FullNodeClient,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_delay: float = DEFAULT_MAX_DELAY,
+    ):
+        self.client = client
+        self.batcher = JsonRpcBatcher(
+            client, max_batch_size=max_batch_size, max_delay=max_delay
+        )
+
+    def __getattr__(self, name: str):
+        return getattr(self.client, name)
+
+    async def call_contract(
+        self,
+        call: Call,
+        block_hash: Optional[Union[Hash, Tag]] = None,
+        block_number: Optional[Union[int, Tag]] = None,
+    ) -> list[int]:
+        """Same as ``FullNodeClient.call_contract``, sent as part of a batch."""
+        block_identifier = get_block_identifier(
+            block_hash=block_hash, block_number=block_number
+        )
+        res = await self.batcher.request(
+            "call",
+            {
+                "request": {
+                    "contract_address": _to_rpc_felt(call.to_addr),
+                    "entry_point_selector": _to_rpc_felt(call.selector),
+                    "calldata": [_to_rpc_felt(value) for value in call.calldata],
+                },
+                **block_identifier,
+            },
+        )
+        return [int(value, 16) for value in res]
+
+    async def get_transaction_status(self, tx_hash: Hash) -> TransactionStatusResponse:
+        """Same as ``FullNodeClient.get_transaction_status``, sent as part of a batch."""
+        res = await self.batcher.request(
+            "getTransactionStatus", {"transaction_hash": _to_rpc_felt(tx_hash)}
+        )
+        return TransactionStatusResponseSchema().load(res)
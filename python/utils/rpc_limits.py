@@ -0,0 +1,189 @@
+"""
+Client-side rate limiting and retries for Starknet JSON-RPC clients.
+
+``RateLimitedRpcHttpClient`` wraps the ``RpcHttpClient`` of a ``FullNodeClient`` (a plain one or an
+``RpcPool``), so every request made through the client - event fetches, calls, fee estimates and
+status polls alike - is throttled by a shared ``RateLimiter``. Reads that fail with a throttling
+(429), server (5xx) or connection error are retried with jittered exponential backoff.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from starknet_py.net.full_node_client import FullNodeClient
+from starknet_py.net.http_client import HttpMethod, RpcHttpClient
+
+try:
+    from .rpc_pool import is_failover_error, is_write_request
+except ImportError:  # Running as a standalone script.
+    from rpc_pool import is_failover_error, is_write_request
+
+logger = logging.getLogger(__name__)
+
+# JSON-RPC error codes some providers return with HTTP 200 when throttling.
+RATE_LIMIT_ERROR_CODES = {429, -32005}
+
+
+class RateLimiter:
+    """
+    Token bucket of ``requests_per_second`` (with bursts of up to ``burst`` requests) combined
+    with a cap of ``max_in_flight`` concurrent requests. Use as ``async with limiter: ...``.
+    """
+
+    def __init__(
+        self,
+        requests_per_second: float | None = None,
+        max_in_flight: int | None = None,
+        burst: int | None = None,
+    ):
+        if requests_per_second is not None and requests_per_second <= 0:
+            raise ValueError("Argument requests_per_second has to be greater than 0.")
+        if max_in_flight is not None and max_in_flight <= 0:
+            raise ValueError("Argument max_in_flight has to be greater than 0.")
+        self.requests_per_second = requests_per_second
+        self.burst = burst or max(1, int(requests_per_second or 1))
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+        self._semaphore = (
+            asyncio.Semaphore(max_in_flight) if max_in_flight is not None else None
+        )
+
+    async def _take_token(self):
+        if self.requests_per_second is None:
+            return
+        # The lock makes waiters take tokens in arrival order.
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst,
+                    self._tokens + (now - self._updated_at) * self.requests_per_second,
+                )
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.requests_per_second)
+
+    async def __aenter__(self):
+        if self._semaphore is not None:
+            await self._semaphore.acquire()
+        try:
+            await self._take_token()
+        except BaseException:
+            if self._semaphore is not None:
+                self._semaphore.release()
+            raise
+        return self
+
+    async def __aexit__(self, *exc_info):
+        if self._semaphore is not None:
+            self._semaphore.release()
+        return False
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Jittered exponential backoff: attempt ``n`` waits a random time of up to
+    ``min(max_delay, base_delay * 2**n)`` seconds.
+    """
+
+    max_retries: int = 5
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+
+    def delay(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+
+def _is_rate_limit_result(result) -> bool:
+    if not isinstance(result, dict) or "error" not in result:
+        return False
+    return result["error"].get("code") in RATE_LIMIT_ERROR_CODES
+
+
+class RateLimitedRpcHttpClient(RpcHttpClient):
+    """
+    ``RpcHttpClient`` that sends all requests through ``inner`` under a rate limiter, retrying
+    idempotent reads on transient errors.
+    """
+
+    def __init__(
+        self,
+        inner: RpcHttpClient,
+        limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+    ):
+        super().__init__(
+            url=inner.url, session=inner.session, method_prefix=inner.method_prefix
+        )
+        self.inner = inner
+        self.limiter = limiter or RateLimiter()
+        self.retry_policy = retry_policy or RetryPolicy()
+
+    async def request(
+        self,
+        address: str,
+        http_method: HttpMethod,
+        params: Optional[dict] = None,
+        payload: Optional[dict | list] = None,
+    ):
+        write = is_write_request(payload)
+        attempt = 0
+        while True:
+            async with self.limiter:
+                try:
+                    result = await self.inner.request(
+                        address=address,
+                        http_method=http_method,
+                        params=params,
+                        payload=payload,
+                    )
+                    error = None
+                except Exception as e:
+                    if not is_failover_error(e, write):
+                        raise
+                    error = e
+            # A throttled request wasn't processed, so even writes can be resent.
+            retryable = error is not None or _is_rate_limit_result(result)
+            if not retryable or attempt >= self.retry_policy.max_retries:
+                if error is not None:
+                    raise error
+                return result
+            delay = self.retry_policy.delay(attempt)
+            logger.debug(
+                "RPC request failed (%r); retrying in %.2fs.",
+                error if error is not None else result["error"],
+                delay,
+            )
+            attempt += 1
+            await asyncio.sleep(delay)
+
+
+def limit_client(
+    client: FullNodeClient,
+    limiter: RateLimiter | None = None,
+    retry_policy: RetryPolicy | None = None,
+) -> FullNodeClient:
+    """
+    Route all requests of ``client`` through ``limiter``, retrying transient read failures.
+
+    Pass the same limiter to several clients to share one quota between them.
+
+    :param client: The client to limit. It is modified in place.
+    :param limiter: The rate limiter. Defaults to no limit.
+    :param retry_policy: The retry policy. Defaults to ``RetryPolicy()``.
+    :return: The client.
+    """
+    client._client = RateLimitedRpcHttpClient(  # pyright: ignore[reportPrivateUsage]
+        client._client,  # pyright: ignore[reportPrivateUsage]
+        limiter=limiter,
+        retry_policy=retry_policy,
+    )
+    return client
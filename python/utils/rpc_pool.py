@@ -0,0 +1,265 @@
+"""
+Multi-endpoint routing for Starknet JSON-RPC clients.
+
+``RpcPool`` is a drop-in ``RpcHttpClient`` that spreads requests over several node URLs. Reads go
+to the endpoint with the best observed latency and error rate; a read that is still pending after
+``hedge_after`` seconds is also sent to the next endpoint, and whichever answers first wins.
+Throttled (429), failing (5xx) or unreachable endpoints are skipped for ``failure_cooldown``
+seconds and the request transparently moves on to the next endpoint.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+import aiohttp
+from starknet_py.net.client_errors import ClientError
+from starknet_py.net.full_node_client import FullNodeClient
+from starknet_py.net.http_client import HttpMethod, RpcHttpClient
+
+logger = logging.getLogger(__name__)
+
+# Methods that submit transactions. They are never hedged.
+WRITE_METHOD_PREFIX = "starknet_add"
+
+
+@dataclass
+class RpcEndpoint:
+    url: str
+    # Extra headers sent only to this endpoint (e.g. an API key).
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class EndpointStats:
+    """
+    Moving averages of the latency and error rate of one endpoint.
+    """
+
+    latency: float | None = None
+    error_rate: float = 0.0
+    requests: int = 0
+    failures: int = 0
+    unhealthy_until: float = 0.0
+
+    def record_success(self, latency: float, alpha: float):
+        self.requests += 1
+        self.latency = (
+            latency
+            if self.latency is None
+            else alpha * latency + (1 - alpha) * self.latency
+        )
+        self.error_rate *= 1 - alpha
+
+    def record_failure(self, alpha: float, cooldown: float):
+        self.requests += 1
+        self.failures += 1
+        self.error_rate = alpha + (1 - alpha) * self.error_rate
+        self.unhealthy_until = time.monotonic() + cooldown
+
+    def score(self) -> float:
+        """Expected cost of a request; endpoints without samples are tried first."""
+        return (self.latency or 0.0) / max(1.0 - self.error_rate, 0.1)
+
+
+def _methods(payload: Any) -> list[str]:
+    if isinstance(payload, list):
+        return [item.get("method", "") for item in payload]
+    if isinstance(payload, dict):
+        return [payload.get("method", "")]
+    return []
+
+
+def is_write_request(payload: Any) -> bool:
+    return any(method.startswith(WRITE_METHOD_PREFIX) for method in _methods(payload))
+
+
+def _is_retryable_status(error: ClientError) -> bool:
+    return str(error.code) == "429" or str(error.code).startswith("5")
+
+
+def is_failover_error(error: BaseException, write: bool = False) -> bool:
+    """
+    Whether a request failing with ``error`` should move on to another endpoint.
+
+    Writes only fail over when the request surely wasn't processed.
+    """
+    if isinstance(error, ClientError):
+        # HTTP-level errors carry the status code; JSON-RPC errors are returned as results.
+        return str(error.code) == "429" if write else _is_retryable_status(error)
+    if write:
+        return isinstance(error, aiohttp.ClientConnectorError)
+    return isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError))
+
+
+class RpcPool(RpcHttpClient):
+    """
+    ``RpcHttpClient`` that routes every request to one of several endpoints.
+    """
+
+    def __init__(
+        self,
+        endpoints: list[RpcEndpoint | str],
+        session: Optional[aiohttp.ClientSession] = None,
+        hedge_after: float | None = 1.0,
+        failure_cooldown: float = 30.0,
+        alpha: float = 0.2,
+    ):
+        """
+        :param endpoints: The node URLs, in order of preference before any stats are collected.
+        :param session: The session used for all endpoints. A new session is opened per request
+            if None.
+        :param hedge_after: Seconds after which a pending read is also sent to the next
+            endpoint. None disables hedging.
+        :param failure_cooldown: Seconds an endpoint is deprioritized after a failure.
+        :param alpha: Weight of the newest sample in the latency and error rate averages.
+        """
+        if len(endpoints) == 0:
+            raise ValueError("At least one endpoint is required.")
+        self.endpoints = [
+            endpoint if isinstance(endpoint, RpcEndpoint) else RpcEndpoint(endpoint)
+            for endpoint in endpoints
+        ]
+        super().__init__(url=self.endpoints[0].url, session=session)
+        self.hedge_after = hedge_after
+        self.failure_cooldown = failure_cooldown
+        self.alpha = alpha
+        self.stats = {endpoint.url: EndpointStats() for endpoint in self.endpoints}
+
+    def ranked_endpoints(self) -> list[RpcEndpoint]:
+        """
+        Healthy endpoints from best to worst score, followed by the ones cooling down.
+        """
+        now = time.monotonic()
+
+        def rank(endpoint: RpcEndpoint) -> tuple:
+            stats = self.stats[endpoint.url]
+            cooling_down = stats.unhealthy_until > now
+            return (
+                cooling_down,
+                stats.unhealthy_until if cooling_down else stats.score(),
+            )
+
+        return sorted(self.endpoints, key=rank)
+
+    async def request(
+        self,
+        address: str,
+        http_method: HttpMethod,
+        params: Optional[dict] = None,
+        payload: Optional[dict | list] = None,
+    ):
+        if address != self.url:
+            return await super().request(
+                address=address, http_method=http_method, params=params, payload=payload
+            )
+        if self.session:
+            return await self._request_with_failover(
+                self.session, http_method, params, payload
+            )
+        async with aiohttp.ClientSession() as session:
+            return await self._request_with_failover(
+                session, http_method, params, payload
+            )
+
+    async def _send(
+        self,
+        session: aiohttp.ClientSession,
+        endpoint: RpcEndpoint,
+        http_method: HttpMethod,
+        params: Optional[dict],
+        payload: Optional[dict | list],
+        write: bool,
+    ):
+        stats = self.stats[endpoint.url]
+        started_at = time.monotonic()
+        try:
+            async with session.request(
+                method=http_method.value,
+                url=endpoint.url,
+                params=params,
+                json=payload,
+                headers=endpoint.headers,
+            ) as response:
+                await self.handle_request_error(response)
+                result = await response.json(content_type=None)
+        except Exception as e:
+            if is_failover_error(e, write):
+                stats.record_failure(self.alpha, self.failure_cooldown)
+                logger.debug("RPC endpoint %s failed: %r", endpoint.url, e)
+            raise
+        stats.record_success(time.monotonic() - started_at, self.alpha)
+        return result
+
+    async def _request_with_failover(
+        self,
+        session: aiohttp.ClientSession,
+        http_method: HttpMethod,
+        params: Optional[dict],
+        payload: Optional[dict | list],
+    ):
+        write = is_write_request(payload)
+        remaining = iter(self.ranked_endpoints())
+        pending: set[asyncio.Task] = set()
+        can_hedge = self.hedge_after is not None and not write
+        last_error: BaseException | None = None
+
+        def launch_next() -> bool:
+            endpoint = next(remaining, None)
+            if endpoint is None:
+                return False
+            pending.add(
+                asyncio.ensure_future(
+                    self._send(session, endpoint, http_method, params, payload, write)
+                )
+            )
+            return True
+
+        launch_next()
+        try:
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=self.hedge_after if can_hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if len(done) == 0:
+                    # The request is slow: race it against the next endpoint.
+                    can_hedge = launch_next()
+                    continue
+                for task in done:
+                    pending.discard(task)
+                    error = task.exception()
+                    if error is None:
+                        return task.result()
+                    if not is_failover_error(error, write):
+                        raise error
+                    last_error = error
+                if len(pending) == 0:
+                    launch_next()
+        finally:
+            for task in pending:
+                task.cancel()
+        assert last_error is not None
+        raise last_error
+
+
+def create_pooled_client(
+    endpoints: list[RpcEndpoint | str],
+    session: Optional[aiohttp.ClientSession] = None,
+    **pool_kwargs,
+) -> FullNodeClient:
+    """
+    Create a ``FullNodeClient`` whose requests are routed over ``endpoints``.
+
+    :param endpoints: The node URLs.
+    :param session: The session used for all endpoints.
+    :param pool_kwargs: Passed to ``RpcPool``.
+    :return: The client.
+    """
+    pool = RpcPool(endpoints, session=session, **pool_kwargs)
+    client = FullNodeClient(node_url=pool.url, session=session)
+    client._client = pool  # pyright: ignore[reportPrivateUsage]
+    return client
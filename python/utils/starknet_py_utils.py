@@ -4,26 +4,29 @@ from starknet_py.net.models.chains import StarknetChainId
 from starknet_py.net.signer.key_pair import KeyPair
 from starknet_py.contract import Contract, PreparedFunctionInvokeV3, DeclareResult
 from starknet_py.hash.selector import get_selector_from_name
-from starknet_py.net.client_models import TransactionStatus
-from starknet_py.transaction_errors import (
-    TransactionRejectedError,
-    TransactionRevertedError,
-)
 from starknet_py.net.models.transaction import InvokeV3
 from starknet_py.net.client_models import (
     ResourceBoundsMapping,
     ResourceBounds,
     Call,
-    TransactionExecutionStatus,
+    EmittedEvent,
 )
 from starknet_py.hash.utils import verify_message_signature
-from starknet_py.proxy.contract_abi_resolver import ContractAbiResolver, ProxyConfig
+from starknet_py.net.udc_deployer.deployer import Deployer
+from starknet_py.net.client_errors import ClientError
+from starknet_py.transaction_errors import (
+    TransactionFailedError,
+    TransactionRevertedError,
+)
+from starknet_py.common import create_sierra_compiled_contract
+from starknet_py.hash.sierra_class_hash import compute_sierra_class_hash
 import aiohttp
-import re
 import asyncio
 import json
 from pathlib import Path
+from contextlib import asynccontextmanager, nullcontext
 from dataclasses import dataclass, asdict, replace
+from typing import AsyncIterator, Awaitable, Callable
 from eth_utils import to_hex, to_int
 from ..config import (
     TX_CALLDATA,
@@ -34,12 +37,52 @@ from ..config import (
     TX_RESOURCE_BOUNDS,
     TX_SIGNATURE,
 )
+from .event_scanner import (
+    AdaptiveChunkPolicy,
+    bisect_last_event,
+    find_last_event,
+    group_events_by_selector,
+    prefetch,
+    scan_adaptive,
+    scan_block_ranges,
+    split_block_range,
+    stream_block_ranges,
+)
+from .event_store import EventStore, EventStoreRecord
+from .rpc_batch import BatchingClient
+from .rpc_pool import RpcEndpoint, create_pooled_client
+from .rpc_limits import RateLimiter, RetryPolicy, limit_client
+from .abi_cache import ABI_CACHE, AbiCache
+from .artifacts import ARTIFACT_CACHE
+from .declared_class_cache import DeclaredClassCache
+from .fee_estimation import (
+    DEFAULT_MARGIN_MULTIPLIER,
+    FeeEstimateCache,
+    FeeMarginPolicy,
+    estimate_resource_bounds,
+)
+from .deploy_plan import ContractSpec, deployment_order, resolve_refs
+from .multicall_packer import MulticallLimits, pack_calls, split_groups
+from .nonce_manager import NonceManager
+from .tx_waiter import PollingBackoff, wait_for_transaction, wait_for_transactions
 from .starkli_utils import get_starkli_private_key
 from .utils import print_debug, normalize_value
 
 
 FETCH_EVENTS_CHUNK_SIZE = 100000
-UNIVERSAL_GAS_MODEFIER = 10
+# Maximum events returned by a single getEvents page.
+EVENTS_PAGE_SIZE = 1000
+# Blocks below latest - EVENT_STORE_FINALITY_MARGIN are considered final and are cached.
+EVENT_STORE_FINALITY_MARGIN = 100
+# First interval (in seconds) between transaction status checks; later ones back off.
+TX_WAIT_INITIAL_INTERVAL = 0.25
+# Maximum number of UDC deploys packed into one multicall by deploy_contracts.
+DEPLOYS_PER_MULTICALL = 10
+# RPC error code for an undeclared class hash.
+CLASS_HASH_NOT_FOUND = 28
+# RPC error code for declaring a class that is already declared.
+CLASS_ALREADY_DECLARED = 51
+UNIVERSAL_GAS_MODEFIER = DEFAULT_MARGIN_MULTIPLIER
 UPGRADE_FUNCTIONS = [
     "add_new_implementation",
     "replace_to",
@@ -81,39 +124,77 @@ async def wait_for_tx_acceptance(
     node: FullNodeClient,
     check_interval: float = 2,
     retries: int = 500,
+    ws_url: str | None = None,
 ):
     """
-    Awaits for transaction to get accepted by polling its status..
+    Awaits for transaction to get accepted by polling its status, starting every
+    TX_WAIT_INITIAL_INTERVAL seconds and backing off up to check_interval seconds.
+    If ws_url is given, subscribes to the transaction status instead.
 
     :param tx_hash: The hash of the transaction to wait for.
     :param node: The node to wait for the transaction on.
-    :param check_interval: Defines interval between checks.
+    :param check_interval: Defines the maximum interval between checks.
     :param retries: Defines how many times the transaction is checked until an error is thrown.
+        The wait also stops after ``retries * check_interval`` seconds, subscribed or not.
+    :param ws_url: The WebSocket RPC URL of the node, if it supports subscriptions.
+    :raises TransactionNotReceivedError: If the node never knew the transaction.
+    :raises TimeoutError: If the transaction wasn't accepted in time.
+    :raises TransactionRevertedError: If the transaction reverted.
+    :raises TransactionFailedError: If the transaction was rejected.
     """
     if check_interval <= 0:
         raise ValueError("Argument check_interval has to be greater than 0.")
     if retries <= 0:
         raise ValueError("Argument retries has to be greater than 0.")
 
-    tx_status = await node.get_transaction_status(tx_hash=tx_hash)
+    await wait_for_transaction(
+        node,
+        tx_hash,
+        backoff=PollingBackoff(
+            initial_interval=min(TX_WAIT_INITIAL_INTERVAL, check_interval),
+            max_interval=check_interval,
+        ),
+        max_checks=retries,
+        timeout=retries * check_interval,
+        ws_url=ws_url,
+    )
 
-    while True:
-        retries -= 1
-        if tx_status.finality_status == TransactionStatus.REJECTED:
-            raise TransactionRejectedError()
 
-        if (
-            tx_status.finality_status == TransactionStatus.ACCEPTED_ON_L2
-            or tx_status.finality_status == TransactionStatus.ACCEPTED_ON_L1
-        ):
-            if tx_status.execution_status == TransactionExecutionStatus.REVERTED:
-                raise TransactionRevertedError()
-            return
+async def wait_for_txs_acceptance(
+    tx_hashes: list[str | int],
+    node: FullNodeClient,
+    check_interval: float = 2,
+    retries: int = 500,
+):
+    """
+    Awaits for many transactions to get accepted, checking all their statuses together in one
+    batched request per round.
 
-        if retries == 0:
-            raise ValueError("Transaction not accepted.")
+    :param tx_hashes: The hashes of the transactions to wait for.
+    :param node: The node to wait for the transactions on.
+    :param check_interval: Defines the maximum interval between checks.
+    :param retries: Defines how many times each transaction is checked until an error is thrown.
+        The wait also stops after ``retries * check_interval`` seconds.
+    :raises TransactionNotReceivedError: If the node never knew a transaction.
+    :raises TimeoutError: If a transaction wasn't accepted in time.
+    :raises TransactionRevertedError: If a transaction reverted.
+    :raises TransactionFailedError: If a transaction was rejected.
+    """
+    if check_interval <= 0:
+        raise ValueError("Argument check_interval has to be greater than 0.")
+    if retries <= 0:
+        raise ValueError("Argument retries has to be greater than 0.")
 
-        await asyncio.sleep(check_interval)
+    await wait_for_transactions(
+        node,
+        tx_hashes,
+        backoff=PollingBackoff(
+            initial_interval=min(TX_WAIT_INITIAL_INTERVAL, check_interval),
+            max_interval=check_interval,
+        ),
+        max_checks=retries,
+        timeout=retries * check_interval,
+    )
 
 
 def get_chain_id(chain: str) -> StarknetChainId:
@@ -134,23 +215,41 @@ def get_chain_id(chain: str) -> StarknetChainId:
 
 
 def setup_node(
-    chain: StarknetChainId, rpc: str, api_key: str | None, local_rpc: str | None = None
+    chain: StarknetChainId,
+    rpc: str,
+    api_key: str | None,
+    local_rpc: str | None = None,
+    limiter: RateLimiter | None = None,
+    retry_policy: RetryPolicy | None = None,
 ) -> tuple[FullNodeClient, aiohttp.ClientSession | None]:
     """
     Setup the RPC.
 
-    :param rpc: The RPC to use.
+    :param rpc: The RPC to use, or "pool" to route requests over all RPCs of the chain.
+    :param limiter: Rate limiter for all requests of the node. Defaults to no limit.
+    :param retry_policy: Retry policy for reads failing with 429, 5xx or connection errors.
+        Defaults to no retries, unless a limiter is given.
     :return: The RPC.
     """
     session = None
     if rpc == "local":
         assert local_rpc is not None, "local_rpc is required when using local RPC."
         node = FullNodeClient(local_rpc)
+    elif rpc == "pool":
+        endpoints = [
+            RpcEndpoint(url, headers={"x-apikey": api_key} if name == "juno" else {})
+            for name, url in RPC[chain].items()
+            if name != "juno" or api_key is not None
+        ]
+        session = aiohttp.ClientSession()
+        node = create_pooled_client(endpoints, session=session)
     else:
         if rpc == "juno":
             assert api_key is not None, "API key is required when using Juno's RPC."
             session = aiohttp.ClientSession(headers={"x-apikey": api_key})
         node = FullNodeClient(RPC[chain][rpc], session=session)
+    if limiter is not None or retry_policy is not None:
+        limit_client(node, limiter=limiter, retry_policy=retry_policy)
     return node, session
 
 
@@ -223,38 +322,78 @@ def get_contract_abi(
         raise FileNotFoundError(
             f"{package}_{contract_name}.contract_class.json file not found in {contract_folder}/target/{target}. Please run `scarb build` first."
         )
-    with open(contract_class_path, "r") as f:
-        return json.load(f)["abi"]
+    return ARTIFACT_CACHE.load_abi(contract_class_path)
 
 
 async def get_contract_abi_from_node(
-    contract_address: str, node: FullNodeClient
+    contract_address: str, node: FullNodeClient, abi_cache: AbiCache = ABI_CACHE
 ) -> list:
     """
     Get the ABI of a contract from a node.
 
     :param contract_address: The address of the contract to get the ABI for.
     :param node: The node to use.
+    :param abi_cache: ABIs by class hash; the class is only fetched on a miss.
     :return: The ABI of the contract.
     """
-    contract_abi = ContractAbiResolver(
-        address=contract_address, client=node, proxy_config=ProxyConfig()
-    )
-    (abi, _) = await contract_abi.get_abi_for_address()
+    (abi, _) = await abi_cache.get_abi_at(node, contract_address)
     return abi
 
 
 async def get_contract_from_address(
-    contract_address: str, provider: FullNodeClient | Account
+    contract_address: str,
+    provider: FullNodeClient | Account,
+    abi_cache: AbiCache = ABI_CACHE,
 ) -> Contract:
     """
     Get a contract instance from a contract address.
 
     :param contract_address: The address of the contract to get the instance for.
     :param account: The starknet.py account.
+    :param abi_cache: ABIs by class hash; the class is only fetched on a miss.
     :return: The contract instance.
     """
-    return await Contract.from_address(address=contract_address, provider=provider)
+    client = provider.client if isinstance(provider, Account) else provider
+    abi, cairo_version = await abi_cache.get_abi_at(client, contract_address)
+    return Contract(
+        address=contract_address,
+        abi=abi,
+        provider=provider,
+        cairo_version=cairo_version,
+    )
+
+
+async def is_class_declared(
+    node: FullNodeClient,
+    class_hash: int,
+    declared_classes: DeclaredClassCache | None = None,
+) -> bool:
+    """
+    Check whether a class is declared.
+
+    :param node: The node to check on.
+    :param class_hash: The class hash.
+    :param declared_classes: Cache of declared classes, checked before asking the node.
+    :return: Whether the class is declared.
+    """
+    if declared_classes is not None and declared_classes.contains(node.url, class_hash):
+        return True
+    try:
+        await node.get_class_by_hash(class_hash)
+    except ClientError as e:
+        if e.code == CLASS_HASH_NOT_FOUND:
+            return False
+        raise
+    if declared_classes is not None:
+        declared_classes.add(node.url, class_hash)
+    return True
+
+
+def _is_class_already_declared(error: ClientError) -> bool:
+    return (
+        error.code == CLASS_ALREADY_DECLARED
+        or "already declared" in str(error.message).lower()
+    )
 
 
 async def _declare_contract(
@@ -263,14 +402,23 @@ async def _declare_contract(
     package: str,
     account: Account,
     target: str = "release",
+    nonce_manager: NonceManager | None = None,
+    wait: bool = True,
+    declared_classes: DeclaredClassCache | None = None,
 ) -> DeclareResult | str:
     """
     Declare a contract using starknet.py and return the declare result, or class hash if already declared.
+    The class hash is computed locally, so nothing is sent for an already declared class.
 
     :param contract_name: The name of the contract to declare.
     :param contract_folder: The folder containing the contract.
     :param package: The package name.
     :param account: The starknet.py account.
+    :param nonce_manager: Hands out the nonce locally, so that several declarations can be
+        submitted without waiting for each other. The sender is resynced if the awaited
+        transaction is rejected.
+    :param wait: Whether to wait for the declaration to get accepted.
+    :param declared_classes: Cache of declared classes, checked before asking the node.
     :return: declare result, or class hash if already declared.
     """
     base_path = Path(contract_folder)
@@ -295,32 +443,42 @@ async def _declare_contract(
             f"Make sure casm = true and casm-add-pythonic-hints = true in [[target.starknet-contract]] section of your Scarb.toml file and then run `scarb build`"
         )
 
-    with open(contract_class_path, "r") as f:
-        compiled_contract = f.read()
-    with open(compiled_contract_class_path, "r") as f:
-        compiled_contract_casm = f.read()
+    class_hash = ARTIFACT_CACHE.derive(
+        contract_class_path,
+        "sierra_class_hash",
+        lambda text: compute_sierra_class_hash(create_sierra_compiled_contract(text)),
+    )
+    if await is_class_declared(account.client, class_hash, declared_classes):
+        return f"0x{class_hash:064x}"
+    compiled_contract = ARTIFACT_CACHE.read_text(contract_class_path)
+    compiled_contract_casm = ARTIFACT_CACHE.read_text(compiled_contract_class_path)
 
     try:
-        declare_result = await Contract.declare_v3(
-            account,
-            compiled_contract=compiled_contract,
-            compiled_contract_casm=compiled_contract_casm,
-            auto_estimate=True,
-        )
-        await declare_result.wait_for_acceptance()
-        await wait_for_tx_acceptance(declare_result.hash, account.client)
+        try:
+            async with _reserve_nonce(nonce_manager, account) as nonce:
+                declare_result = await Contract.declare_v3(
+                    account,
+                    compiled_contract=compiled_contract,
+                    compiled_contract_casm=compiled_contract_casm,
+                    auto_estimate=True,
+                    nonce=nonce,
+                )
+        except ClientError as e:
+            # Another deployer declared the class since it was checked.
+            if not _is_class_already_declared(e):
+                raise
+            if declared_classes is not None:
+                declared_classes.add(account.client.url, class_hash)
+            return f"0x{class_hash:064x}"
+        if wait:
+            async with _resync_on_rejection(nonce_manager, account):
+                await wait_for_tx_acceptance(declare_result.hash, account.client)
+            if declared_classes is not None:
+                declared_classes.add(account.client.url, class_hash)
         return declare_result
 
     except Exception as e:
-        if "is already declared" in str(e):
-            match = re.search(r"0x[a-fA-F0-9]{64}", str(e))
-            if match:
-                class_hash = match.group(0)
-                return class_hash
-            else:
-                raise Exception(f"Failed to extract the class hash. Error: {e}")
-        else:
-            raise Exception(f"Error declaring contract: {e}")
+        raise Exception(f"Error declaring contract: {e}")
 
 
 async def declare_contract(
@@ -329,6 +487,7 @@ async def declare_contract(
     package: str,
     account: Account,
     target: str = "release",
+    declared_classes: DeclaredClassCache | None = None,
 ) -> str:
     """
     Declare a contract using starknet.py and return the class hash.
@@ -337,12 +496,18 @@ async def declare_contract(
     :param contract_folder: The folder containing the contract.
     :param package: The package name.
     :param account: The starknet.py account.
+    :param declared_classes: Cache of declared classes, checked before asking the node.
     :return: The class hash of the declared contract.
     """
     print_debug(f"Declaring contract: {contract_name}")
 
     declare_result = await _declare_contract(
-        contract_name, contract_folder, package, account, target
+        contract_name,
+        contract_folder,
+        package,
+        account,
+        target,
+        declared_classes=declared_classes,
     )
     if isinstance(declare_result, DeclareResult):
         class_hash = to_hex(declare_result.class_hash)
@@ -395,7 +560,6 @@ async def deploy_contract(
         abi=abi,
         auto_estimate=True,
     )
-    await deploy_result.wait_for_acceptance()
     await wait_for_tx_acceptance(deploy_result.hash, account.client)
     contract = deploy_result.deployed_contract
     print_debug(f"Deployed contract: {to_hex(contract.address)}")
@@ -441,7 +605,6 @@ async def declare_and_deploy_contract(
         auto_estimate=True,
     )
 
-    await deploy_result.wait_for_acceptance()
     await wait_for_tx_acceptance(deploy_result.hash, account.client)
     contract = deploy_result.deployed_contract
     print_debug(f"Declared and deployed contract: {to_hex(contract.address)}")
@@ -449,36 +612,173 @@ async def declare_and_deploy_contract(
     return contract
 
 
+async def deploy_contracts(
+    specs: list[ContractSpec],
+    contract_folder: str,
+    package: str,
+    account: Account,
+    max_deploys_per_tx: int = DEPLOYS_PER_MULTICALL,
+    manifest_path: str | Path | None = None,
+    declared_classes: DeclaredClassCache | None = None,
+) -> dict[str, str]:
+    """
+    Declare and deploy several contracts whose constructor arguments may reference each other.
+
+    The classes are declared back-to-back, in nonce order, and awaited together. The deploys go
+    through the UDC in dependency order. Since UDC addresses are computed up front, they are all
+    executed with execute_multicalls, in multicalls of up to max_deploys_per_tx deploys. If a
+    submission fails, the exception propagates and the later multicalls are not submitted.
+
+    :param specs: The contracts to deploy. Reference other deployments with ContractRef.
+    :param contract_folder: The folder containing the contracts.
+    :param package: The package name.
+    :param account: The starknet.py account.
+    :param max_deploys_per_tx: Maximum number of deploys in one multicall.
+    :param manifest_path: If given, the address manifest is written there as JSON.
+    :param declared_classes: Cache of declared classes, checked before asking the node.
+    :return: The address manifest, mapping every deployment name to its address.
+    """
+    if max_deploys_per_tx <= 0:
+        raise ValueError("Argument max_deploys_per_tx has to be greater than 0.")
+    ordered_specs = deployment_order(specs)
+    nonce_manager = NonceManager(account.client)
+
+    contract_names = list(dict.fromkeys(spec.contract_name for spec in ordered_specs))
+    print_debug(f"Declaring contracts: {', '.join(contract_names)}")
+    # Nodes reject a nonce ahead of the account's, so the declarations are submitted one at a
+    # time, in nonce order. Only their acceptance is awaited together.
+    declare_results = []
+    for contract_name in contract_names:
+        declare_results.append(
+            await _declare_contract(
+                contract_name,
+                contract_folder,
+                package,
+                account,
+                nonce_manager=nonce_manager,
+                wait=False,
+                declared_classes=declared_classes,
+            )
+        )
+    declared = [
+        declare_result
+        for declare_result in declare_results
+        if isinstance(declare_result, DeclareResult)
+    ]
+    async with _resync_on_rejection(nonce_manager, account):
+        await wait_for_txs_acceptance(
+            [declare_result.hash for declare_result in declared], account.client
+        )
+    if declared_classes is not None:
+        for declare_result in declared:
+            declared_classes.add(account.client.url, declare_result.class_hash)
+    class_hashes = {
+        contract_name: (
+            declare_result.class_hash
+            if isinstance(declare_result, DeclareResult)
+            else int(declare_result, 16)
+        )
+        for contract_name, declare_result in zip(contract_names, declare_results)
+    }
+
+    deployer = Deployer(account_address=account.address)
+    addresses: dict[str, int] = {}
+    calls = []
+    for spec in ordered_specs:
+        deployment = deployer.create_contract_deployment(
+            class_hashes[spec.contract_name],
+            salt=spec.salt,
+            abi=get_contract_abi(spec.contract_name, contract_folder, package),
+            calldata=resolve_refs(spec.constructor_args, addresses),
+        )
+        addresses[spec.name] = deployment.address
+        calls.append(deployment.call)
+
+    await execute_multicalls(
+        calls,
+        account,
+        MulticallLimits(max_calls=max_deploys_per_tx),
+        nonce_manager=nonce_manager,
+    )
+
+    manifest = {name: to_hex(address) for name, address in addresses.items()}
+    for name, address in manifest.items():
+        print_debug(f"Deployed {name}: {address}")
+    if manifest_path is not None:
+        with open(manifest_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def _reserve_nonce(nonce_manager: NonceManager | None, account: Account):
+    """
+    Reserve the next nonce of the account with the nonce manager, if one is given.
+    Otherwise, yield None so that starknet.py fetches the nonce.
+    """
+    if nonce_manager is None:
+        return nullcontext()
+    return nonce_manager.reserve(account.address)
+
+
+@asynccontextmanager
+async def _resync_on_rejection(nonce_manager: NonceManager | None, account: Account):
+    """
+    Resync the account with the nonce manager, if one is given, when a transaction awaited in
+    the block was rejected. A reverted transaction uses its nonce, a rejected one doesn't.
+    """
+    try:
+        yield
+    except TransactionFailedError as e:
+        if nonce_manager is not None and not isinstance(e, TransactionRevertedError):
+            await nonce_manager.request_resync(account.address)
+        raise
+
+
 async def invoke_function(
-    contract: Contract, function_name: str, function_args: list | dict | None = None
-):
+    contract: Contract,
+    function_name: str,
+    function_args: list | dict | None = None,
+    nonce_manager: NonceManager | None = None,
+    wait: bool = True,
+) -> int:
     """
     Invoke a function on the given contract using starknet.py.
 
     :param contract: The contract instance to invoke the function on.
     :param function_name: The name of the function to invoke.
     :param function_args: The arguments for the function.
+    :param nonce_manager: Hands out the nonce locally, so that several transactions can be
+        submitted without waiting for each other. The sender is resynced if the awaited
+        transaction is rejected.
+    :param wait: Whether to wait for the transaction to get accepted.
+    :return: The transaction hash.
     """
     print_debug(f"Invoking function: {function_name}")
-    match function_args:
-        case dict():
-            invocation = await contract.functions[function_name].invoke_v3(
-                **function_args,
-                auto_estimate=True,
-            )
-        case list():
-            invocation = await contract.functions[function_name].invoke_v3(
-                *function_args,
-                auto_estimate=True,
-            )
-        case _:  # None
-            invocation = await contract.functions[function_name].invoke_v3(
-                auto_estimate=True,
-            )
-    await invocation.wait_for_acceptance()
-    await wait_for_tx_acceptance(invocation.hash, contract.client)
+    async with _reserve_nonce(nonce_manager, contract.account) as nonce:
+        match function_args:
+            case dict():
+                invocation = await contract.functions[function_name].invoke_v3(
+                    **function_args,
+                    auto_estimate=True,
+                    nonce=nonce,
+                )
+            case list():
+                invocation = await contract.functions[function_name].invoke_v3(
+                    *function_args,
+                    auto_estimate=True,
+                    nonce=nonce,
+                )
+            case _:  # None
+                invocation = await contract.functions[function_name].invoke_v3(
+                    auto_estimate=True,
+                    nonce=nonce,
+                )
+    if wait:
+        async with _resync_on_rejection(nonce_manager, contract.account):
+            await wait_for_tx_acceptance(invocation.hash, contract.client)
 
     print_debug(f"Function {function_name} invoked.")
+    return invocation.hash
 
 
 async def call_function(
@@ -532,6 +832,28 @@ async def call_function_with_node(
     return result
 
 
+async def call_functions_with_node(
+    node: FullNodeClient,
+    calls: list[tuple[str, str, list]],
+) -> list[list]:
+    """
+    Call many functions using a node, sending the calls as JSON-RPC batches.
+
+    :param node: The node to call the functions on.
+    :param calls: ``(contract_address, function_name, calldata)`` tuples.
+    :return: The output of every call, in the order of ``calls``.
+    """
+    batching_node = node if isinstance(node, BatchingClient) else BatchingClient(node)
+    return await asyncio.gather(
+        *(
+            call_function_with_node(
+                batching_node, contract_address, function_name, calldata
+            )
+            for contract_address, function_name, calldata in calls
+        )
+    )
+
+
 async def try_call_function(
     contract: Contract, function_name: str, function_args: list | dict | None = None
 ) -> tuple[bool, any]:
@@ -631,23 +953,154 @@ def convert_prepared_invoke_list_to_calldata(
     return calldata
 
 
-async def execute_multicall(calls: list, account: Account):
+async def execute_multicall(
+    calls: list,
+    account: Account,
+    nonce_manager: NonceManager | None = None,
+    wait: bool = True,
+) -> int:
     """
     Execute a multicall using starknet.py.
 
     :param calls: The list of calls to execute.
     :param account: The account to execute the multicall from.
+    :param nonce_manager: Hands out the nonce locally, so that several transactions can be
+        submitted without waiting for each other. The sender is resynced if the awaited
+        transaction is rejected.
+    :param wait: Whether to wait for the transaction to get accepted.
+    :return: The transaction hash.
     """
     print_debug(f"Executing multicall.")
-    transaction_response = await account.execute_v3(
-        calls=calls,
-        auto_estimate=True,
-    )
+    async with _reserve_nonce(nonce_manager, account) as nonce:
+        transaction_response = await account.execute_v3(
+            calls=calls,
+            auto_estimate=True,
+            nonce=nonce,
+        )
     print_debug(f"Transaction hash: {to_hex(transaction_response.transaction_hash)}")
-    await account.client.wait_for_tx(transaction_response.transaction_hash)
-    await wait_for_tx_acceptance(transaction_response.transaction_hash, account.client)
+    if wait:
+        async with _resync_on_rejection(nonce_manager, account):
+            await wait_for_tx_acceptance(
+                transaction_response.transaction_hash, account.client
+            )
 
     print_debug(f"Multicall executed.")
+    return transaction_response.transaction_hash
+
+
+async def pack_calls_by_l2_gas(
+    calls: list,
+    account: Account,
+    limits: MulticallLimits,
+    nonce_manager: NonceManager | None = None,
+) -> list[list]:
+    """
+    Pack calls into multicalls within ``limits``, including ``limits.max_l2_gas``.
+
+    The calls are packed by calldata length and number of calls first. The resulting multicalls
+    are estimated in one request, with consecutive nonces, so the node simulates each on the
+    state left by the previous ones. Multicalls over max_l2_gas, or that fail, are split in half
+    and all multicalls are estimated again, until each fits or holds a single call.
+
+    :param calls: The calls.
+    :param account: The account that will execute the calls.
+    :param limits: The limits of a multicall.
+    :param nonce_manager: Gives the first nonce, after the transactions in flight, without
+        reserving it. The nonce is fetched from the node if None.
+    :return: The calls of each multicall.
+    """
+    groups = pack_calls(calls, replace(limits, max_l2_gas=None))
+    if limits.max_l2_gas is None or not groups:
+        return groups
+    sender_address = to_hex(account.address)
+    if nonce_manager is not None:
+        nonce = await nonce_manager.peek(sender_address)
+    else:
+        nonce = await get_nonce(sender_address, account.client)
+    while True:
+        txs = [
+            await generate_invoke_tx(
+                convert_prepared_invoke_list_to_calldata(group),
+                sender_address,
+                account.client,
+                nonce=nonce + i,
+            )
+            for i, group in enumerate(groups)
+        ]
+        try:
+            fees = await account.client.estimate_fee(txs, skip_validate=True)
+        except ClientError as e:
+            index = (
+                e.data.get("transaction_index") if isinstance(e.data, dict) else None
+            )
+            if index is None:
+                raise
+            if len(groups[index]) == 1:
+                call_index = sum(len(group) for group in groups[:index])
+                raise ValueError(f"Call {call_index} fails: {e.message}") from e
+            groups = split_groups(groups, {index})
+            continue
+        over_limit = {
+            i
+            for i, (group, fee) in enumerate(zip(groups, fees))
+            if fee.l2_gas_consumed > limits.max_l2_gas and len(group) > 1
+        }
+        if not over_limit:
+            return groups
+        groups = split_groups(groups, over_limit)
+
+
+async def execute_multicalls(
+    calls: list,
+    account: Account,
+    limits: MulticallLimits = MulticallLimits(),
+    nonce_manager: NonceManager | None = None,
+    wait: bool = True,
+) -> list[int]:
+    """
+    Execute many calls in as few multicalls as fit ``limits``, submitting them back-to-back.
+    The calls execute in order, but each multicall succeeds or reverts on its own.
+
+    :param calls: The calls to execute.
+    :param account: The account to execute the multicalls from.
+    :param limits: The limits of a multicall. Setting max_l2_gas estimates the multicalls
+        first, splitting those over it.
+    :param nonce_manager: Reserves the nonces, and gives the first nonce of the gas estimate.
+        A new one is used if None. If a multicall fails to be estimated or submitted, the nonces
+        of the multicalls that weren't submitted are handed back. The sender is resynced if an
+        awaited multicall is rejected.
+    :param wait: Whether to wait for the transactions to get accepted.
+    :return: The transaction hashes, in submission order.
+    """
+    if nonce_manager is None:
+        nonce_manager = NonceManager(account.client)
+    groups = await pack_calls_by_l2_gas(calls, account, limits, nonce_manager)
+    print_debug(f"Executing {len(calls)} calls in {len(groups)} multicalls.")
+    if not groups:
+        return []
+    sender_address = to_hex(account.address)
+    tx_hashes = []
+    async with nonce_manager.reserve_batch(sender_address, len(groups)) as batch:
+        # Estimating each multicall on submission would miss the earlier, not yet accepted ones.
+        txs = await generate_invoke_txs_with_fee(
+            [convert_prepared_invoke_list_to_calldata(group) for group in groups],
+            sender_address,
+            account.client,
+            nonce=batch.nonces[0],
+        )
+        for group, tx in zip(groups, txs):
+            transaction_response = await account.execute_v3(
+                calls=group, resource_bounds=tx.resource_bounds, nonce=tx.nonce
+            )
+            batch.submitted += 1
+            print_debug(
+                f"Multicall hash: {to_hex(transaction_response.transaction_hash)}"
+            )
+            tx_hashes.append(transaction_response.transaction_hash)
+    if wait:
+        async with _resync_on_rejection(nonce_manager, account):
+            await wait_for_txs_acceptance(tx_hashes, account.client)
+    return tx_hashes
 
 
 # async def get_transaction_hash(
@@ -666,51 +1119,293 @@ async def execute_multicall(calls: list, account: Account):
 #     return to_hex(tx_hash)
 
 
-async def fetch_events(
+async def _events_query(
     contract_address: str,
-    event_name: str,
+    event_name: str | list[str],
     node: FullNodeClient,
-    from_block: int = 0,
-    to_block: int | str = "latest",
-    chunk_size: int = FETCH_EVENTS_CHUNK_SIZE,
-) -> list:
+    to_block: int | str,
+) -> tuple[int, Callable[..., Awaitable], Callable[[int, int], Awaitable[list]]]:
     """
-    Fetch all events from the given contract address and event name.
+    Resolve to_block and build the getEvents requests of the given events.
 
     :param contract_address: The address of the contract to fetch events from.
-    :param event_name: The name of the event to fetch.
+    :param event_name: The name of the event to fetch, or a list of names to fetch in one pass.
     :param node: The node to fetch events from.
-    :param from_block: The block number to start fetching events from.
-    :param to_block: The block number to stop fetching events at.
-    :param chunk_size: Maximum blocks to fetch events from in one request.
-    :return: The events.
+    :param to_block: The block number to stop fetching events at, or "latest".
+    :return: The last block number, a coroutine fetching one page of ``(chunk_start, chunk_end,
+        continuation_token, page_size)``, and one fetching all events of ``(chunk_start,
+        chunk_end)``.
     """
-    print_debug(f"Fetching events: {event_name}.")
     # Convert to block to a block number.
     if isinstance(to_block, str):
         if to_block != "latest":
             raise ValueError("Invalid to_block value. Must be an integer or 'latest'.")
         to_block = await node.get_block_number()
         print_debug(f"Latest block: {to_block}")
-    events = []
-    for chunk_start in range(from_block, to_block + 1, chunk_size):
-        chunk_end = min(chunk_start + chunk_size - 1, to_block)
+    event_names = [event_name] if isinstance(event_name, str) else event_name
+    # Keys in the same position are OR-ed, so one filter matches all the events.
+    keys = [[hex(get_selector_from_name(name)) for name in event_names]]
+
+    async def fetch_page(
+        chunk_start: int,
+        chunk_end: int,
+        continuation_token: str | None = None,
+        page_size: int = EVENTS_PAGE_SIZE,
+    ):
+        return await node.get_events(
+            address=contract_address,
+            keys=keys,
+            from_block_number=chunk_start,
+            to_block_number=chunk_end,
+            continuation_token=continuation_token,
+            chunk_size=page_size,
+        )
+
+    async def fetch_chunk(chunk_start: int, chunk_end: int) -> list:
         resp = await node.get_events(
             address=contract_address,
-            keys=[[hex(get_selector_from_name(event_name))]],
+            keys=keys,
             from_block_number=chunk_start,
             to_block_number=chunk_end,
             follow_continuation_token=True,
+            chunk_size=EVENTS_PAGE_SIZE,
         )
         print_debug(
             f"Fetched {len(resp.events)} events from {chunk_start} to {chunk_end}."
         )
-        events.extend(resp.events)
+        return resp.events
+
+    return to_block, fetch_page, fetch_chunk
+
+
+async def fetch_events(
+    contract_address: str,
+    event_name: str | list[str],
+    node: FullNodeClient,
+    from_block: int = 0,
+    to_block: int | str = "latest",
+    chunk_size: int = FETCH_EVENTS_CHUNK_SIZE,
+    max_concurrency: int = 1,
+    chunk_policy: AdaptiveChunkPolicy | None = None,
+) -> list:
+    """
+    Fetch all events from the given contract address and event name.
+
+    :param contract_address: The address of the contract to fetch events from.
+    :param event_name: The name of the event to fetch, or a list of names to fetch in one pass.
+    :param node: The node to fetch events from.
+    :param from_block: The block number to start fetching events from.
+    :param to_block: The block number to stop fetching events at.
+    :param chunk_size: Maximum blocks to fetch events from in one request.
+    :param max_concurrency: Maximum number of chunks fetched concurrently.
+    :param chunk_policy: If given, scan sequentially with a window that adapts to the observed
+        event density and latency instead of the fixed chunk_size.
+    :return: The events, ordered by block.
+    """
+    print_debug(f"Fetching events: {event_name}.")
+    if chunk_policy is not None and max_concurrency != 1:
+        raise ValueError(
+            "Adaptive chunk sizing can't be combined with max_concurrency."
+        )
+    to_block, _, fetch_chunk = await _events_query(
+        contract_address, event_name, node, to_block
+    )
+    if chunk_policy is not None:
+        events = await scan_adaptive(fetch_chunk, from_block, to_block, chunk_policy)
+    else:
+        events = await scan_block_ranges(
+            fetch_chunk,
+            split_block_range(from_block, to_block, chunk_size),
+            max_concurrency=max_concurrency,
+        )
     print_debug("Fetched all events.")
     print_debug(f"Fetched {len(events)} events from {from_block} to {to_block}.")
     return events
 
 
+async def fetch_events_by_name(
+    contract_address: str,
+    event_names: list[str],
+    node: FullNodeClient,
+    from_block: int = 0,
+    to_block: int | str = "latest",
+    chunk_size: int = FETCH_EVENTS_CHUNK_SIZE,
+    max_concurrency: int = 1,
+    chunk_policy: AdaptiveChunkPolicy | None = None,
+) -> dict[str, list]:
+    """
+    Fetch the events of several event names in a single scan and split them by name.
+
+    :param contract_address: The address of the contract to fetch events from.
+    :param event_names: The names of the events to fetch.
+    :param node: The node to fetch events from.
+    :param from_block: The block number to start fetching events from.
+    :param to_block: The block number to stop fetching events at.
+    :param chunk_size: Maximum blocks to fetch events from in one request.
+    :param max_concurrency: Maximum number of chunks fetched concurrently.
+    :param chunk_policy: If given, scan with an adaptive window (see fetch_events).
+    :return: A dictionary from event name to its events, ordered by block.
+    """
+    events = await fetch_events(
+        contract_address,
+        event_names,
+        node,
+        from_block=from_block,
+        to_block=to_block,
+        chunk_size=chunk_size,
+        max_concurrency=max_concurrency,
+        chunk_policy=chunk_policy,
+    )
+    events_by_selector = group_events_by_selector(
+        events, [get_selector_from_name(name) for name in event_names]
+    )
+    return {
+        name: events_by_selector[get_selector_from_name(name)] for name in event_names
+    }
+
+
+async def stream_events(
+    contract_address: str,
+    event_name: str | list[str],
+    node: FullNodeClient,
+    from_block: int = 0,
+    to_block: int | str = "latest",
+    chunk_size: int = FETCH_EVENTS_CHUNK_SIZE,
+    max_concurrency: int = 1,
+    max_buffered_pages: int = 2,
+) -> AsyncIterator[list]:
+    """
+    Yield the events from the given contract address and event name as they arrive.
+
+    With max_concurrency=1, the events are yielded one getEvents page at a time and at most
+    max_buffered_pages pages are fetched ahead of the consumer. With a higher max_concurrency,
+    whole chunks are yielded and at most max_concurrency chunks are fetched ahead.
+
+    Usage:
+        async for events in stream_events(address, "Deposit", node):
+            process(events)
+
+    :param contract_address: The address of the contract to fetch events from.
+    :param event_name: The name of the event to fetch, or a list of names to fetch in one pass.
+    :param node: The node to fetch events from.
+    :param from_block: The block number to start fetching events from.
+    :param to_block: The block number to stop fetching events at.
+    :param chunk_size: Maximum blocks to fetch events from in one request.
+    :param max_concurrency: Maximum number of chunks fetched concurrently.
+    :param max_buffered_pages: Maximum number of pages fetched ahead of the consumer.
+    :return: An async iterator over lists of events, ordered by block.
+    """
+    print_debug(f"Streaming events: {event_name}.")
+    to_block, fetch_page, fetch_chunk = await _events_query(
+        contract_address, event_name, node, to_block
+    )
+    block_ranges = split_block_range(from_block, to_block, chunk_size)
+
+    async def iter_pages() -> AsyncIterator[list]:
+        for chunk_start, chunk_end in block_ranges:
+            continuation_token = None
+            while True:
+                resp = await fetch_page(chunk_start, chunk_end, continuation_token)
+                if len(resp.events) > 0:
+                    yield resp.events
+                continuation_token = resp.continuation_token
+                if continuation_token is None:
+                    break
+
+    if max_concurrency == 1:
+        pages = prefetch(iter_pages(), max_buffered=max_buffered_pages)
+    else:
+        pages = stream_block_ranges(fetch_chunk, block_ranges, max_concurrency)
+    async for events in pages:
+        if len(events) > 0:
+            yield events
+
+
+async def fetch_events_cached(
+    contract_address: str,
+    event_name: str,
+    node: FullNodeClient,
+    store: EventStore,
+    from_block: int = 0,
+    to_block: int | str = "latest",
+    chunk_size: int = FETCH_EVENTS_CHUNK_SIZE,
+    max_concurrency: int = 1,
+    finality_margin: int = EVENT_STORE_FINALITY_MARGIN,
+) -> list:
+    """
+    Fetch all events from the given contract address and event name, reusing the events stored
+    by previous runs.
+
+    Only blocks after the last stored block are fetched. Blocks within finality_margin of the
+    latest block are fetched on every call and never stored, so a reorg can't corrupt the store.
+
+    :param contract_address: The address of the contract to fetch events from.
+    :param event_name: The name of the event to fetch.
+    :param node: The node to fetch events from.
+    :param store: The event store to read from and update.
+    :param from_block: The block number to start fetching events from.
+    :param to_block: The block number to stop fetching events at.
+    :param chunk_size: Maximum blocks to fetch events from in one request.
+    :param max_concurrency: Maximum number of chunks fetched concurrently.
+    :param finality_margin: Number of most recent blocks that are not stored.
+    :return: The events, ordered by block.
+    """
+    if finality_margin < 0:
+        raise ValueError("Argument finality_margin has to be non-negative.")
+    latest_block = await node.get_block_number()
+    if isinstance(to_block, str):
+        if to_block != "latest":
+            raise ValueError("Invalid to_block value. Must be an integer or 'latest'.")
+        to_block = latest_block
+    chain = await node.get_chain_id()
+    address = to_int(hexstr=contract_address)
+    selector = get_selector_from_name(event_name)
+    final_block = latest_block - finality_margin
+
+    record = store.load(chain, address, selector)
+    if record is None or record.from_block > from_block:
+        record = EventStoreRecord(
+            from_block=from_block, scanned_to_block=from_block - 1
+        )
+
+    # Extend the stored range up to the last final block.
+    store_to_block = min(to_block, final_block)
+    if store_to_block > record.scanned_to_block:
+        new_events = await fetch_events(
+            contract_address,
+            event_name,
+            node,
+            from_block=record.scanned_to_block + 1,
+            to_block=store_to_block,
+            chunk_size=chunk_size,
+            max_concurrency=max_concurrency,
+        )
+        record.events.extend(asdict(event) for event in new_events)
+        record.scanned_to_block = store_to_block
+        store.save(chain, address, selector, record)
+        print_debug(f"Stored {len(new_events)} new events up to {store_to_block}.")
+
+    events = [
+        EmittedEvent(**event)
+        for event in record.events
+        if from_block <= event["block_number"] <= to_block
+    ]
+    # Unfinalized tail.
+    if to_block > record.scanned_to_block:
+        events.extend(
+            await fetch_events(
+                contract_address,
+                event_name,
+                node,
+                from_block=max(record.scanned_to_block + 1, from_block),
+                to_block=to_block,
+                chunk_size=chunk_size,
+                max_concurrency=max_concurrency,
+            )
+        )
+    return events
+
+
 async def fetch_last_event(
     contract_address: str,
     event_name: str,
@@ -718,6 +1413,7 @@ async def fetch_last_event(
     from_block: int = 0,
     to_block: int | str = "latest",
     chunk_size: int = FETCH_EVENTS_CHUNK_SIZE,
+    bisect: bool = False,
 ):
     """
     Fetch the last event of a given event name from a given contract address.
@@ -728,30 +1424,33 @@ async def fetch_last_event(
     :param from_block: The block number to start fetching events from.
     :param to_block: The block number to stop fetching events at.
     :param chunk_size: Maximum blocks to fetch events from in one request.
+    :param bisect: If True, probe exponentially growing windows backwards and bisect the first
+        non-empty one, instead of scanning chunk by chunk. Much cheaper for old events.
     :return: The last event.
     """
     print_debug(f"Fetching last event of {event_name}.")
-    # Convert to block to a block number.
-    if isinstance(to_block, str):
-        if to_block != "latest":
-            raise ValueError("Invalid to_block value. Must be an integer or 'latest'.")
-        to_block = await node.get_block_number()
-        print_debug(f"Latest block: {to_block}")
-    for chunk_end in range(to_block, from_block + chunk_size, -chunk_size):
-        chunk_start = max(chunk_end - chunk_size, from_block)
-        resp = await node.get_events(
-            address=contract_address,
-            keys=[[hex(get_selector_from_name(event_name))]],
-            from_block_number=chunk_start,
-            to_block_number=chunk_end,
-            follow_continuation_token=True,
-        )
-        print_debug(
-            f"Fetched {len(resp.events)} events from {chunk_start} to {chunk_end}."
+    to_block, fetch_page, fetch_chunk = await _events_query(
+        contract_address, event_name, node, to_block
+    )
+
+    async def has_events(chunk_start: int, chunk_end: int) -> bool:
+        continuation_token = None
+        while True:
+            # Providers may return empty pages with a continuation token.
+            resp = await fetch_page(
+                chunk_start, chunk_end, continuation_token, page_size=1
+            )
+            if len(resp.events) > 0:
+                return True
+            if resp.continuation_token is None:
+                return False
+            continuation_token = resp.continuation_token
+
+    if bisect:
+        return await bisect_last_event(
+            fetch_chunk, has_events, from_block, to_block, chunk_size
         )
-        if len(resp.events) > 0:
-            return resp.events[-1]
-    return None
+    return await find_last_event(fetch_chunk, from_block, to_block, chunk_size)
 
 
 def prepare_upgrade_calls(
@@ -836,6 +1535,7 @@ async def generate_invoke_tx(
     nonce: int | None = None,
     version: int = 3,
     account_deployment_data: list | None = None,
+    nonce_manager: NonceManager | None = None,
 ) -> InvokeV3:
     """
     Generate an invoke transaction. Set the resource bounds to 0.
@@ -846,8 +1546,12 @@ async def generate_invoke_tx(
     :param nonce: The nonce for the transaction.
     :param version: The version of the transaction.
     :param account_deployment_data: The account deployment data for the transaction.
+    :param nonce_manager: Hands out the nonce if none is given, instead of fetching it.
+        Resync it if the transaction isn't submitted.
     :return: An invoke transaction.
     """
+    if nonce is None and nonce_manager is not None:
+        nonce = await nonce_manager.next_nonce(sender_address)
     if nonce is None:
         nonce = await get_nonce(sender_address, node)
     if account_deployment_data is None:
@@ -865,33 +1569,29 @@ async def generate_invoke_tx(
         sender_address=to_int(hexstr=sender_address),
         version=version,
         account_deployment_data=account_deployment_data,
+        tip=0,
     )
     return tx
 
 
-async def estimate_fee(tx: InvokeV3, node: FullNodeClient) -> ResourceBoundsMapping:
+async def estimate_fee(
+    tx: InvokeV3,
+    node: FullNodeClient,
+    margins: FeeMarginPolicy | None = None,
+    fee_cache: FeeEstimateCache | None = None,
+) -> ResourceBoundsMapping:
     """
     Estimate the fee for an invoke transaction and return the needed resource bounds.
 
     :param tx: The invoke transaction to estimate the fee for.
     :param node: The node to use.
-    :return: The needed resource bounds(estimated * UNIVERSAL_GAS_MODEFIER).
+    :param margins: The margins applied to the estimate. Defaults to multiplying everything by
+        UNIVERSAL_GAS_MODEFIER.
+    :param fee_cache: Earlier estimates, reused for an unchanged transaction.
+    :return: The needed resource bounds.
     """
-    fee = await node.estimate_fee(tx, skip_validate=True)
-    return ResourceBoundsMapping(
-        l1_gas=ResourceBounds(
-            max_amount=fee.l1_gas_consumed * UNIVERSAL_GAS_MODEFIER,
-            max_price_per_unit=fee.l1_gas_price * UNIVERSAL_GAS_MODEFIER,
-        ),
-        l1_data_gas=ResourceBounds(
-            max_amount=fee.l1_data_gas_consumed * UNIVERSAL_GAS_MODEFIER,
-            max_price_per_unit=fee.l1_data_gas_price * UNIVERSAL_GAS_MODEFIER,
-        ),
-        l2_gas=ResourceBounds(
-            max_amount=fee.l2_gas_consumed * UNIVERSAL_GAS_MODEFIER,
-            max_price_per_unit=fee.l2_gas_price * UNIVERSAL_GAS_MODEFIER,
-        ),
-    )
+    (resource_bounds,) = await estimate_resource_bounds(node, [tx], margins, fee_cache)
+    return resource_bounds
 
 
 async def generate_invoke_tx_with_fee(
@@ -901,6 +1601,9 @@ async def generate_invoke_tx_with_fee(
     nonce: int | None = None,
     version: int = 3,
     account_deployment_data: list | None = None,
+    nonce_manager: NonceManager | None = None,
+    margins: FeeMarginPolicy | None = None,
+    fee_cache: FeeEstimateCache | None = None,
 ) -> InvokeV3:
     """
     Generate an invoke transaction with estimated fee.
@@ -911,21 +1614,85 @@ async def generate_invoke_tx_with_fee(
     :param nonce: The nonce for the transaction.
     :param version: The version of the transaction.
     :param account_deployment_data: The account deployment data for the transaction.
+    :param nonce_manager: Hands out the nonce if none is given, instead of fetching it.
+        Resync it if the transaction isn't submitted.
+    :param margins: The margins applied to the fee estimate. Defaults to multiplying everything
+        by UNIVERSAL_GAS_MODEFIER.
+    :param fee_cache: Earlier estimates, reused for an unchanged transaction.
     :return: An invoke transaction with estimated fee.
     """
-    tx = await generate_invoke_tx(
-        calldata,
+    (tx,) = await generate_invoke_txs_with_fee(
+        [calldata],
         sender_address,
         node,
         nonce=nonce,
         version=version,
         account_deployment_data=account_deployment_data,
+        nonce_manager=nonce_manager,
+        margins=margins,
+        fee_cache=fee_cache,
     )
-    resource_bounds = await estimate_fee(tx, node)
-    tx = replace(tx, resource_bounds=resource_bounds)
     return tx
 
 
+async def generate_invoke_txs_with_fee(
+    calldatas: list[list],
+    sender_address: str,
+    node: FullNodeClient,
+    nonce: int | None = None,
+    version: int = 3,
+    account_deployment_data: list | None = None,
+    nonce_manager: NonceManager | None = None,
+    margins: FeeMarginPolicy | None = None,
+    fee_cache: FeeEstimateCache | None = None,
+) -> list[InvokeV3]:
+    """
+    Generate invoke transactions with consecutive nonces, estimating their fees in one request.
+
+    :param calldatas: The calldata of each transaction.
+    :param sender_address: The address of the sender.
+    :param node: A node to use.
+    :param nonce: The nonce of the first transaction.
+    :param version: The version of the transactions.
+    :param account_deployment_data: The account deployment data for the transactions.
+    :param nonce_manager: Reserves the nonces as one batch if none is given, instead of
+        fetching the first. They are handed back if the estimate fails. Resync it if the
+        transactions aren't submitted.
+    :param margins: The margins applied to the fee estimates. Defaults to multiplying
+        everything by UNIVERSAL_GAS_MODEFIER.
+    :param fee_cache: Earlier estimates, reused if they hold all the transactions.
+    :return: The invoke transactions with estimated fees, in nonce order.
+    """
+    if nonce is None and nonce_manager is not None and calldatas:
+        async with nonce_manager.reserve_batch(sender_address, len(calldatas)) as batch:
+            return await generate_invoke_txs_with_fee(
+                calldatas,
+                sender_address,
+                node,
+                nonce=batch.nonces[0],
+                version=version,
+                account_deployment_data=account_deployment_data,
+                margins=margins,
+                fee_cache=fee_cache,
+            )
+    txs = []
+    for calldata in calldatas:
+        tx = await generate_invoke_tx(
+            calldata,
+            sender_address,
+            node,
+            nonce=nonce,
+            version=version,
+            account_deployment_data=account_deployment_data,
+        )
+        txs.append(tx)
+        nonce = tx.nonce + 1
+    resource_bounds = await estimate_resource_bounds(node, txs, margins, fee_cache)
+    return [
+        replace(tx, resource_bounds=bounds) for tx, bounds in zip(txs, resource_bounds)
+    ]
+
+
 def _extract_signature_from_string(signature: str) -> list[int]:
     """
     Extracts signature (r, s) from a string.
@@ -1006,6 +1773,7 @@ def json_to_invoke_v3(json: dict) -> InvokeV3:
         sender_address=to_int(hexstr=json[TX_SENDER_ADDRESS]),
         version=json[TX_VERSION],
         account_deployment_data=json[TX_ACCOUNT_DEPLOYMENT_DATA],
+        tip=0,
     )
 
 
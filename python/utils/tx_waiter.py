@@ -0,0 +1,404 @@
+"""
+Waiting for Starknet transactions to be accepted.
+
+``wait_for_transaction`` polls ``starknet_getTransactionStatus`` with a short initial interval that
+backs off, so fast inclusions are noticed within a fraction of a second while long waits issue few
+requests. When a WebSocket URL is given, it subscribes to ``starknet_subscribeTransactionStatus``
+instead and falls back to polling if the node doesn't support subscriptions.
+``TransactionTracker`` waits for many transactions with one polling loop, checking all pending
+statuses in a single JSON-RPC batch per round.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+
+import aiohttp
+from starknet_py.net.client_errors import ClientError
+from starknet_py.net.client_utils import _to_rpc_felt
+from starknet_py.net.full_node_client import FullNodeClient
+from starknet_py.transaction_errors import (
+    TransactionFailedError,
+    TransactionNotReceivedError,
+    TransactionRevertedError,
+)
+
+try:
+    from .rpc_batch import BatchingClient
+except ImportError:  # Running as a standalone script.
+    from rpc_batch import BatchingClient
+
+logger = logging.getLogger(__name__)
+
+ACCEPTED_STATUSES = ("ACCEPTED_ON_L2", "ACCEPTED_ON_L1")
+# Returned by nodes for transactions not yet in their mempool.
+TXN_HASH_NOT_FOUND = 29
+
+
+@dataclass
+class PollingBackoff:
+    """
+    Poll intervals start at ``initial_interval`` seconds and grow by ``multiplier`` up to
+    ``max_interval``.
+    """
+
+    initial_interval: float = 0.25
+    max_interval: float = 2.0
+    multiplier: float = 1.5
+
+    def intervals(self):
+        if not 0 < self.initial_interval <= self.max_interval:
+            raise ValueError(
+                "Invalid backoff: 0 < initial_interval <= max_interval must hold."
+            )
+        interval = self.initial_interval
+        while True:
+            yield interval
+            interval = min(interval * self.multiplier, self.max_interval)
+
+
+def _value(status) -> str | None:
+    return getattr(status, "value", status)
+
+
+def check_transaction_status(
+    finality_status, execution_status, failure_reason: str | None = None
+) -> bool:
+    """
+    Return whether a transaction with the given status is accepted.
+
+    :raises TransactionRevertedError: If the transaction was accepted but reverted.
+    :raises TransactionFailedError: If the transaction was rejected.
+    """
+    finality_status = _value(finality_status)
+    if finality_status == "REJECTED":
+        raise TransactionFailedError(failure_reason or "Transaction rejected.")
+    if finality_status in ACCEPTED_STATUSES:
+        if _value(execution_status) == "REVERTED":
+            raise TransactionRevertedError(failure_reason)
+        return True
+    return False
+
+
+async def poll_transaction(
+    node: FullNodeClient,
+    tx_hash: int | str,
+    backoff: PollingBackoff | None = None,
+    max_checks: int | None = None,
+    timeout: float | None = None,
+) -> int:
+    """
+    Poll the status of a transaction until it is accepted.
+
+    :param node: The node to poll.
+    :param tx_hash: The hash of the transaction.
+    :param backoff: The poll intervals. Defaults to ``PollingBackoff()``.
+    :param max_checks: Maximum number of status requests.
+    :param timeout: Maximum number of seconds to wait.
+    :return: The number of status requests made.
+    """
+    backoff = backoff or PollingBackoff()
+    deadline = None if timeout is None else time.monotonic() + timeout
+    received = False
+    checks = 0
+    for interval in backoff.intervals():
+        checks += 1
+        try:
+            status = await node.get_transaction_status(tx_hash=tx_hash)
+        except ClientError as e:
+            if e.code != TXN_HASH_NOT_FOUND:
+                raise
+        else:
+            received = True
+            if check_transaction_status(
+                status.finality_status, status.execution_status, status.failure_reason
+            ):
+                return checks
+        out_of_checks = max_checks is not None and checks >= max_checks
+        out_of_time = deadline is not None and time.monotonic() + interval > deadline
+        if out_of_checks or out_of_time:
+            if not received:
+                raise TransactionNotReceivedError()
+            raise TimeoutError(f"Transaction {_to_rpc_felt(tx_hash)} not accepted.")
+        await asyncio.sleep(interval)
+    raise AssertionError("unreachable")
+
+
+async def subscribe_transaction(
+    ws_url: str,
+    tx_hash: int | str,
+    timeout: float | None = None,
+    session: aiohttp.ClientSession | None = None,
+):
+    """
+    Wait for a transaction to be accepted using ``starknet_subscribeTransactionStatus``.
+
+    :param ws_url: The WebSocket RPC URL of the node.
+    :param tx_hash: The hash of the transaction.
+    :param timeout: Maximum number of seconds to wait.
+    :param session: The session to connect with. A new session is opened if None.
+    """
+    if session is None:
+        async with aiohttp.ClientSession() as session:
+            return await subscribe_transaction(ws_url, tx_hash, timeout, session)
+
+    async def _wait():
+        async with session.ws_connect(ws_url) as ws:
+            await ws.send_json(
+                {
+                    "jsonrpc": "2.0",
+                    "id": 0,
+                    "method": "starknet_subscribeTransactionStatus",
+                    "params": {"transaction_hash": _to_rpc_felt(tx_hash)},
+                }
+            )
+            async for message in ws:
+                if message.type != aiohttp.WSMsgType.TEXT:
+                    break
+                data = message.json()
+                if "error" in data:
+                    raise ClientError(
+                        code=data["error"]["code"], message=data["error"]["message"]
+                    )
+                if data.get("method") != "starknet_subscriptionTransactionStatus":
+                    continue
+                status = data["params"]["result"]["status"]
+                if check_transaction_status(
+                    status.get("finality_status"),
+                    status.get("execution_status"),
+                    status.get("failure_reason"),
+                ):
+                    return
+            raise ConnectionError("Transaction status subscription closed.")
+
+    await asyncio.wait_for(_wait(), timeout=timeout)
+
+
+async def wait_for_transaction(
+    node: FullNodeClient,
+    tx_hash: int | str,
+    backoff: PollingBackoff | None = None,
+    max_checks: int | None = None,
+    timeout: float | None = None,
+    ws_url: str | None = None,
+):
+    """
+    Wait for a transaction to be accepted, by subscription if ``ws_url`` is given and by
+    polling otherwise.
+
+    :param node: The node to poll.
+    :param tx_hash: The hash of the transaction.
+    :param backoff: The poll intervals. Defaults to ``PollingBackoff()``.
+    :param max_checks: Maximum number of status requests when polling.
+    :param timeout: Maximum number of seconds to wait.
+    :param ws_url: The WebSocket RPC URL of the node, if it supports subscriptions.
+    :raises TransactionRevertedError: If the transaction reverted.
+    :raises TransactionFailedError: If the transaction was rejected.
+    """
+    if ws_url is not None:
+        started_at = time.monotonic()
+        try:
+            await subscribe_transaction(ws_url, tx_hash, timeout)
+            return
+        except TransactionFailedError:
+            raise
+        except Exception as e:
+            if timeout is not None and time.monotonic() - started_at >= timeout:
+                raise
+            logger.debug(
+                "Transaction status subscription failed (%r); polling instead.", e
+            )
+        if timeout is not None:
+            timeout = max(timeout - (time.monotonic() - started_at), 0)
+    await poll_transaction(node, tx_hash, backoff, max_checks, timeout)
+
+
+@dataclass
+class _TrackedTransaction:
+    future: asyncio.Future
+    deadline: float | None
+    checks: int = 0
+    received: bool = False
+
+
+class TransactionTracker:
+    """
+    Waits for many transactions with a single polling loop.
+
+    Every round checks the status of all pending transactions concurrently; with a
+    ``BatchingClient`` (the default for clients that support it) the checks go out as one
+    JSON-RPC batch, so a round costs about one request however many transactions are tracked.
+    The poll interval backs off as in ``poll_transaction`` and is reset whenever a transaction
+    is added.
+    """
+
+    def __init__(
+        self,
+        node: FullNodeClient,
+        backoff: PollingBackoff | None = None,
+        max_checks: int | None = None,
+        timeout: float | None = None,
+        batch: bool = True,
+    ):
+        """
+        :param node: The node to poll.
+        :param backoff: The poll intervals. Defaults to ``PollingBackoff()``.
+        :param max_checks: Maximum number of status requests per transaction.
+        :param timeout: Maximum number of seconds to wait for each transaction.
+        :param batch: Whether to send the checks of a round as one JSON-RPC batch.
+        """
+        if batch and hasattr(node, "_client") and not isinstance(node, BatchingClient):
+            node = BatchingClient(node)
+        self.node = node
+        self.backoff = backoff or PollingBackoff()
+        self.max_checks = max_checks
+        self.timeout = timeout
+        self.rounds = 0
+        self._pending: dict[int, _TrackedTransaction] = {}
+        self._added = asyncio.Event()
+        self._loop_task: asyncio.Task | None = None
+
+    def track(self, tx_hash: int | str) -> asyncio.Future:
+        """
+        Start tracking a transaction.
+
+        :param tx_hash: The hash of the transaction.
+        :return: A future resolved when the transaction is accepted, or failed with
+            ``TransactionRevertedError``, ``TransactionFailedError``,
+            ``TransactionNotReceivedError`` or ``TimeoutError``.
+        """
+        tx_hash = int(str(tx_hash), 0) if isinstance(tx_hash, str) else tx_hash
+        tracked = self._pending.get(tx_hash)
+        if tracked is not None:
+            return tracked.future
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        future = asyncio.get_running_loop().create_future()
+        self._pending[tx_hash] = _TrackedTransaction(future, deadline)
+        self._added.set()
+        if self._loop_task is None or self._loop_task.done():
+            self._loop_task = asyncio.ensure_future(self._poll_loop())
+        return future
+
+    def untrack(self, tx_hash: int | str):
+        """
+        Stop tracking a transaction and cancel its future.
+
+        :param tx_hash: The hash of the transaction.
+        """
+        tx_hash = int(str(tx_hash), 0) if isinstance(tx_hash, str) else tx_hash
+        tracked = self._pending.pop(tx_hash, None)
+        if tracked is not None:
+            tracked.future.cancel()
+
+    async def wait(self, tx_hashes: list[int | str], return_exceptions: bool = False):
+        """
+        Wait for all the given transactions. When the wait ends early (a failure without
+        ``return_exceptions``, or cancellation), the transactions still pending are untracked.
+
+        :param tx_hashes: The hashes of the transactions.
+        :param return_exceptions: Return failures in the result list instead of raising the
+            first one.
+        :return: None for every accepted transaction, or its exception.
+        """
+        futures = [self.track(tx_hash) for tx_hash in tx_hashes]
+        try:
+            return await asyncio.gather(*futures, return_exceptions=return_exceptions)
+        finally:
+            for tx_hash, future in zip(tx_hashes, futures):
+                if not future.done():
+                    self.untrack(tx_hash)
+
+    async def _check(self, tx_hash: int, tracked: _TrackedTransaction):
+        tracked.checks += 1
+        try:
+            status = await self.node.get_transaction_status(tx_hash=tx_hash)
+            tracked.received = True
+            accepted = check_transaction_status(
+                status.finality_status, status.execution_status, status.failure_reason
+            )
+        except ClientError as e:
+            if e.code != TXN_HASH_NOT_FOUND:
+                return self._resolve(tx_hash, tracked, error=e)
+            accepted = False
+        except Exception as e:
+            return self._resolve(tx_hash, tracked, error=e)
+        if accepted:
+            return self._resolve(tx_hash, tracked)
+
+        out_of_checks = (
+            self.max_checks is not None and tracked.checks >= self.max_checks
+        )
+        out_of_time = (
+            tracked.deadline is not None and time.monotonic() > tracked.deadline
+        )
+        if out_of_checks or out_of_time:
+            self._resolve(
+                tx_hash,
+                tracked,
+                error=(
+                    TimeoutError(f"Transaction {_to_rpc_felt(tx_hash)} not accepted.")
+                    if tracked.received
+                    else TransactionNotReceivedError()
+                ),
+            )
+
+    def _resolve(
+        self,
+        tx_hash: int,
+        tracked: _TrackedTransaction,
+        error: BaseException | None = None,
+    ):
+        # The transaction may have been untracked while its status was being checked.
+        if self._pending.get(tx_hash) is tracked:
+            del self._pending[tx_hash]
+        if tracked.future.done():
+            return
+        if error is None:
+            tracked.future.set_result(None)
+        else:
+            tracked.future.set_exception(error)
+
+    async def _poll_loop(self):
+        intervals = self.backoff.intervals()
+        while self._pending:
+            self._added.clear()
+            self.rounds += 1
+            await asyncio.gather(
+                *(
+                    self._check(tx_hash, tracked)
+                    for tx_hash, tracked in list(self._pending.items())
+                )
+            )
+            if not self._pending:
+                return
+            try:
+                await asyncio.wait_for(self._added.wait(), timeout=next(intervals))
+                # New transactions should be noticed quickly: restart the backoff.
+                intervals = self.backoff.intervals()
+            except asyncio.TimeoutError:
+                pass
+
+
+async def wait_for_transactions(
+    node: FullNodeClient,
+    tx_hashes: list[int | str],
+    backoff: PollingBackoff | None = None,
+    max_checks: int | None = None,
+    timeout: float | None = None,
+    return_exceptions: bool = False,
+) -> list:
+    """
+    Wait for many transactions to be accepted with one ``TransactionTracker``.
+
+    :param node: The node to poll.
+    :param tx_hashes: The hashes of the transactions.
+    :param backoff: The poll intervals. Defaults to ``PollingBackoff()``.
+    :param max_checks: Maximum number of status requests per transaction.
+    :param timeout: Maximum number of seconds to wait for each transaction.
+    :param return_exceptions: Return failures in the result list instead of raising the
+        first one.
+    :return: None for every accepted transaction, or its exception.
+    """
+    tracker = TransactionTracker(node, backoff, max_checks, timeout)
+    return await tracker.wait(tx_hashes, return_exceptions=return_exceptions)